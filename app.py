@@ -1,23 +1,29 @@
+import importlib
+import logging
+import sys
+
 import streamlit as st
-from components.arbitrage_calculator import arbitrage_tab
-from components.pressure_gauge import pressure_gauge_tab
-from components.market_analysis import market_analysis_tab
-from components.fibonacci_engine import fibonacci_tab
-from components.technical_indicators import technical_indicators_tab
-from components.volume_analysis import volume_analysis_tab
-from components.data_integration_dashboard import data_integration_tab
- 
-def main():
-    # Configure Streamlit page
-    st.set_page_config(
-        page_title="Tri-Framework Oracle - Trading Mastery",
-        page_icon="🔮",
-        layout="wide",
-        initial_sidebar_state="expanded"
-    )
-    
-    # Custom CSS for dark mode and styling
-    st.markdown("""
+
+# (label, module, render function, reads the loaded 1m candles); modules are imported
+# only when their tab is opened, and the candle loader only beside tabs that read it
+TABS = [
+    ("Arbitrage Calculator", "components.arbitrage_calculator", "arbitrage_tab", False),
+    ("Pressure Gauge", "components.pressure_gauge", "pressure_gauge_tab", False),
+    ("Market Analysis", "components.market_analysis", "market_analysis_tab", False),
+    ("Fibonacci Engine", "components.fibonacci_engine", "fibonacci_tab", True),
+    ("Technical Indicators", "components.technical_indicators", "technical_indicators_tab", True),
+    ("Volume Analysis", "components.volume_analysis", "volume_analysis_tab", False),
+    ("Quantum Confluence", "components.data_integration_dashboard", "data_integration_tab", False),
+    ("Scanner", "components.scanner", "scanner_tab", False),
+    ("Diagnostics", "components.diagnostics", "diagnostics_tab", False)
+]
+
+def load_tab(module_name, function_name):
+    """Import a tab module on first use and return its render function"""
+    return getattr(importlib.import_module(module_name), function_name)
+
+# Dark mode and component styling
+APP_CSS = """
     <style>
     .main {
         background-color: #0e1117;
@@ -147,43 +153,49 @@ def main():
         color: #ffffff;
     }
     </style>
-    """, unsafe_allow_html=True)
+    """
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    
+    # Configure Streamlit page
+    st.set_page_config(
+        page_title="Tri-Framework Oracle - Trading Mastery",
+        page_icon="🔮",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    
+    # Custom CSS for dark mode and styling
+    st.markdown(APP_CSS, unsafe_allow_html=True)
     
     # App title
     st.title("🔮 Tri-Framework Oracle - Trading Mastery")
     st.markdown("*Mathematical precision for BTC/USDT trading mastery*")
     
-    # Navigation
-    tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
-        "Arbitrage Calculator", 
-        "Pressure Gauge", 
-        "Market Analysis", 
-        "Fibonacci Engine", 
-        "Technical Indicators", 
-        "Volume Analysis",
-        "Quantum Confluence"
-    ])
-    
-    with tab1:
-        arbitrage_tab()
-    
-    with tab2:
-        pressure_gauge_tab()
-    
-    with tab3:
-        market_analysis_tab()
-    
-    with tab4:
-        fibonacci_tab()
-    
-    with tab5:
-        technical_indicators_tab()
+    # Navigation: only the selected view is imported and computed on each run
+    labels = [label for label, _, _, _ in TABS]
+    selected = st.radio("Navigation", labels, horizontal=True, key="active_tab", label_visibility="collapsed")
+    _, module_name, function_name, uses_candles = TABS[labels.index(selected)]
     
-    with tab6:
-        volume_analysis_tab()
+    # Shared 1m candle history (each file is parsed once per process and shared by every session)
+    if uses_candles:
+        load_tab("components.data_loader", "candle_loader_sidebar")()
+    load_tab(module_name, function_name)()
     
-    with tab7:
-        data_integration_tab()
+    # Shared computation cache statistics, once some tab has loaded the cache (rendered
+    # last so this run's lookups are counted)
+    cache = sys.modules.get("utils.cache")
+    if cache is None:
+        return
+    cache_stats = cache.computation_cache.stats()
+    with st.sidebar:
+        st.markdown("---")
+        st.markdown("**Computation Cache**")
+        st.caption(
+            f"{cache_stats['hits']:,} hits · {cache_stats['misses']:,} misses · "
+            f"{cache_stats['hit_rate']:.0%} hit rate · {cache_stats['coalesced']:,} coalesced · {cache_stats['size']} entries"
+        )
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
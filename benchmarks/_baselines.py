@@ -0,0 +1,103 @@
+"""Pure-Python indicator loops used as the "scalar" baseline by every benchmark
+
+Each returns the same value as its utils.calculations counterpart, using plain floats
+and no numpy, so speedups reported by different scripts are against the same kind of
+code.
+"""
+import math
+
+
+def python_rsi(prices, period=14):
+    """RSI of the last period changes, Wilder-seeded like calculate_rsi on period + 1 prices"""
+    gains = 0.0
+    losses = 0.0
+    for i in range(1, period + 1):
+        change = prices[-i] - prices[-i - 1]
+        if change > 0:
+            gains += change
+        else:
+            losses -= change
+    if losses == 0:
+        return 100.0
+    if gains == 0:
+        return 0.0
+    return 100 - 100 / (1 + gains / losses)
+
+
+def python_dmi(high, low, close, period=14):
+    """Per-bar Wilder +DI, -DI and ADX lists, following Wilder's running-sum formulation
+
+    TR, +DM and -DM sums are seeded over the first period moves and updated as
+    sum - sum / period + current; ADX is seeded with the mean of the first period DX
+    values. Positions before enough data are NaN, as in dmi_series.
+    """
+    n = len(high)
+    pdi = [math.nan] * n
+    mdi = [math.nan] * n
+    adx = [math.nan] * n
+    tr_sum = pdm_sum = mdm_sum = 0.0
+    dx_values = []
+    adx_value = None
+    for i in range(1, n):
+        tr = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        up = high[i] - high[i - 1]
+        down = low[i - 1] - low[i]
+        plus_dm = up if up > 0 and up > down else 0.0
+        minus_dm = down if down > 0 and down > up else 0.0
+        if i <= period:
+            tr_sum += tr
+            pdm_sum += plus_dm
+            mdm_sum += minus_dm
+            if i < period:
+                continue
+        else:
+            tr_sum = tr_sum - tr_sum / period + tr
+            pdm_sum = pdm_sum - pdm_sum / period + plus_dm
+            mdm_sum = mdm_sum - mdm_sum / period + minus_dm
+        pdi[i] = 100 * pdm_sum / tr_sum if tr_sum > 0 else 0.0
+        mdi[i] = 100 * mdm_sum / tr_sum if tr_sum > 0 else 0.0
+        di_sum = pdi[i] + mdi[i]
+        dx = 100 * abs(pdi[i] - mdi[i]) / di_sum if di_sum > 0 else 0.0
+        if adx_value is None:
+            dx_values.append(dx)
+            if len(dx_values) == period:
+                adx_value = sum(dx_values) / period
+        else:
+            adx_value = (adx_value * (period - 1) + dx) / period
+        if adx_value is not None:
+            adx[i] = adx_value
+    return pdi, mdi, adx
+
+
+def python_volume_analysis(current_volume, volume_history):
+    """(ratio, status, delta) like calculate_volume_analysis, summing in plain Python"""
+    if len(volume_history) < 2:
+        return 50, "NEUTRAL", "NEUTRAL"
+    average = sum(volume_history) / len(volume_history)
+    ratio = current_volume / average if average > 0 else 1
+    status = "HIGH" if ratio > 1.5 else "LOW" if ratio < 0.7 else "AVERAGE"
+    recent = volume_history[-5:]
+    older = volume_history[:5]
+    recent_avg = sum(recent) / len(recent)
+    older_avg = sum(older) / len(older)
+    delta = "INCREASING" if recent_avg > older_avg * 1.2 else "DECREASING" if recent_avg < older_avg * 0.8 else "STABLE"
+    return ratio, status, delta
+
+
+def python_arbitrage(odds_list, bankroll):
+    """The pre-kernel process_arbitrage_calculation result, without its logging and error capture
+
+    Non-positive odds count as probability 0, and the profit is read off the first outcome.
+    """
+    implied_probs = [1 / odds if odds > 0 else 0 for odds in odds_list]
+    total_implied = sum(implied_probs)
+    if total_implied >= 1.0:
+        return {'is_arb_found': False, 'stakes': [], 'profit': 0, 'total_implied': total_implied, 'implied_probs': implied_probs}
+    stakes = [bankroll * prob / total_implied for prob in implied_probs]
+    return {
+        'is_arb_found': True,
+        'stakes': stakes,
+        'profit': stakes[0] * odds_list[0] - bankroll,
+        'total_implied': total_implied,
+        'implied_probs': implied_probs
+    }
@@ -0,0 +1,39 @@
+"""Synthetic candles shared by the benchmark scripts"""
+import numpy as np
+
+START_MS = 1_700_000_000_000
+MINUTE_MS = 60_000
+
+
+def synthetic_ohlcv(bars, symbols=None, seed=42, price=100000.0, sigma=0.002, wick=0.001, volume=(7.0, 0.5)):
+    """BTC-like geometric random walk of 1m candles with intrabar range and lognormal volume
+
+    Returns ts/open/high/low/close/volume columns of shape (bars,), or (symbols, bars)
+    when symbols is given; price may then be a (symbols, 1) array of starting prices.
+    sigma and wick are the per-bar log-return and wick scales, volume the lognormal
+    (mean, sigma).
+    """
+    rng = np.random.default_rng(seed)
+    shape = (bars,) if symbols is None else (symbols, bars)
+    close = price * np.exp(np.cumsum(rng.normal(0, sigma, shape), axis=-1))
+    open_ = np.concatenate([close[..., :1], close[..., :-1]], axis=-1)
+    spread = close * np.abs(rng.normal(0, wick, shape))
+    return {
+        'ts': START_MS + np.arange(bars, dtype=np.int64) * MINUTE_MS,
+        'open': open_,
+        'high': np.maximum(open_, close) + spread,
+        'low': np.minimum(open_, close) - spread,
+        'close': close,
+        'volume': rng.lognormal(*volume, shape)
+    }
+
+
+def synthetic_markets(count, outcomes=3, seed=11):
+    """Decimal odds (count, outcomes) and bankrolls (count,) for arbitrage runs
+
+    Fair prices get bookmaker noise of -10%..+8%, so roughly a third of markets are arbs.
+    """
+    rng = np.random.default_rng(seed)
+    fair = rng.dirichlet(np.ones(outcomes), count)
+    odds = 1 / (fair * rng.uniform(0.9, 1.08, (count, outcomes)))
+    return odds, rng.uniform(10, 10_000, count)
@@ -0,0 +1,45 @@
+"""Measure quote-update throughput of the cross-bookmaker ArbitrageBook"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'components'))
+
+from utils.arbitrage_book import ArbitrageBook
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--updates', type=int, default=1_000_000)
+    parser.add_argument('--events', type=int, default=5_000)
+    parser.add_argument('--books', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    event_ids = rng.integers(0, args.events, args.updates).tolist()
+    outcomes = rng.integers(0, 3, args.updates).tolist()
+    bookmakers = rng.integers(0, args.books, args.updates).tolist()
+    # Fair 3-way prices around 3.0 with bookmaker margin noise, so arbs are rare but present
+    odds = (3.0 * rng.uniform(0.92, 1.04, args.updates)).tolist()
+
+    book = ArbitrageBook(bankroll=100.0)
+    for event_id in range(args.events):
+        book.add_event(event_id, 3)
+
+    found = 0
+    update = book.update
+    start = time.perf_counter()
+    for event_id, outcome, bookmaker, price in zip(event_ids, outcomes, bookmakers, odds):
+        if update(event_id, outcome, bookmaker, price) is not None:
+            found += 1
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.updates:,} quote updates over {args.events:,} events x {args.books} books")
+    print(f"{elapsed:.3f}s ({args.updates / elapsed:,.0f} updates/s), {found:,} opportunities emitted")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Throughput of the arbitrage calculations against the pre-kernel formula
+
+The reference is _baselines.python_arbitrage, the pre-kernel process_arbitrage_calculation:
+implied probabilities, proportional stakes and a result dict, with no validation or payouts.
+The property checks against it live in tests/test_arbitrage_kernel.py.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'components'))
+
+from _baselines import python_arbitrage
+from _data import synthetic_markets
+from utils.calculations import process_arbitrage_calculation, solve_arbitrage
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--markets', type=int, default=200_000)
+    parser.add_argument('--outcomes', type=int, default=3)
+    args = parser.parse_args()
+
+    odds, bankrolls = synthetic_markets(args.markets, args.outcomes)
+    rows = odds.tolist()
+    bankrolls = bankrolls.tolist()
+    start = time.perf_counter()
+    for row, bankroll in zip(rows, bankrolls):
+        python_arbitrage(row, bankroll)
+    reference_rate = args.markets / (time.perf_counter() - start)
+    print(f"{'reference':<37} {reference_rate:>12,.0f} markets/s")
+
+    runs = (
+        ('process_arbitrage_calculation', process_arbitrage_calculation, {}),
+        ('solve_arbitrage exact', solve_arbitrage, {}),
+        ('solve_arbitrage rounded', solve_arbitrage, {'stake_increment': 1.0}),
+        ('solve_arbitrage commission', solve_arbitrage, {'commission': 0.02})
+    )
+    for label, func, kwargs in runs:
+        start = time.perf_counter()
+        for row, bankroll in zip(rows, bankrolls):
+            func(row, bankroll, **kwargs)
+        rate = args.markets / (time.perf_counter() - start)
+        print(f"{label:<37} {rate:>12,.0f} markets/s ({rate / reference_rate:.2f}x reference)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,286 @@
+"""Throughput and peak memory of the utils.calculations hot paths in scalar, vectorized and streaming form
+
+Each case runs on synthetic BTC-like OHLCV at every requested size. The scalar variant
+is a pure-Python per-bar loop (the _baselines functions, shared with bench_indicators,
+or the plain-Python utils function where one exists). Per-bar loops (scalar and
+streaming updates) are capped at --loop-limit bars and reported as bars/s, so the 10M
+size stays practical. Save a run with --json and pass it back as
+--baseline to flag throughput regressions beyond --tolerance.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'components'))
+
+from _baselines import python_dmi, python_rsi, python_volume_analysis
+from _data import synthetic_ohlcv
+from utils.calculations import (
+    calculate_vwap,
+    calculate_fibonacci_levels,
+    process_arbitrage_calculation,
+    solve_arbitrage,
+    scan_arbitrage_batch,
+    rsi_series,
+    dmi_series
+)
+from utils.fibonacci import rolling_max, rolling_min
+from utils.streaming import StreamingRSI, StreamingDMI, StreamingVWAP, RollingVolumeStats
+
+DEFAULT_SIZES = (1_000, 100_000, 10_000_000)
+PERIOD = 14
+VOLUME_WINDOW = 20
+SWING_WINDOW = 50
+FIB_RATIOS = np.array([0.236, 0.382, 0.5, 0.618, 0.786])
+
+
+def synthetic_markets(count, outcomes=3, seed=42):
+    """Bookmaker odds around fair prices, so a fraction of markets are arbs"""
+    rng = np.random.default_rng(seed)
+    fair = rng.dirichlet(np.ones(outcomes), count)
+    return 1 / (fair * rng.uniform(0.92, 1.05, (count, outcomes)))
+
+
+# Each case builder returns {variant: (callable, bars processed)} for one dataset
+
+def rsi_cases(data, limit):
+    close = data['close']
+    loop = close[:limit].tolist()
+
+    def scalar():
+        for end in range(PERIOD + 1, len(loop) + 1):
+            python_rsi(loop[end - PERIOD - 1:end], PERIOD)
+
+    def streaming():
+        rsi = StreamingRSI(PERIOD)
+        for price in loop:
+            rsi.update(price)
+
+    return {
+        'scalar': (scalar, len(loop)),
+        'vectorized': (lambda: rsi_series(close, PERIOD), len(close)),
+        'streaming': (streaming, len(loop))
+    }
+
+
+def dmi_cases(data, limit):
+    high, low, close = data['high'], data['low'], data['close']
+    loop = list(zip(high[:limit].tolist(), low[:limit].tolist(), close[:limit].tolist()))
+    # The latest ADX needs a 2 * period + 1 bar window, as in calculate_dmi
+    span = 2 * PERIOD + 1
+    highs, lows, closes = (list(column) for column in zip(*loop))
+
+    def scalar():
+        for end in range(span, len(loop) + 1):
+            python_dmi(highs[end - span:end], lows[end - span:end], closes[end - span:end], PERIOD)
+
+    def streaming():
+        dmi = StreamingDMI(PERIOD)
+        for bar in loop:
+            dmi.update(*bar)
+
+    return {
+        'scalar': (scalar, len(loop)),
+        'vectorized': (lambda: dmi_series(high, low, close, PERIOD), len(close)),
+        'streaming': (streaming, len(loop))
+    }
+
+
+def vwap_cases(data, limit):
+    close, volume = data['close'], data['volume']
+    prices, volumes = close[:limit].tolist(), volume[:limit].tolist()
+
+    def scalar():
+        total_pv = 0.0
+        total_v = 0.0
+        for price, size in zip(prices, volumes):
+            total_pv += price * size
+            total_v += size
+        return total_pv / total_v
+
+    def streaming():
+        vwap = StreamingVWAP()
+        for price, size in zip(prices, volumes):
+            vwap.update(price, size)
+        return vwap.value
+
+    return {
+        'scalar': (scalar, len(prices)),
+        'vectorized': (lambda: calculate_vwap(close, volume), len(close)),
+        'streaming': (streaming, len(prices))
+    }
+
+
+def volume_analysis_cases(data, limit):
+    volume = data['volume']
+    loop = volume[:limit].tolist()
+
+    def scalar():
+        for end in range(VOLUME_WINDOW, len(loop)):
+            python_volume_analysis(loop[end], loop[end - VOLUME_WINDOW:end])
+
+    def vectorized():
+        # Same ratio and delta rules as calculate_volume_analysis, for every bar at once
+        sums = np.cumsum(np.r_[0.0, volume])
+        ends = np.arange(VOLUME_WINDOW, len(volume))
+        average = (sums[ends] - sums[ends - VOLUME_WINDOW]) / VOLUME_WINDOW
+        recent = (sums[ends] - sums[ends - 5]) / 5
+        older = (sums[ends - VOLUME_WINDOW + 5] - sums[ends - VOLUME_WINDOW]) / 5
+        ratio = volume[ends] / average
+        status = np.select([ratio > 1.5, ratio < 0.7], [2, 0], 1)
+        delta = np.select([recent > older * 1.2, recent < older * 0.8], [2, 0], 1)
+        return ratio, status, delta
+
+    def streaming():
+        stats = RollingVolumeStats(VOLUME_WINDOW)
+        for size in loop:
+            stats.update(size)
+
+    return {
+        'scalar': (scalar, len(loop)),
+        'vectorized': (vectorized, len(volume)),
+        'streaming': (streaming, len(loop))
+    }
+
+
+def fibonacci_cases(data, limit):
+    high, low = data['high'], data['low']
+
+    def swings(count):
+        return rolling_max(high[:count], SWING_WINDOW), rolling_min(low[:count], SWING_WINDOW)
+
+    count = min(limit, len(high))
+
+    def scalar():
+        swing_high, swing_low = swings(count)
+        for swing_top, swing_bottom in zip(swing_high.tolist(), swing_low.tolist()):
+            calculate_fibonacci_levels(swing_top, swing_bottom)
+
+    def vectorized():
+        # Rolling swing extraction plus every retracement level for every bar
+        top, bottom = swings(len(high))
+        return top[:, None] - (top - bottom)[:, None] * FIB_RATIOS
+
+    return {
+        'scalar': (scalar, count),
+        'vectorized': (vectorized, len(high))
+    }
+
+
+def arbitrage_cases(data, limit):
+    markets = synthetic_markets(len(data['close']))
+    rows = markets[:limit].tolist()
+
+    def scalar():
+        for odds in rows:
+            process_arbitrage_calculation(odds, 100.0)
+
+    def kernel():
+        for odds in rows:
+            solve_arbitrage(odds, 100.0)
+
+    return {
+        'scalar': (scalar, len(rows)),
+        'kernel': (kernel, len(rows)),
+        'vectorized': (lambda: scan_arbitrage_batch(markets, 100.0), len(markets))
+    }
+
+
+CASES = {
+    'calculate_rsi': rsi_cases,
+    'calculate_dmi': dmi_cases,
+    'calculate_vwap': vwap_cases,
+    'calculate_volume_analysis': volume_analysis_cases,
+    'calculate_fibonacci_levels': fibonacci_cases,
+    'process_arbitrage_calculation': arbitrage_cases
+}
+
+
+def measure(func, repeat):
+    """Best wall time over repeat runs, then peak traced memory of one more run"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def run(sizes, names, loop_limit, repeat):
+    results = []
+    for size in sizes:
+        data = synthetic_ohlcv(size)
+        for name in names:
+            for variant, (func, bars) in CASES[name](data, loop_limit).items():
+                seconds, peak = measure(func, repeat)
+                results.append({
+                    'function': name,
+                    'variant': variant,
+                    'size': size,
+                    'bars': bars,
+                    'seconds': seconds,
+                    'bars_per_second': bars / seconds if seconds > 0 else float('inf'),
+                    'peak_bytes': peak
+                })
+                print(f"{name:<31}{variant:<12}{size:>12,}{bars:>12,}{seconds:>11.4f}"
+                      f"{results[-1]['bars_per_second']:>16,.0f}{peak / 2**20:>11.1f}", flush=True)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Rows whose throughput fell by more than tolerance against the baseline run"""
+    previous = {(row['function'], row['variant'], row['size']): row for row in baseline['results']}
+    regressions = []
+    for row in results:
+        old = previous.get((row['function'], row['variant'], row['size']))
+        if old and row['bars_per_second'] < old['bars_per_second'] * (1 - tolerance):
+            regressions.append((row, row['bars_per_second'] / old['bars_per_second'] - 1))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--functions', nargs='+', choices=sorted(CASES), default=list(CASES))
+    parser.add_argument('--loop-limit', type=int, default=100_000, help='cap on bars for per-bar Python loops')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', help='write results to this file')
+    parser.add_argument('--baseline', help='results file from an earlier run to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed fractional throughput drop')
+    args = parser.parse_args()
+
+    print(f"{'function':<31}{'variant':<12}{'size':>12}{'bars run':>12}{'best (s)':>11}{'bars/s':>16}{'peak MiB':>11}")
+    results = run(args.sizes, args.functions, args.loop_limit, args.repeat)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'machine': platform.machine(),
+                'loop_limit': args.loop_limit,
+                'results': results
+            }, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for row, change in regressions:
+            print(f"REGRESSION {row['function']} {row['variant']} @ {row['size']:,}: {change:.0%} throughput")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Check dmi_series/dmi_multi against a plain-Python Wilder DMI/ADX and time the multi-period pass
+
+The reference is _baselines.python_dmi, Wilder's original running-sum formulation: TR,
++DM and -DM sums seeded over the first period moves and updated as
+sum - sum / period + current, +DI/-DI as 100 * DM sum / TR sum, and ADX seeded with the
+mean of the first period DX values. Every value is compared (NaN positions must agree too) and the script exits non-zero
+if any difference exceeds --tolerance.
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'components'))
+
+from _baselines import python_dmi
+from _data import synthetic_ohlcv
+from utils.calculations import DMI_PERIODS, dmi_series, dmi_multi
+
+
+def flat_ohlc(bars, seed):
+    """Shared random walk with some flat stretches (zero true range) mixed in"""
+    data = synthetic_ohlcv(bars, seed=seed)
+    high, low, close = data['high'], data['low'], data['close']
+    flat = np.random.default_rng(seed).random(bars) < 0.02
+    for column in (high, low, close):
+        column[flat] = close[flat]
+    return high, low, close
+
+
+def max_difference(actual, expected):
+    """Largest absolute difference, or inf when the NaN warm-up positions disagree"""
+    expected = np.asarray(expected)
+    if not np.array_equal(np.isnan(actual), np.isnan(expected)):
+        return math.inf
+    valid = ~np.isnan(expected)
+    return float(np.max(np.abs(actual[valid] - expected[valid]), initial=0.0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bars', type=int, nargs='+', default=[10, 30, 1_000, 20_000])
+    parser.add_argument('--periods', type=int, nargs='+', default=list(DMI_PERIODS))
+    parser.add_argument('--tolerance', type=float, default=1e-9)
+    parser.add_argument('--timing-bars', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    worst = 0.0
+    print(f"{'bars':>8}{'period':>8}{'max |d +DI|':>14}{'max |d -DI|':>14}{'max |d ADX|':>14}")
+    for seed, bars in enumerate(args.bars):
+        high, low, close = flat_ohlc(bars, seed)
+        multi = dmi_multi(high, low, close, args.periods)
+        for period in args.periods:
+            expected = python_dmi(high.tolist(), low.tolist(), close.tolist(), period)
+            single = dmi_series(high, low, close, period)
+            diffs = [
+                max(max_difference(multi[period][k], expected[k]), max_difference(single[k], expected[k]))
+                for k in range(3)
+            ]
+            worst = max(worst, *diffs)
+            print(f"{bars:>8,}{period:>8}" + "".join(f"{diff:>14.2e}" for diff in diffs))
+
+    high, low, close = flat_ohlc(args.timing_bars, 99)
+    separate = multi_pass = math.inf
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        for period in args.periods:
+            dmi_series(high, low, close, period)
+        separate = min(separate, time.perf_counter() - start)
+        start = time.perf_counter()
+        dmi_multi(high, low, close, args.periods)
+        multi_pass = min(multi_pass, time.perf_counter() - start)
+    print(f"\n{args.timing_bars:,} bars, periods {args.periods}: "
+          f"{separate:.3f}s as separate dmi_series calls, {multi_pass:.3f}s with dmi_multi ({separate / multi_pass:.2f}x)")
+
+    if worst > args.tolerance:
+        print(f"MISMATCH: max difference {worst:.3e} exceeds {args.tolerance:g}")
+        sys.exit(1)
+    print(f"All values within {args.tolerance:g} of the reference")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Compare pure-Python per-window RSI/DMI loops against the vectorized series engine
+
+The loops are the shared _baselines functions, the same scalar baseline bench_calculations
+reports, so the speedups of the two scripts are comparable.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'components'))
+
+from _baselines import python_dmi, python_rsi
+from _data import synthetic_ohlcv
+from utils.calculations import rsi_series, dmi_series
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--bars', type=int, default=100_000)
+    parser.add_argument('--period', type=int, default=14)
+    args = parser.parse_args()
+
+    data = synthetic_ohlcv(args.bars)
+    high, low, close = data['high'], data['low'], data['close']
+    high_list, low_list, close_list = high.tolist(), low.tolist(), close.tolist()
+    period = args.period
+    # The latest ADX needs a 2 * period + 1 bar window, as in calculate_dmi
+    span = 2 * period + 1
+
+    # A per-window loop yields one value per call, so a full series means one call per bar
+    def python_rsi_full():
+        for end in range(period + 1, len(close_list) + 1):
+            python_rsi(close_list[end - period - 1:end], period)
+
+    def python_dmi_full():
+        for end in range(span, len(close_list) + 1):
+            python_dmi(high_list[end - span:end], low_list[end - span:end], close_list[end - span:end], period)
+
+    rows = [
+        ('RSI', timed(python_rsi_full), timed(rsi_series, close, period)),
+        ('DMI', timed(python_dmi_full), timed(dmi_series, high, low, close, period)),
+    ]
+
+    print(f"{args.bars:,} bars, period {period}")
+    print(f"{'indicator':<10}{'Python loop (s)':>18}{'series (s)':>14}{'speedup':>10}")
+    for name, scalar, vectorized in rows:
+        print(f"{name:<10}{scalar:>18.4f}{vectorized:>14.4f}{scalar / vectorized:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Load time of utils.ingest.load_candles for CSV, binary and .npy candle dumps
+
+Writes synthetic 1m candles at each size to a temporary directory, then times a full
+load (parse, timestamp normalization and schema validation) per format. Parquet is
+included when pyarrow is installed. --bad-rows injects rejected rows to time the
+row-level error path.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'components'))
+
+from _data import synthetic_ohlcv
+from utils.ingest import load_candles, pa, write_binary
+from utils.resample import COLUMNS
+
+DEFAULT_SIZES = (100_000, 1_000_000, 3_000_000)
+
+
+def write_files(directory, columns, bad_rows):
+    paths = {}
+    table = np.column_stack([columns[name] for name in COLUMNS])
+    paths['csv'] = os.path.join(directory, 'candles.csv')
+    with open(paths['csv'], 'w') as f:
+        f.write('open_time,open,high,low,close,volume\n')
+        np.savetxt(f, table, delimiter=',', fmt=['%d'] + ['%.2f'] * 5)
+        for i in range(bad_rows):
+            f.write(f"{columns['ts'][-1] + (i + 1) * 60_000},1,1,1,n/a,1\n")
+    paths['binary'] = os.path.join(directory, 'candles.bin')
+    write_binary(paths['binary'], columns)
+    paths['npy'] = os.path.join(directory, 'candles.npy')
+    np.save(paths['npy'], table)
+    if pa is not None:
+        import pyarrow.parquet as pa_parquet
+        paths['parquet'] = os.path.join(directory, 'candles.parquet')
+        pa_parquet.write_table(pa.table({name: columns[name] for name in COLUMNS}), paths['parquet'])
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--bad-rows', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"pyarrow: {'yes' if pa is not None else 'no (numpy CSV parser)'}")
+    print(f"{'format':<10}{'rows':>12}{'best (s)':>11}{'rows/s':>16}{'read':>12}{'loaded':>12}{'rejected':>10}")
+    for size in args.sizes:
+        columns = synthetic_ohlcv(size, sigma=0.0005, wick=0.0003, volume=(3.0, 0.5))
+        with tempfile.TemporaryDirectory() as directory:
+            for fmt, path in write_files(directory, columns, args.bad_rows).items():
+                best = float('inf')
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    result = load_candles(path)
+                    best = min(best, time.perf_counter() - start)
+                assert result.rows_loaded + result.error_count == result.rows_read
+                print(f"{fmt:<10}{size:>12,}{best:>11.4f}{size / best:>16,.0f}{result.rows_read:>12,}"
+                      f"{result.rows_loaded:>12,}{result.error_count:>10,}", flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""Per-bar cost of N concurrent sessions reading indicators from utils.market_state
+
+Each session is a thread that, on every new 1m bar, reads the same indicator set the
+Technical Indicators tab renders (DMI on 1h, RSI on 15m, multi-period DMI on every
+timeframe). Three modes are compared:
+
+  per-session   every session computes from its own bars (no sharing)
+  cached_call   the shared computation cache keyed on a content hash of the bars
+  shared        MarketState views, cached per candle version with single-flight
+
+The computations column counts actual indicator executions per bar; shared mode
+should stay at one per indicator regardless of the session count.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'components'))
+
+from _data import synthetic_ohlcv
+from utils.cache import cached_call, computation_cache
+from utils.calculations import calculate_dmi, calculate_rsi, dmi_multi
+from utils.market_state import HLC, MarketState
+from utils.resample import COLUMNS, TIMEFRAMES
+
+computations = 0
+_count_lock = threading.Lock()
+
+
+def counted(func):
+    def wrapper(*args, **kwargs):
+        global computations
+        with _count_lock:
+            computations += 1
+        return func(*args, **kwargs)
+    wrapper.__module__ = func.__module__
+    wrapper.__qualname__ = func.__qualname__
+    return wrapper
+
+
+INDICATORS = [
+    ('1h', counted(calculate_dmi), HLC),
+    ('15m', counted(calculate_rsi), ('close',))
+] + [(timeframe, counted(dmi_multi), HLC) for timeframe in TIMEFRAMES]
+
+
+def session_reads(mode, state):
+    candles = state.view('BTC/USDT').candles
+    for timeframe, func, columns in INDICATORS:
+        if mode == 'shared':
+            candles.indicator(timeframe, func, columns)
+        else:
+            bars = candles.bars(timeframe)
+            # A private copy, as each session's own resampler used to hold
+            args = [np.array(bars[name]) for name in columns]
+            if mode == 'cached_call':
+                cached_call(func, *args)
+            else:
+                func(*args)
+
+
+def run(mode, sessions, history, bars):
+    global computations
+    state = MarketState()
+    state.extend('BTC/USDT', *(column[:history] for column in bars))
+    computation_cache.clear()
+    computations = 0
+    barrier = threading.Barrier(sessions + 1)
+    live = len(bars[0]) - history
+
+    def session():
+        for _ in range(live):
+            barrier.wait()
+            session_reads(mode, state)
+            barrier.wait()
+
+    threads = [threading.Thread(target=session, daemon=True) for _ in range(sessions)]
+    for thread in threads:
+        thread.start()
+    started = time.perf_counter()
+    for i in range(history, len(bars[0])):
+        state.update('BTC/USDT', *(column[i] for column in bars))
+        barrier.wait()
+        barrier.wait()
+    elapsed = time.perf_counter() - started
+    for thread in threads:
+        thread.join()
+    return elapsed / live, computations / live
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--history', type=int, default=100_000, help='1m bars loaded before the timed bars')
+    parser.add_argument('--bars', type=int, default=5, help='timed live 1m bars')
+    parser.add_argument('--modes', nargs='+', choices=('per-session', 'cached_call', 'shared'), default=['per-session', 'cached_call', 'shared'])
+    args = parser.parse_args()
+
+    data = synthetic_ohlcv(args.history + args.bars, sigma=0.0005, wick=0.0003, volume=(3.0, 0.5))
+    candles = tuple(data[name] for name in COLUMNS)
+    print(f"{'mode':<13}{'sessions':>9}{'ms/bar':>11}{'computations/bar':>18}")
+    for sessions in args.sessions:
+        for mode in args.modes:
+            per_bar, per_bar_computations = run(mode, sessions, args.history, candles)
+            print(f"{mode:<13}{sessions:>9,}{per_bar * 1000:>11.1f}{per_bar_computations:>18,.1f}", flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Per-bar cost of utils.rules.RuleEngine for many rules across many symbols
+
+Rules are generated from a few templates with varying thresholds (as a user building
+alerts over the same indicators would), so the run exercises template stacking and
+shared-indicator reuse. Bars are synthetic 1m random walks; the first --warmup bars
+fill indicator windows and are not timed.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'components'))
+
+from _data import synthetic_ohlcv
+from utils.rules import Rule, RuleEngine, TriggerQueue
+
+TEMPLATES = (
+    "rsi > {:.2f}",
+    "rsi < {:.2f}",
+    "abs(close - ma50) / ma50 > {:.5f}",
+    "adx > {:.2f} and pdi > mdi",
+    "fib_distance < {:.5f} and volume_status == \"HIGH\"",
+    "abs(pressure_gauge) > {:.4f} and confluence == \"STRONG\""
+)
+# Threshold range per template, spread evenly over the rules generated from it
+RANGES = ((70, 95), (5, 30), (0.01, 0.05), (25, 60), (0.0001, 0.001), (0.5, 0.9))
+
+
+def make_rules(count):
+    rules = []
+    per_template = -(-count // len(TEMPLATES))
+    for template, (low, high) in zip(TEMPLATES, RANGES):
+        for threshold in np.linspace(low, high, per_template):
+            if len(rules) < count:
+                rules.append(Rule(f"rule{len(rules)}", template.format(threshold)))
+    return rules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--symbols', type=int, nargs='+', default=[100, 1000])
+    parser.add_argument('--rules', type=int, nargs='+', default=[100, 1000, 5000])
+    parser.add_argument('--bars', type=int, default=100)
+    parser.add_argument('--warmup', type=int, default=60)
+    args = parser.parse_args()
+
+    print(f"{'symbols':>8}{'rules':>8}{'groups':>8}{'compile (s)':>13}{'ms/bar':>10}{'rule-evals/s':>16}{'triggers/bar':>14}")
+    for symbols in args.symbols:
+        # (symbols, 5, bars) OHLCV from per-symbol random walks starting anywhere in 1..1000
+        start = np.random.default_rng(1).uniform(1, 1000, (symbols, 1))
+        data = synthetic_ohlcv(args.warmup + args.bars, symbols, price=start, volume=(6.0, 0.6))
+        ohlcv = np.stack([data[name] for name in ('open', 'high', 'low', 'close', 'volume')], axis=1)
+        ts = data['ts']
+        rng = np.random.default_rng(0)
+        for count in args.rules:
+            started = time.perf_counter()
+            sink = TriggerQueue(maxsize=1_000_000)
+            engine = RuleEngine([f"S{i}" for i in range(symbols)], make_rules(count), sinks=[sink])
+            engine.set_market(rng.uniform(1e5, 1e7, symbols), rng.uniform(1e5, 1e7, symbols), rng.normal(0, 0.0002, symbols))
+            compile_time = time.perf_counter() - started
+
+            engine.replay(ts[:args.warmup], ohlcv[:, :, :args.warmup])
+            sink.drain()
+            started = time.perf_counter()
+            engine.replay(ts[args.warmup:], ohlcv[:, :, args.warmup:], deliver=True)
+            per_bar = (time.perf_counter() - started) / args.bars
+            print(f"{symbols:>8,}{count:>8,}{len(engine._groups):>8}{compile_time:>13.3f}{per_bar * 1000:>10.2f}"
+                  f"{count * symbols / per_bar:>16,.0f}{sink.received / args.bars:>14,.1f}", flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Measure app import time, cold first paint and rerun latency per tab
+
+Requires streamlit (uses streamlit.testing.v1.AppTest for headless runs).
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+COMPONENTS = os.path.join(ROOT, 'components')
+
+IMPORT_PROBE = (
+    "import sys, time; sys.path[:0] = [{root!r}, {components!r}]; "
+    "start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+)
+
+
+def import_seconds(module):
+    """Import a module in a fresh interpreter and return the import time"""
+    code = IMPORT_PROBE.format(root=ROOT, components=COMPONENTS, module=module)
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=ROOT)
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def first_paint_and_rerun(tab_label, reruns):
+    """Cold AppTest run with a tab selected, then the mean of warm reruns"""
+    from streamlit.testing.v1 import AppTest
+
+    sys.path[:0] = [ROOT, COMPONENTS]
+    app = AppTest.from_file(os.path.join(ROOT, 'app.py'), default_timeout=60)
+    app.session_state['active_tab'] = tab_label
+    start = time.perf_counter()
+    app.run()
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(reruns):
+        app.run()
+    return cold, (time.perf_counter() - start) / reruns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--reruns', type=int, default=10)
+    parser.add_argument('--samples', type=int, default=5, help="Fresh interpreters per import measurement")
+    args = parser.parse_args()
+
+    print("Import time (fresh interpreter, best of samples):")
+    for module in ('app', 'utils.calculations', 'streamlit'):
+        best = min(import_seconds(module) for _ in range(args.samples))
+        print(f"  {module:<22}{best * 1000:>9.1f} ms")
+
+    sys.path[:0] = [ROOT]
+    from app import TABS
+
+    print(f"\n{'tab':<24}{'first paint (ms)':>18}{'rerun (ms)':>12}")
+    for label, _, _ in TABS:
+        cold, rerun = first_paint_and_rerun(label, args.reruns)
+        print(f"{label:<24}{cold * 1000:>18.1f}{rerun * 1000:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
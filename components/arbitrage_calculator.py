@@ -87,10 +87,31 @@ def arbitrage_tab():
         key="bankroll"
     )
     
+    fee_col1, fee_col2 = st.columns(2)
+    with fee_col1:
+        commission_pct = st.number_input(
+            "Commission on Winnings (%):",
+            min_value=0.0,
+            max_value=99.0,
+            value=0.0,
+            step=0.5,
+            format="%.2f",
+            key="commission"
+        )
+    with fee_col2:
+        stake_increment = st.number_input(
+            "Stake Rounding Increment (£, 0 = exact):",
+            min_value=0.0,
+            value=0.0,
+            step=0.5,
+            format="%.2f",
+            key="stake_increment"
+        )
+    
     # Calculate button
     if st.button("🔮 Calculate Arbitrage", type="secondary"):
         with st.spinner("Processing mathematical calculations..."):
-            result = process_arbitrage_calculation(odds_inputs, bankroll)
+            result = process_arbitrage_calculation(odds_inputs, bankroll, commission_pct / 100, stake_increment)
             
             if result['error']:
                 st.markdown(
@@ -125,14 +146,17 @@ def arbitrage_tab():
                     # Display stakes and profit
                     st.markdown("#### Recommended Stakes:")
                     stake_cols = st.columns(len(odds_inputs))
-                    for i, (stake, odd) in enumerate(zip(result['stakes'], odds_inputs)):
+                    for i, (stake, payout) in enumerate(zip(result['stakes'], result['payouts'])):
                         with stake_cols[i]:
                             st.metric(
                                 label=f"Stake on {chr(65+i)}",
                                 value=f"£{stake:.2f}",
-                                delta=f"Odds: {odd}"
+                                delta=f"Pays: £{payout:.2f}"
                             )
                     
+                    if stake_increment:
+                        st.markdown(f"**Total Staked:** £{result['total_staked']:.2f} (rounded to £{stake_increment:.2f})")
+                    
                     st.markdown(
                         f"### 💰 Guaranteed Profit: £{result['profit']:.2f} ({(result['profit']/bankroll)*100:.2f}%)"
                     )
@@ -147,3 +171,5 @@ def arbitrage_tab():
                     if result['total_implied'] > 1.0:
                         inefficiency = (result['total_implied'] - 1.0) * 100
                         st.info(f"This market has {inefficiency:.2f}% overround - bookmaker's edge")
+                    elif result['total_implied'] < 1.0:
+                        st.info("The margin is too thin to survive rounding stakes to the chosen increment")
@@ -1,4 +1,8 @@
+import math
+
 import streamlit as st
+from utils.confluence import evaluate_confluence
+from utils.funding import HOURS_PER_YEAR
 
 def data_integration_tab():
     st.header("🎯 Quantum Confluence Dashboard")
@@ -12,16 +16,52 @@ def data_integration_tab():
     
     # Data Integration Status
     st.subheader("📡 Data Connection Status")
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.metric("OKX API", "✅ Connected", "Price data streaming")
+    live_feed = st.checkbox("Use live market feed", key="use_live_feed")
     
-    with col2:
-        st.metric("Binance API", "✅ Connected", "Funding/OI data streaming")
-    
-    with col3:
-        st.metric("Vercel Proxy", "✅ Active", "UK-compliant access")
+    snapshot = None
+    pressure_reading = None
+    funding_view = None
+    if live_feed:
+        from utils.market_data import configured_feeds
+        try:
+            feeds = configured_feeds()
+        except ValueError as e:
+            st.error(str(e))
+            feeds = {}
+        if not feeds:
+            st.error("No usable market feeds are configured (ORACLE_MARKET_FEEDS)")
+            live_feed = False
+    if live_feed:
+        from utils.market_data import get_market_feed
+        from utils.market_state import get_market_state
+        feed_name = st.selectbox(
+            "Proxy / Mock Exchange:", sorted(feeds), key="feed_name",
+            help="Feeds are configured on the server through ORACLE_MARKET_FEEDS (name=url, comma separated); "
+                 "run `python -m utils.mock_exchange` from components/ for the default offline stand-in"
+        )
+        feed_url = feeds[feed_name]
+        feed = get_market_feed(feed_url)
+        # Every session on this URL reads one shared state, refreshed at most once a second
+        state_key = ('feed', feed_url)
+        view = get_market_state(state_key).attach_feed(feed).view("BTC/USDT")
+        st.session_state['live_feed'] = state_key
+        snapshot = view.snapshot
+        pressure_reading = view.pressure
+        funding_view = view.funding
+        col1, col2, col3 = st.columns(3)
+        status = feed.status()[feed_url]
+        
+        with col1:
+            st.metric("Stream", "✅ Connected" if status['connected'] else "❌ Disconnected", f"{status['reconnects']} reconnects")
+        
+        with col2:
+            st.metric("Messages", f"{status['messages']:,}", f"{status['dropped']:,} dropped")
+        
+        with col3:
+            st.metric("Last Error", status['last_error'] or "None", f"{status['errors']:,} rejected", delta_color="inverse")
+    else:
+        st.session_state.pop('live_feed', None)
+        st.info("⚪ Manual input mode - enable the live feed to stream price, OI and funding")
     
     # Real-time Market Data
     st.subheader("📈 Real-Time Market Data")
@@ -67,43 +107,46 @@ def data_integration_tab():
     
     # Funding Rates
     st.subheader("💰 Funding Rates Analysis")
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        long_funding = st.number_input(
-            "1h Funding (Long):",
-            min_value=-1.0,
-            value=0.0,
-            step=0.00001,
-            format="%.5f",
-            key="long_funding"
-        )
-    
-    with col2:
-        short_funding = st.number_input(
-            "1h Funding (Short):",
-            min_value=-1.0,
-            value=-0.00096,
-            step=0.00001,
-            format="%.5f",
-            key="short_funding"
-        )
+    # One signed rate: negative means shorts pay longs, positive means longs pay shorts
+    funding_rate = st.number_input(
+        "1h Funding Rate (%):",
+        min_value=-1.0,
+        value=-0.00096,
+        step=0.00001,
+        format="%.5f",
+        key="funding_rate"
+    )
     
     # Calculate Pressure Gauge with real data
     if st.button("🎯 Calculate Quantum Confluence", type="primary"):
         with st.spinner("Processing multi-exchange data..."):
-            # Calculate Pressure Gauge
-            total_oi = long_oi + short_oi
-            pressure_gauge = (long_oi - short_oi) / total_oi if total_oi > 0 else 0
+            # Rates are handled as fractions per interval and shown in percent
+            funding_rate /= 100
+            # Live values replace the manual inputs once the feed has delivered them
+            if snapshot is not None:
+                if snapshot.price is not None:
+                    current_price = snapshot.price
+                if snapshot.long_oi is not None:
+                    long_oi, short_oi = snapshot.long_oi, snapshot.short_oi
+                if snapshot.funding_rate is not None:
+                    funding_rate = snapshot.funding_rate
+                st.caption("Price, OI and funding taken from the live feed")
             
-            # Determine trend status
-            trend_bullish = current_price > ma50
-            trend_status = "BULLISH (AETOS ACTIVE)" if trend_bullish else "BEARISH (KHRUSOS ACTIVE)"
+            # Cross-venue consensus and the predicted next print feed the funding rule
+            predicted_funding = None
+            if funding_view is not None and not math.isnan(funding_view['consensus']):
+                funding_rate = funding_view['consensus']
+                predicted_funding = funding_view['predicted']
             
-            # Calculate confluence
-            pressure_extreme = abs(pressure_gauge) > 0.5
-            funding_favorable = short_funding < 0  # Shorts paying longs
-            trend_aligned = (trend_bullish and pressure_gauge < 0) or (not trend_bullish and pressure_gauge > 0)
+            # Evaluate confluence headlessly; this tab only renders the result
+            result = evaluate_confluence(
+                current_price, ma50, long_oi, short_oi, funding_rate, predicted_funding=predicted_funding
+            )
+            pressure_gauge = result.pressure_gauge
+            trend_bullish = result.trend_bullish
+            trend_status = "BULLISH (AETOS ACTIVE)" if trend_bullish else "BEARISH (KHRUSOS ACTIVE)"
+            pressure_extreme = result.pressure_extreme
+            funding_favorable = result.funding_favorable
             
             st.markdown("### 🧮 Quantum Confluence Analysis:")
             
@@ -115,22 +158,22 @@ def data_integration_tab():
             # Pressure Gauge Analysis
             st.markdown(f"### 🎯 Pressure Gauge: {pressure_gauge:.3f}")
             
-            if pressure_gauge > 0.5:
+            if result.pressure == "EXTREME_LONGS":
                 st.markdown(
                     f'<div class="pressure-high-container"><h4>🔴 EXTREME LONGS ({pressure_gauge:.1%})</h4><p>Short squeeze potential</p></div>',
                     unsafe_allow_html=True
                 )
-            elif pressure_gauge < -0.5:
+            elif result.pressure == "EXTREME_SHORTS":
                 st.markdown(
                     f'<div class="pressure-low-container"><h4>🟢 EXTREME SHORTS ({abs(pressure_gauge):.1%})</h4><p>Long squeeze potential</p></div>',
                     unsafe_allow_html=True
                 )
-            elif pressure_gauge > 0.2:
+            elif result.pressure == "HIGH_LONGS":
                 st.markdown(
                     f'<div class="pressure-high-container"><h4>🟡 HIGH LONGS ({pressure_gauge:.1%})</h4><p>Caution - longs may be crowded</p></div>',
                     unsafe_allow_html=True
                 )
-            elif pressure_gauge < -0.2:
+            elif result.pressure == "HIGH_SHORTS":
                 st.markdown(
                     f'<div class="pressure-low-container"><h4>🟡 HIGH SHORTS ({abs(pressure_gauge):.1%})</h4><p>Caution - shorts may be crowded</p></div>',
                     unsafe_allow_html=True
@@ -141,23 +184,42 @@ def data_integration_tab():
                     unsafe_allow_html=True
                 )
             
+            # Adaptive regime against the live gauge history
+            if pressure_reading is not None and not math.isnan(pressure_reading.zscore):
+                st.metric(
+                    "Adaptive Pressure Regime",
+                    pressure_reading.regime.replace('_', ' '),
+                    f"z = {pressure_reading.zscore:+.2f} | percentile {pressure_reading.percentile:.0%}"
+                )
+            
             # Funding Analysis
             st.markdown("### 💰 Funding Analysis:")
-            if funding_favorable:
-                st.success(f"✅ SHORTS PAYING LONGS: {short_funding:.5f}% - Strong bullish bias")
+            if funding_rate < 0:
+                st.success(f"✅ SHORTS PAYING LONGS: {funding_rate * 100:.5f}% - Strong bullish bias")
             else:
-                st.error(f"❌ LONGS PAYING SHORTS: {long_funding:.5f}% - Strong bearish bias")
+                st.error(f"❌ LONGS PAYING SHORTS: {funding_rate * 100:.5f}% - Strong bearish bias")
+            
+            funding_cols = st.columns(3)
+            funding_cols[0].metric("Annualized Carry", f"{funding_rate * HOURS_PER_YEAR * 100:.2f}%")
+            if predicted_funding is not None:
+                funding_cols[1].metric("Predicted Next Funding", f"{predicted_funding * 100:.5f}%")
+                funding_cols[2].metric(
+                    "Cross-Venue Spread", f"{funding_view['spread'] * 100:.5f}%",
+                    f"long {funding_view['long_venue']} / short {funding_view['short_venue']}", delta_color="off"
+                )
+                if funding_rate < 0 and not funding_favorable:
+                    st.warning("⚠️ Funding is negative now but predicted to flip - not counted as favorable")
             
             # Confluence Analysis
             st.markdown("### 🔮 Confluence Analysis:")
             
-            if pressure_extreme and funding_favorable and trend_aligned:
+            if result.confluence == "ACHIEVED":
                 st.markdown(
                     '<div class="success-container"><h3>🎯 QUANTUM CONFLUENCE ACHIEVED!</h3><p>Mathematical certainty: Spring uncoiling any moment</p></div>',
                     unsafe_allow_html=True
                 )
                 st.success("✅ ENTRY CONFIRMED - Execute with mathematical precision!")
-            elif pressure_extreme and funding_favorable:
+            elif result.confluence == "STRONG":
                 st.info("ℹ️ STRONG CONFLUENCE - Monitor for entry confirmation")
             else:
                 st.warning("⚠️ INSUFFICIENT CONFLUENCE - Wait for mathematical alignment")
@@ -0,0 +1,63 @@
+import hashlib
+import os
+
+import streamlit as st
+from utils.ingest import DATA_DIR, FORMATS, load_candles, resolve_data_path
+from utils.market_state import find_market_state, get_market_state
+from utils.resample import COLUMNS
+
+def load_into_session(source, key):
+    """Ingest a candle file once per process into the shared market state registered under key"""
+    key = ('candles',) + key
+    state = get_market_state(key)
+    # Only sessions loading this same source wait for each other
+    with state.loading:
+        if state.ingest is None:
+            result = load_candles(source)
+            if result.rows_loaded:
+                state.extend('BTC/USDT', *(result.columns[name] for name in COLUMNS))
+            state.ingest = result
+    st.session_state['candle_source'] = key
+    return state.ingest
+
+def candle_loader_sidebar():
+    """Sidebar loader for exchange-exported 1m candles (CSV, Parquet or binary dumps)"""
+    with st.sidebar:
+        st.markdown("**1m Candle History**")
+        upload = st.file_uploader(
+            "Upload candles:",
+            type=sorted(extension.lstrip('.') for extension in FORMATS),
+            key="candle_upload"
+        )
+        path = st.text_input(f"...or load from {DATA_DIR}/:", "", key="candle_path")
+
+        try:
+            # Keys follow content (upload digest, file mtime) so a changed file is a new source
+            if upload is not None:
+                result = load_into_session(upload, (upload.name, hashlib.blake2b(upload.getvalue(), digest_size=16).hexdigest()))
+            elif path:
+                path = resolve_data_path(path)
+                result = load_into_session(path, (path, os.path.getmtime(path)))
+            else:
+                # The widgets reset while a tab without this sidebar was open; a loaded
+                # source stays until it is unloaded here
+                state = find_market_state(st.session_state.get('candle_source'))
+                if state is None or state.ingest is None or st.button("Unload candles", key="candle_unload"):
+                    st.session_state.pop('candle_source', None)
+                    return
+                result = state.ingest
+        except (OSError, ValueError, ImportError) as e:
+            st.error(f"Could not load candles: {e}")
+            return
+
+        st.caption(
+            f"{result.rows_loaded:,} of {result.rows_read:,} rows loaded "
+            f"({result.source_format}) · {result.error_count:,} rejected"
+        )
+        if result.errors:
+            with st.expander(f"Row errors (first {len(result.errors)})"):
+                st.dataframe(
+                    [error._asdict() for error in result.errors],
+                    use_container_width=True,
+                    hide_index=True
+                )
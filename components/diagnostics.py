@@ -0,0 +1,51 @@
+import streamlit as st
+from utils.instrumentation import metrics, enable, disable, start_metrics_server
+
+def diagnostics_tab():
+    st.header("🩺 Diagnostics")
+    st.markdown("*Call counts, latency and input sizes of the calculation layer*")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        enabled = st.checkbox("Record calculation metrics", value=metrics.enabled, key="metrics_enabled")
+        if enabled != metrics.enabled:
+            enable() if enabled else disable()
+        
+        if st.button("Reset Metrics", type="secondary"):
+            metrics.reset()
+    
+    with col2:
+        port = st.number_input("Metrics Endpoint Port:", min_value=1024, max_value=65535, value=9108, step=1, key="metrics_port")
+        if st.button("Start /metrics Endpoint", type="secondary"):
+            try:
+                server = start_metrics_server(int(port))
+                st.success(f"Serving Prometheus text on http://127.0.0.1:{server.server_port}/metrics (JSON at /metrics.json)")
+            except OSError as e:
+                st.error(f"Could not start the metrics endpoint: {e}")
+    
+    snapshot = metrics.snapshot()
+    if not snapshot:
+        st.info("No calculations recorded yet - enable recording and use the other tabs")
+        return
+    
+    # Heaviest total time first, so the indicators dominating CPU are on top
+    total_seconds = sum(stats['total_seconds'] for stats in snapshot.values()) or 1.0
+    rows = [
+        {
+            'Function': name,
+            'Calls': stats['calls'],
+            'Errors': stats['errors'],
+            'Total (ms)': round(stats['total_seconds'] * 1000, 3),
+            'Share': f"{stats['total_seconds'] / total_seconds:.1%}",
+            'Mean (µs)': round(stats['mean_seconds'] * 1e6, 1),
+            'Max (ms)': round(stats['max_seconds'] * 1000, 3),
+            'Max Input': stats['max_items']
+        }
+        for name, stats in snapshot.items()
+    ]
+    st.dataframe(rows, use_container_width=True)
+    
+    st.download_button("Download JSON", metrics.to_json(indent=2), file_name="oracle_metrics.json", mime="application/json")
+    with st.expander("Prometheus text"):
+        st.code(metrics.prometheus_text(), language="text")
@@ -1,5 +1,9 @@
 import streamlit as st
-from utils.calculations import calculate_fibonacci_levels, calculate_timeframe_multiplier
+from utils.calculations import calculate_timeframe_multiplier
+from utils.fibonacci import FibLadder, latest_swing
+from utils.cache import cached_call
+from utils.market_state import session_view
+from utils.validators import parse_number_list
 
 def fibonacci_tab():
     st.header("🧮 Fibonacci Engine - Multi-Timeframe Analysis")
@@ -43,10 +47,39 @@ def fibonacci_tab():
             key="timeframe"
         )
     
+    auto_swing = st.checkbox("Auto-detect swing high/low from price history", key="fib_auto_swing")
+    if auto_swing:
+        high_history = st.text_input("High Prices (comma separated):", 
+                                     "110000,110100,110200,110150,110250,110300,110200,110100,110150,110200,110100,110050,110000,109950,109900",
+                                     key="fib_high_history")
+        low_history = st.text_input("Low Prices (comma separated):", 
+                                    "109500,109600,109700,109650,109750,109800,109700,109600,109650,109700,109600,109550,109500,109450,109400",
+                                    key="fib_low_history")
+        swing_window = st.slider("Swing Window (bars each side):", min_value=1, max_value=20, value=3, key="fib_swing_window")
+    
     if st.button("🧮 Calculate Fibonacci Analysis", type="secondary"):
         with st.spinner("Calculating Fibonacci levels..."):
             # Calculate Fibonacci levels
-            fib_levels = calculate_fibonacci_levels(high_price, low_price)
+            view = session_view(st.session_state)
+            if auto_swing and view is not None:
+                # The shared market state supplies the selected timeframe's bars; the swing is found once per bar
+                ladder = FibLadder(*view.candles.indicator(timeframe, latest_swing, ('high', 'low'), swing_window))
+                st.info(f"Detected swing high ${ladder.high:,.2f} and swing low ${ladder.low:,.2f} on {len(view.candles.bars(timeframe)['high'])} {timeframe} bars")
+            elif auto_swing:
+                try:
+                    high_list = cached_call(parse_number_list, high_history)
+                    low_list = cached_call(parse_number_list, low_history)
+                except ValueError:
+                    st.error("Please enter valid comma-separated numbers")
+                    return
+                if len(high_list) != len(low_list):
+                    st.error("High and low price histories must have the same length")
+                    return
+                ladder = FibLadder(*cached_call(latest_swing, high_list, low_list, swing_window))
+                st.info(f"Detected swing high ${ladder.high:,.2f} and swing low ${ladder.low:,.2f}")
+            else:
+                ladder = FibLadder(high_price, low_price)
+            fib_levels = ladder.levels
             
             st.markdown("### 📐 Fibonacci Retracement Levels:")
             
@@ -62,13 +95,11 @@ def fibonacci_tab():
             st.markdown("### 📍 Current Price Analysis:")
             
             # Determine which Fibonacci level current price is closest to
-            distances = {name: abs(current_price_fib - value) for name, value in fib_levels.items()}
-            closest_level = min(distances, key=distances.get)
-            closest_distance = distances[closest_level]
+            closest_level, closest_value, closest_distance = ladder.nearest(current_price_fib)
             
             st.metric(
                 label=f"Closest Level: {closest_level}",
-                value=f"${fib_levels[closest_level]:,.2f}",
+                value=f"${closest_value:,.2f}",
                 delta=f"${closest_distance:.2f} away"
             )
             
@@ -76,7 +107,7 @@ def fibonacci_tab():
             st.markdown("### 🎯 Fibonacci Interpretation:")
             
             # Check if price is near specific levels
-            for level_name, level_value in fib_levels.items():
+            for level_name, level_value in ladder.within(current_price_fib, 1000):
                 if level_name not in ['support', 'resistance']:
                     distance = abs(current_price_fib - level_value)
                     if distance < 500:  # If within $500 of level
@@ -1,5 +1,8 @@
 import streamlit as st
-from utils.calculations import calculate_fibonacci_levels, calculate_trend_status
+from utils.calculations import calculate_trend_status
+from utils.fibonacci import FibLadder, latest_swing
+from utils.cache import cached_call
+from utils.validators import parse_number_list
 
 def market_analysis_tab():
     st.header("📈 Market Analysis Dashboard")
@@ -45,10 +48,34 @@ def market_analysis_tab():
             key="recent_low"
         )
     
+    auto_swing = st.checkbox("Auto-detect swing high/low from price history", key="ma_auto_swing")
+    if auto_swing:
+        high_history = st.text_input("High Prices (comma separated):", 
+                                     "110000,110100,110200,110150,110250,110300,110200,110100,110150,110200,110100,110050,110000,109950,109900",
+                                     key="ma_high_history")
+        low_history = st.text_input("Low Prices (comma separated):", 
+                                    "109500,109600,109700,109650,109750,109800,109700,109600,109650,109700,109600,109550,109500,109450,109400",
+                                    key="ma_low_history")
+        swing_window = st.slider("Swing Window (bars each side):", min_value=1, max_value=20, value=3, key="ma_swing_window")
+    
     if st.button("🎯 Analyze Market Structure", type="secondary"):
         with st.spinner("Analyzing market structure..."):
             # Calculate Fibonacci levels
-            fib_levels = calculate_fibonacci_levels(recent_high, recent_low)
+            if auto_swing:
+                try:
+                    high_list = cached_call(parse_number_list, high_history)
+                    low_list = cached_call(parse_number_list, low_history)
+                except ValueError:
+                    st.error("Please enter valid comma-separated numbers")
+                    return
+                if len(high_list) != len(low_list):
+                    st.error("High and low price histories must have the same length")
+                    return
+                ladder = FibLadder(*cached_call(latest_swing, high_list, low_list, swing_window))
+                recent_high, recent_low = ladder.high, ladder.low
+            else:
+                ladder = FibLadder(recent_high, recent_low)
+            fib_levels = ladder.levels
             
             # Trend analysis
             trend_status, trend_emoji = calculate_trend_status(current_price, ma50)
@@ -73,8 +100,7 @@ def market_analysis_tab():
             
             # Price position relative to Fibonacci levels
             st.markdown("### 📍 Price Positioning:")
-            closest_fib = min(fib_levels.values(), key=lambda x: abs(x - current_price))
-            fib_distance = abs(current_price - closest_fib)
+            _, closest_fib, fib_distance = ladder.nearest(current_price)
             st.info(f"Closest Fibonacci level: ${closest_fib:,.2f} (Distance: ${fib_distance:,.2f})")
             
             # Framework integration
@@ -0,0 +1,171 @@
+import os
+import time
+import uuid
+
+import streamlit as st
+from utils.ingest import DATA_DIR, resolve_data_path
+from utils.rules import DEFAULT_RULES, FIELDS, HIDDEN_FIELDS, RuleEngine, TriggerQueue, WebhookSink, configured_webhooks, parse_rules
+from utils.scanner import DEFAULT_CAPACITY, fillable_timeframes, get_scanner, load_candle_store, load_synthetic
+
+@st.cache_resource
+def webhook_sink(name):
+    """One background poster per configured webhook, shared across reruns and sessions"""
+    return WebhookSink(configured_webhooks()[name])
+
+def alert_rules_section(scanner):
+    st.markdown("### 🔔 Alert Rules")
+    st.markdown("*Declarative conditions over indicator fields, evaluated for every symbol on each 1m bar*")
+    
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        rules_text = st.text_area(
+            "Rules (one 'name: condition' per line):",
+            "\n".join(f"{rule.name}: {rule.condition}" for rule in DEFAULT_RULES),
+            height=180,
+            key="scanner_rules"
+        )
+    with col2:
+        replay_bars = st.number_input("Replay Last 1m Bars:", min_value=20, max_value=scanner.capacity, value=min(500, scanner.capacity), step=20, key="scanner_rule_bars")
+        try:
+            webhooks = configured_webhooks()
+        except ValueError as e:
+            st.error(str(e))
+            webhooks = {}
+        webhook = st.selectbox(
+            "Webhook:", ["None"] + sorted(webhooks), key="scanner_webhook",
+            help="Targets are configured on the server through ORACLE_ALERT_WEBHOOKS (name=url, comma separated)"
+        )
+        st.caption("Fields: " + ", ".join(name for name in FIELDS if name not in HIDDEN_FIELDS))
+    
+    if not st.button("🔔 Evaluate Rules", type="secondary"):
+        return
+    try:
+        rules = parse_rules(rules_text)
+        queue = TriggerQueue()
+        sinks = [queue] + ([webhook_sink(webhook)] if webhook in webhooks else [])
+        engine = RuleEngine(scanner.symbols, rules, sinks=sinks)
+    except ValueError as e:
+        st.error(f"Invalid rule: {e}")
+        return
+    
+    engine.set_market(scanner.long_oi, scanner.short_oi, scanner.funding_rate)
+    ts, ohlcv = scanner.tail(int(replay_bars))
+    started = time.perf_counter()
+    engine.replay(ts.max(axis=0), ohlcv, deliver=True)
+    elapsed = time.perf_counter() - started
+    
+    triggers = queue.drain()
+    st.caption(
+        f"{len(rules)} rules × {len(scanner.symbols)} symbols over {int(replay_bars)} bars in {elapsed:.2f}s · "
+        f"{len(triggers):,} triggers{' (oldest ' + format(queue.dropped, ',') + ' dropped)' if queue.dropped else ''}"
+    )
+    if not triggers:
+        st.info("No rule triggered in the replayed window")
+        return
+    st.dataframe(
+        [
+            {
+                'Time (UTC)': time.strftime('%Y-%m-%d %H:%M', time.gmtime(trigger.ts / 1000)),
+                'Rule': trigger.rule,
+                'Symbol': trigger.symbol,
+                'Close': trigger.close
+            }
+            for trigger in reversed(triggers[-200:])
+        ],
+        use_container_width=True
+    )
+
+def scanner_tab():
+    st.header("🛰️ Multi-Symbol Scanner")
+    st.markdown("*RSI, DMI, VWAP, volume, Fibonacci proximity, pressure and trend across every symbol and timeframe*")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        source = st.radio("Candle Source:", ["Candle Store", "Demo Universe"], horizontal=True, key="scanner_source")
+        if source == "Candle Store":
+            store_root = st.text_input(f"Candle Store Directory (under {DATA_DIR}/):", "candles", key="scanner_store_root")
+            try:
+                store_root = resolve_data_path(store_root)
+            except ValueError as e:
+                st.error(f"❌ {e}")
+                return
+            # CandleStore keeps each symbol in <root>/<BASE-QUOTE>/
+            symbols = sorted(
+                name.replace('-', '/') for name in os.listdir(store_root)
+                if os.path.isdir(os.path.join(store_root, name, '1m'))
+            ) if os.path.isdir(store_root) else []
+        else:
+            store_root = None
+            universe_size = st.number_input("Demo Symbols:", min_value=1, max_value=1000, value=200, step=50, key="scanner_demo_size")
+            symbols = [f"DEMO{i:03d}/USDT" for i in range(int(universe_size))]
+    
+    with col2:
+        # Only timeframes a week of 1m history can fill; longer ones would be all NaN
+        scan_timeframes = fillable_timeframes(DEFAULT_CAPACITY)
+        timeframes = st.multiselect("Timeframes:", scan_timeframes, default=scan_timeframes, key="scanner_timeframes")
+        top_n = st.number_input("Rows to Show:", min_value=5, max_value=1000, value=25, step=5, key="scanner_top_n")
+        interval = st.number_input("Rescan Interval (s):", min_value=1.0, value=5.0, step=1.0, key="scanner_interval")
+    
+    if not symbols:
+        st.warning("⚠️ No 1m candle data found - point the scanner at a CandleStore directory or use the demo universe")
+        return
+    
+    key = (source, store_root, tuple(symbols))
+    scanner = get_scanner(key, symbols)
+    if scanner.last_scan is None and not scanner.running:
+        with st.spinner(f"Loading {len(symbols)} symbols..."):
+            if store_root is None:
+                load_synthetic(scanner)
+            else:
+                load_candle_store(scanner, store_root)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("🛰️ Scan Now", type="secondary"):
+            with st.spinner("Scanning universe..."):
+                scanner.scan()
+    with col2:
+        # Each session holds its own subscription; unchecking only withdraws this one
+        token = st.session_state.setdefault("scanner_session", uuid.uuid4().hex)
+        if st.checkbox("Background rescans", key="scanner_background"):
+            scanner.subscribe(token, interval)
+        else:
+            scanner.unsubscribe(token)
+    
+    if scanner.last_scan is None:
+        st.info("Run a scan to build the ranked table")
+        alert_rules_section(scanner)
+        return
+    
+    results = [row for row in scanner.latest if row['timeframe'] in timeframes][:int(top_n)]
+    st.caption(
+        f"{len(scanner.symbols)} symbols × {len(scanner.timeframes)} timeframes in "
+        f"{scanner.last_duration:.2f}s · {'rescanning every ' + format(interval, 'g') + 's' if scanner.running else 'manual'}"
+    )
+    st.dataframe(
+        [
+            {
+                'Symbol': row['symbol'],
+                'TF': row['timeframe'],
+                'Score': round(row['score'], 2),
+                'Price': row['close'],
+                'Confluence': row['confluence'],
+                'Technical': row['technical'],
+                'Trend': row['trend'],
+                'RSI': round(row['rsi'], 1),
+                '+DI': round(row['pdi'], 1),
+                '-DI': round(row['mdi'], 1),
+                'ADX': round(row['adx'], 1),
+                'VWAP': row['vwap'],
+                'Volume': f"{row['volume_status']} / {row['delta_status']}",
+                'Fib Level': row['fib_level'],
+                'Fib Dist %': round(row['fib_distance'] * 100, 3),
+                'Pressure': row['pressure']
+            }
+            for row in results
+        ],
+        use_container_width=True
+    )
+    
+    alert_rules_section(scanner)
@@ -1,5 +1,38 @@
+import math
+
 import streamlit as st
-from utils.calculations import calculate_rsi, calculate_dmi
+from utils.calculations import DMI_PERIODS, calculate_rsi, calculate_dmi, dmi_multi
+from utils.confluence import DMI_LABELS, RSI_LABELS, TECHNICAL_LABELS, dmi_codes, rsi_codes, technical_codes
+from utils.cache import cached_call
+from utils.market_state import HLC, session_view
+from utils.resample import TIMEFRAMES
+from utils.validators import parse_number_list
+
+def trend_strength_heatmap(candles, high_list, low_list, close_list):
+    """Latest ADX per DMI period (rows) and timeframe (columns), one shared pass per timeframe"""
+    st.markdown("#### 🌡️ Multi-Period Trend Strength (ADX):")
+    if candles is not None:
+        adx = {timeframe: candles.indicator(timeframe, dmi_multi, HLC) for timeframe in TIMEFRAMES}
+    else:
+        adx = {'Manual': cached_call(dmi_multi, high_list, low_list, close_list)}
+    
+    rows = []
+    for period in DMI_PERIODS:
+        row = {'Period': period}
+        for timeframe, by_period in adx.items():
+            value = float(by_period[period][2][-1]) if len(by_period[period][2]) else math.nan
+            row[timeframe] = None if math.isnan(value) else round(value, 1)
+        rows.append(row)
+    st.dataframe(
+        rows,
+        column_config={
+            timeframe: st.column_config.ProgressColumn(timeframe, min_value=0, max_value=100, format="%.1f")
+            for timeframe in adx
+        },
+        hide_index=True,
+        use_container_width=True
+    )
+    st.caption("Empty cells need 2 × period + 1 bars on that timeframe; ADX above 25 marks a trending market")
 
 def technical_indicators_tab():
     st.header("📊 Technical Indicators - DMI & RSI Integration")
@@ -47,19 +80,34 @@ def technical_indicators_tab():
         with st.spinner("Calculating DMI and RSI..."):
             # Parse the input data
             try:
-                high_list = [float(x.strip()) for x in high_prices.split(',')]
-                low_list = [float(x.strip()) for x in low_prices.split(',')]
-                close_list = [float(x.strip()) for x in close_prices.split(',')]
-                price_list = [float(x.strip()) for x in prices.split(',')]
-            except:
-                st.error("Please enter valid comma-separated numbers")
+                high_list = cached_call(parse_number_list, high_prices)
+                low_list = cached_call(parse_number_list, low_prices)
+                close_list = cached_call(parse_number_list, close_prices)
+                price_list = cached_call(parse_number_list, prices)
+            except ValueError as e:
+                st.error(f"Please enter valid comma-separated numbers: {e}")
                 return
             
-            # Calculate DMI
-            pdi, mdi = calculate_dmi(high_list, low_list, close_list)
+            # Shared market state (loaded candles or live feed) drives the selected timeframes;
+            # its indicators are computed once per bar for every session viewing it
+            view = session_view(st.session_state)
+            candles = view.candles if view is not None else None
+            if candles is not None:
+                close_list = candles.bars(dmi_timeframe)['close']
+                price_list = candles.bars(rsi_timeframe)['close']
+                st.caption(f"Using {len(close_list)} {dmi_timeframe} DMI bars and {len(price_list)} {rsi_timeframe} RSI bars from the 1m feed")
+                pdi, mdi, adx = candles.indicator(dmi_timeframe, calculate_dmi, HLC)
+                rsi = candles.indicator(rsi_timeframe, calculate_rsi, ('close',))
+            else:
+                pdi, mdi, adx = cached_call(calculate_dmi, high_list, low_list, close_list)
+                rsi = cached_call(calculate_rsi, price_list)
             
-            # Calculate RSI
-            rsi = calculate_rsi(price_list)
+            # Classify with the headless confluence engine; this tab only renders the labels
+            dmi_code = dmi_codes(pdi, mdi)
+            rsi_code = rsi_codes(rsi)
+            dmi_signal = DMI_LABELS[dmi_code]
+            rsi_zone = RSI_LABELS[rsi_code]
+            technical_signal = TECHNICAL_LABELS[technical_codes(dmi_code, rsi_code)]
             
             st.markdown("### 📊 Technical Analysis Results:")
             
@@ -68,7 +116,7 @@ def technical_indicators_tab():
             
             # DMI Analysis
             st.markdown("#### 📈 DMI Analysis:")
-            col_dmi1, col_dmi2 = st.columns(2)
+            col_dmi1, col_dmi2, col_dmi3 = st.columns(3)
             
             with col_dmi1:
                 st.metric("PDI (Positive Directional Indicator)", f"{pdi:.2f}")
@@ -76,13 +124,21 @@ def technical_indicators_tab():
             with col_dmi2:
                 st.metric("MDI (Negative Directional Indicator)", f"{mdi:.2f}")
             
+            with col_dmi3:
+                st.metric("ADX (Trend Strength)", f"{adx:.2f}")
+            
+            if math.isnan(pdi):
+                st.warning(f"⚠️ Not enough bars for DMI: {len(close_list)} given, 15 needed for ±DI and 29 for ADX")
+            elif math.isnan(adx):
+                st.warning(f"⚠️ Not enough bars for ADX: {len(close_list)} given, 29 needed")
+            
             # DMI Interpretation
-            if pdi > mdi + 10:
+            if dmi_signal == "BULLISH":
                 st.markdown(
                     f'<div class="indicator-bullish"><h4>🟢 BULLISH TREND STRENGTH</h4><p>PDI ({pdi:.2f}) significantly stronger than MDI ({mdi:.2f})</p></div>',
                     unsafe_allow_html=True
                 )
-            elif mdi > pdi + 10:
+            elif dmi_signal == "BEARISH":
                 st.markdown(
                     f'<div class="indicator-bearish"><h4>🔴 BEARISH TREND STRENGTH</h4><p>MDI ({mdi:.2f}) significantly stronger than PDI ({pdi:.2f})</p></div>',
                     unsafe_allow_html=True
@@ -93,17 +149,19 @@ def technical_indicators_tab():
                     unsafe_allow_html=True
                 )
             
+            trend_strength_heatmap(candles, high_list, low_list, close_list)
+            
             # RSI Analysis
             st.markdown("#### 📊 RSI Analysis:")
             st.metric("RSI (14-period)", f"{rsi:.2f}")
             
             # RSI Interpretation
-            if rsi > 70:
+            if rsi_zone == "OVERBOUGHT":
                 st.markdown(
                     f'<div class="indicator-bearish"><h4>🔴 OVERBOUGHT ({rsi:.2f})</h4><p>Potential for reversal down</p></div>',
                     unsafe_allow_html=True
                 )
-            elif rsi < 30:
+            elif rsi_zone == "OVERSOLD":
                 st.markdown(
                     f'<div class="indicator-bullish"><h4>🟢 OVERSOLD ({rsi:.2f})</h4><p>Potential for reversal up</p></div>',
                     unsafe_allow_html=True
@@ -117,13 +175,13 @@ def technical_indicators_tab():
             # Combined Analysis
             st.markdown("### 🔮 Combined Technical Analysis:")
             
-            if pdi > mdi + 10 and rsi < 70 and rsi > 30:
+            if technical_signal == "BULLISH_CONFLUENCE":
                 st.success("✅ BULLISH CONFLUENCE: Strong trend + Neutral momentum = AETOS PROTOCOL OPTIMAL")
-            elif mdi > pdi + 10 and rsi < 70 and rsi > 30:
+            elif technical_signal == "BEARISH_CONFLUENCE":
                 st.warning("⚠️ BEARISH CONFLUENCE: Strong trend + Neutral momentum = KHRUSOS PROTOCOL OPTIMAL")
-            elif pdi > mdi + 10 and rsi < 30:
+            elif technical_signal == "BULLISH_DIVERGENCE":
                 st.info("ℹ️ BULLISH DIVERGENCE: Strong trend + Oversold = Potential reversal")
-            elif mdi > pdi + 10 and rsi > 70:
+            elif technical_signal == "BEARISH_DIVERGENCE":
                 st.info("ℹ️ BEARISH DIVERGENCE: Strong trend + Overbought = Potential reversal")
             else:
                 st.info("📊 Mixed signals - Wait for clearer confluence")
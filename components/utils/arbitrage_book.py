@@ -0,0 +1,120 @@
+from collections import namedtuple
+
+from utils.calculations import calculate_implied_probability, calculate_stakes
+
+ArbitrageOpportunity = namedtuple(
+    'ArbitrageOpportunity',
+    ['event_id', 'odds', 'bookmakers', 'total_implied', 'stakes', 'profit']
+)
+
+class EventBook:
+    """Best price per outcome across bookmakers for a single event"""
+    __slots__ = ('num_outcomes', 'quotes', 'best_odds', 'best_books')
+
+    def __init__(self, num_outcomes):
+        self.num_outcomes = num_outcomes
+        self.quotes = [{} for _ in range(num_outcomes)]
+        self.best_odds = [0.0] * num_outcomes
+        self.best_books = [None] * num_outcomes
+
+    def _rescan(self, outcome):
+        quotes = self.quotes[outcome]
+        if quotes:
+            book = max(quotes, key=quotes.get)
+            self.best_odds[outcome] = quotes[book]
+            self.best_books[outcome] = book
+        else:
+            self.best_odds[outcome] = 0.0
+            self.best_books[outcome] = None
+
+    def set_quote(self, outcome, bookmaker, odds):
+        """Store a quote (odds <= 0 or None withdraws it); returns True if the best price changed"""
+        quotes = self.quotes[outcome]
+        best_odds = self.best_odds[outcome]
+        best_book = self.best_books[outcome]
+
+        if odds is None or odds <= 0:
+            if quotes.pop(bookmaker, None) is None:
+                return False
+            if bookmaker == best_book:
+                self._rescan(outcome)
+                return True
+            return False
+
+        quotes[bookmaker] = odds
+        if odds > best_odds:
+            self.best_odds[outcome] = odds
+            self.best_books[outcome] = bookmaker
+            return True
+        if bookmaker == best_book and odds < best_odds:
+            # The best book drifted out; another book may now be best
+            self._rescan(outcome)
+            return True
+        return False
+
+    def total_implied(self):
+        """Total implied probability of the best prices, or None while an outcome is unquoted"""
+        if None in self.best_books:
+            return None
+        return sum(calculate_implied_probability(odds) for odds in self.best_odds)
+
+class ArbitrageBook:
+    """Incremental cross-bookmaker arbitrage search over many events
+
+    Each quote update touches one event; only that event is re-evaluated.
+    """
+
+    def __init__(self, bankroll=100.0):
+        self.bankroll = bankroll
+        self.events = {}
+
+    def add_event(self, event_id, num_outcomes):
+        if event_id not in self.events:
+            self.events[event_id] = EventBook(num_outcomes)
+        return self.events[event_id]
+
+    def remove_event(self, event_id):
+        self.events.pop(event_id, None)
+
+    def update(self, event_id, outcome, bookmaker, odds, num_outcomes=None):
+        """Apply one quote; returns an ArbitrageOpportunity when it moves a best price into an arb, else None"""
+        book = self.events.get(event_id)
+        if book is None:
+            if num_outcomes is None:
+                raise KeyError(f"Unknown event {event_id!r}; pass num_outcomes to create it")
+            book = self.add_event(event_id, num_outcomes)
+
+        if not book.set_quote(outcome, bookmaker, odds):
+            return None
+        return self.evaluate(event_id)
+
+    def update_quote(self, quote, num_outcomes=None):
+        """Apply one OddsQuote"""
+        return self.update(quote.event_id, quote.outcome, quote.bookmaker, quote.odds, num_outcomes)
+
+    def evaluate(self, event_id):
+        """Check one event's best prices for an arbitrage"""
+        book = self.events[event_id]
+        total_implied = book.total_implied()
+        if total_implied is None or total_implied >= 1.0:
+            return None
+
+        implied_probs = [calculate_implied_probability(odds) for odds in book.best_odds]
+        stakes = calculate_stakes(self.bankroll, implied_probs, total_implied)
+        return ArbitrageOpportunity(
+            event_id=event_id,
+            odds=tuple(book.best_odds),
+            bookmakers=tuple(book.best_books),
+            total_implied=total_implied,
+            stakes=tuple(stakes),
+            profit=self.bankroll / total_implied - self.bankroll
+        )
+
+    def opportunities(self):
+        """Scan every event and return all current opportunities"""
+        found = []
+        for event_id in self.events:
+            opportunity = self.evaluate(event_id)
+            if opportunity is not None:
+                found.append(opportunity)
+        return found
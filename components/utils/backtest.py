@@ -0,0 +1,191 @@
+import itertools
+import math
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from utils.calculations import rsi_series, dmi_series, calculate_timeframe_multiplier
+from utils.confluence import (
+    TECHNICAL_LABELS,
+    CONFLUENCE_LABELS,
+    dmi_codes,
+    rsi_codes,
+    technical_codes,
+    evaluate_confluence_series
+)
+from utils.fibonacci import rolling_max, rolling_min
+from utils.instrumentation import instrument
+
+DEFAULT_PARAMS = {
+    'ma_period': 50,
+    'rsi_period': 14,
+    'dmi_period': 14,
+    'swing_window': 50,
+    'fib_ratios': (0.382, 0.5, 0.618),
+    'fib_tolerance': 0.003,     # Entry zone as a fraction of price around each Fibonacci level
+    'use_technical_filter': True,
+    'use_confluence_filter': False,
+    'allow_short': False,       # KHRUSOS is capital preservation unless shorts are enabled
+    'fee_bps': 5.0
+}
+
+Trade = namedtuple('Trade', ['side', 'entry_index', 'exit_index', 'entry_price', 'exit_price', 'return_pct'])
+BacktestResult = namedtuple('BacktestResult', ['params', 'position', 'equity', 'trades', 'stats'])
+
+def moving_average(values, period):
+    """Trailing simple moving average (NaN until period values are available)"""
+    values = np.asarray(values, dtype=float)
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        sums = np.cumsum(np.r_[0.0, values])
+        out[period - 1:] = (sums[period:] - sums[:-period]) / period
+    return out
+
+def fibonacci_proximity(high, low, close, swing_window, ratios, tolerance, swing=None):
+    """True where close sits within tolerance of a retracement level of the trailing swing range"""
+    swing_high, swing_low = swing or (rolling_max(high, swing_window), rolling_min(low, swing_window))
+    diff = swing_high - swing_low
+    near = np.zeros(len(close), dtype=bool)
+    for ratio in ratios:
+        level = swing_high - diff * ratio
+        near |= np.abs(close - level) <= tolerance * close
+    near[:swing_window - 1] = False
+    return near
+
+def _forward_fill(events):
+    """Carry the last non-NaN event forward; leading NaNs become 0 (flat)"""
+    index = np.where(np.isnan(events), 0, np.arange(len(events)))
+    np.maximum.accumulate(index, out=index)
+    filled = events[index]
+    return np.nan_to_num(filled, nan=0.0)
+
+def _extract_trades(position, close, fee):
+    trades = []
+    changes = np.flatnonzero(np.diff(np.r_[0.0, position, 0.0]))
+    for start, end in zip(changes[:-1], changes[1:]):
+        side = position[start]
+        if side == 0:
+            continue
+        # position[t] was signalled on bar t - 1's close and held through bar t
+        entry_index = start - 1
+        exit_index = end - 1
+        entry_price = close[entry_index]
+        exit_price = close[exit_index]
+        gross = (exit_price / entry_price - 1) * side
+        trades.append(Trade(
+            'LONG' if side > 0 else 'SHORT', int(entry_index), int(exit_index),
+            float(entry_price), float(exit_price), float(gross - 2 * fee)
+        ))
+    return trades
+
+def _stats(returns, equity, trades, position, bars_per_year):
+    peak = np.maximum.accumulate(equity)
+    drawdown = equity / peak - 1
+    years = len(returns) / bars_per_year
+    std = returns.std()
+    wins = [trade for trade in trades if trade.return_pct > 0]
+    return {
+        'total_return': float(equity[-1] - 1),
+        'cagr': float(equity[-1] ** (1 / years) - 1) if years > 0 and equity[-1] > 0 else 0.0,
+        'sharpe': float(returns.mean() / std * math.sqrt(bars_per_year)) if std > 0 else 0.0,
+        'max_drawdown': float(drawdown.min()),
+        'num_trades': len(trades),
+        'win_rate': len(wins) / len(trades) if trades else 0.0,
+        'exposure': float(np.mean(position != 0))
+    }
+
+def _cached(cache, key, compute, *args):
+    if cache is None:
+        return compute(*args)
+    if key not in cache:
+        cache[key] = compute(*args)
+    return cache[key]
+
+@instrument(size_arg=None)
+def run_backtest(candles, params=None, timeframe='1h', oi=None, funding_rate=None, cache=None):
+    """Run the AETOS/KHRUSOS protocol over full candle arrays
+
+    candles holds 'high', 'low' and 'close' arrays. oi is an optional (long_oi, short_oi)
+    pair and funding_rate an optional array, both required for the confluence filter.
+    Signals are evaluated on each bar's close and held from the next bar. Passing the
+    same cache dict across runs on the same candles reuses indicators between parameter sets.
+    """
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    high = np.asarray(candles['high'], dtype=float)
+    low = np.asarray(candles['low'], dtype=float)
+    close = np.asarray(candles['close'], dtype=float)
+
+    ma = _cached(cache, ('ma', params['ma_period']), moving_average, close, params['ma_period'])
+    warm = ~np.isnan(ma)
+    aetos = warm & (close > ma)
+    khrusos = warm & (close <= ma)
+    swing_window = params['swing_window']
+    swing = _cached(cache, ('swing', swing_window), lambda: (rolling_max(high, swing_window), rolling_min(low, swing_window)))
+    near_fib = fibonacci_proximity(high, low, close, swing_window, params['fib_ratios'], params['fib_tolerance'], swing)
+
+    long_ok = np.ones(len(close), dtype=bool)
+    short_ok = np.ones(len(close), dtype=bool)
+    if params['use_technical_filter']:
+        pdi, mdi, _ = _cached(cache, ('dmi', params['dmi_period']), dmi_series, high, low, close, params['dmi_period'])
+        rsi = _cached(cache, ('rsi', params['rsi_period']), rsi_series, close, params['rsi_period'])
+        technical = technical_codes(dmi_codes(pdi, mdi), rsi_codes(rsi))
+        long_ok &= np.isin(technical, [TECHNICAL_LABELS.index('BULLISH_CONFLUENCE'), TECHNICAL_LABELS.index('BULLISH_DIVERGENCE')])
+        short_ok &= np.isin(technical, [TECHNICAL_LABELS.index('BEARISH_CONFLUENCE'), TECHNICAL_LABELS.index('BEARISH_DIVERGENCE')])
+    if params['use_confluence_filter']:
+        if oi is None or funding_rate is None:
+            raise ValueError("The confluence filter needs oi and funding_rate series")
+        confluence = evaluate_confluence_series(close, ma, oi[0], oi[1], funding_rate)['confluence']
+        strong = confluence >= CONFLUENCE_LABELS.index('STRONG')
+        long_ok &= strong
+        short_ok &= strong
+
+    long_entry = aetos & near_fib & long_ok
+    short_entry = khrusos & near_fib & short_ok if params['allow_short'] else np.zeros(len(close), dtype=bool)
+    # A close back across the MA ends the protocol that opened the trade
+    trend_flip = np.r_[False, aetos[1:] != aetos[:-1]]
+
+    events = np.full(len(close), np.nan)
+    events[trend_flip] = 0.0
+    events[short_entry] = -1.0
+    events[long_entry] = 1.0
+    signal = _forward_fill(events)
+    position = np.r_[0.0, signal[:-1]]
+
+    fee = params['fee_bps'] / 10_000
+    bar_returns = np.r_[0.0, close[1:] / close[:-1] - 1]
+    turnover = np.abs(np.diff(np.r_[0.0, position]))
+    returns = position * bar_returns - turnover * fee
+    equity = np.cumprod(1 + returns)
+
+    trades = _extract_trades(position, close, fee)
+    bars_per_year = 525_600 / calculate_timeframe_multiplier(timeframe)
+    return BacktestResult(params, position, equity, trades, _stats(returns, equity, trades, position, bars_per_year))
+
+# Candle arrays are handed to each worker once, not pickled per task
+_worker_state = None
+
+def _init_worker(candles, timeframe, oi, funding_rate):
+    global _worker_state
+    _worker_state = (candles, timeframe, oi, funding_rate, {})
+
+def _run_worker(params):
+    candles, timeframe, oi, funding_rate, cache = _worker_state
+    return params, run_backtest(candles, params, timeframe, oi, funding_rate, cache).stats
+
+def parameter_grid(**ranges):
+    """Expand {name: [values]} into a list of parameter dicts"""
+    names = list(ranges)
+    return [dict(zip(names, values)) for values in itertools.product(*(ranges[name] for name in names))]
+
+def run_parameter_sweep(candles, grid, timeframe='1h', oi=None, funding_rate=None,
+                        max_workers=None, sort_by='sharpe'):
+    """Backtest every parameter set in grid on a process pool; returns (params, stats) best first"""
+    candles = {name: np.asarray(candles[name], dtype=float) for name in ('high', 'low', 'close')}
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(candles, timeframe, oi, funding_rate)
+    ) as pool:
+        results = list(pool.map(_run_worker, grid, chunksize=max(1, len(grid) // 64)))
+    return sorted(results, key=lambda item: item[1][sort_by], reverse=True)
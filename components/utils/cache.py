@@ -0,0 +1,167 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+import numpy as np
+
+def fingerprint(value):
+    """Stable hashable key for calculation inputs; arrays are hashed by content"""
+    if isinstance(value, np.ndarray):
+        digest = hashlib.blake2b(np.ascontiguousarray(value).tobytes(), digest_size=16).hexdigest()
+        return ('ndarray', value.dtype.str, value.shape, digest)
+    if isinstance(value, (list, tuple)):
+        if len(value) > 64 and all(isinstance(item, (int, float)) for item in value):
+            return fingerprint(np.asarray(value, dtype=float))
+        return (type(value).__name__,) + tuple(fingerprint(item) for item in value)
+    if isinstance(value, dict):
+        return ('dict',) + tuple(sorted((key, fingerprint(item)) for key, item in value.items()))
+    return value
+
+def input_arrays(value):
+    """Arrays nested in call arguments, for freeze()"""
+    if isinstance(value, np.ndarray):
+        return [value]
+    if isinstance(value, (list, tuple)):
+        return [array for item in value for array in input_arrays(item)]
+    if isinstance(value, dict):
+        return [array for item in value.values() for array in input_arrays(item)]
+    return []
+
+def freeze(value, inputs=()):
+    """Make arrays in a cached result read-only, since every caller shares the same object
+
+    Writable arrays sharing memory with one of inputs (a func returning its argument or
+    a view of it) are copied first, so the caller's own array stays writable. Returns
+    the frozen value, rebuilding tuples whose items were copied.
+    """
+    if isinstance(value, np.ndarray):
+        if value.flags.writeable and any(np.may_share_memory(value, array) for array in inputs):
+            value = value.copy()
+        value.flags.writeable = False
+    elif isinstance(value, list):
+        value[:] = [freeze(item, inputs) for item in value]
+    elif isinstance(value, tuple):
+        items = [freeze(item, inputs) for item in value]
+        if any(new is not old for new, old in zip(items, value)):
+            value = type(value)._make(items) if hasattr(value, '_make') else tuple(items)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            value[key] = freeze(item, inputs)
+    return value
+
+_MISSING = object()
+
+class ComputationCache:
+    """Thread-safe LRU cache with per-entry TTL, shared by every session in the process
+
+    get_or_compute is single-flight: concurrent misses on one key run the computation
+    once and the other callers wait for its result (counted as coalesced, not as misses,
+    and included in hit_rate). Values are handed to every caller as-is, so cache
+    immutable results (numbers, tuples, namedtuples); arrays are frozen on put.
+    """
+
+    def __init__(self, maxsize=1024, ttl=300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.coalesced = 0
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _lookup(self, key):
+        """Live entry value or _MISSING, expiring a stale entry; call with the lock held"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        if time.monotonic() - entry[0] > self.ttl:
+            del self._entries[key]
+            self.evictions += 1
+            return _MISSING
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._lookup(key)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def get_or_compute(self, key, compute, inputs=()):
+        """Cached value for key, calling compute() at most once across concurrent misses
+
+        inputs are the arrays compute() reads, passed on to freeze() by put().
+        """
+        with self._lock:
+            value = self._lookup(key)
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+            pending = self._pending.setdefault(key, threading.Lock())
+        with pending:
+            with self._lock:
+                value = self._lookup(key)
+                if value is not _MISSING:
+                    self.coalesced += 1
+                    return value
+                self.misses += 1
+            try:
+                value = self.put(key, compute(), inputs)
+            finally:
+                with self._lock:
+                    if self._pending.get(key) is pending:
+                        del self._pending[key]
+        return value
+
+    def put(self, key, value, inputs=()):
+        """Store value (frozen, see freeze) and return the stored object"""
+        value = freeze(value, inputs)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.coalesced + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'coalesced': self.coalesced,
+                'size': len(self._entries),
+                'hit_rate': (self.hits + self.coalesced) / total if total else 0.0
+            }
+
+computation_cache = ComputationCache()
+
+def cached_call(func, *args, **kwargs):
+    """Call func through the computation cache, keyed on its name and a hash of the inputs"""
+    key = (func.__module__, func.__qualname__, fingerprint(args), fingerprint(kwargs))
+    return computation_cache.get_or_compute(
+        key, lambda: func(*args, **kwargs), input_arrays(args) + input_arrays(kwargs)
+    )
+
+def memoize(func):
+    """Decorator form of cached_call"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return cached_call(func, *args, **kwargs)
+    return wrapper
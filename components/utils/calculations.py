@@ -1,8 +1,14 @@
 import logging
+import math
+from collections import namedtuple
 from datetime import datetime
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+import numpy as np
+
+from utils.instrumentation import instrument
+from utils.validators import validate_positive_number, validate_decimal_odds, validate_commission
+
+# Handlers and levels are configured by the application entry point, not at import
 logger = logging.getLogger(__name__)
 
 def calculate_implied_probability(decimal_odds):
@@ -25,7 +31,7 @@ def calculate_stakes(bankroll, implied_probs, total_implied):
 
 def calculate_profit(stake, odds):
     """Calculate profit from a single bet"""
-    return (stake * odds) - sum([s for s in calculate_stakes(stake, [1/odds], 1/odds)])
+    return stake * odds - stake
 
 def calculate_pressure_gauge(long_oi, short_oi):
     """Calculate the Pressure Gauge: (Long OI - Short OI) / Total OI"""
@@ -69,150 +75,345 @@ def calculate_timeframe_multiplier(timeframe):
     }
     return multipliers.get(timeframe, 60)
 
-def calculate_rsi(prices, period=14):
-    """Calculate RSI (Simplified version for demonstration)"""
-    if len(prices) < period + 1:
-        return 50  # Default to neutral if not enough data
+# Largest growth factor allowed inside one closed-form Wilder chunk (keeps powers finite)
+WILDER_CHUNK_LOG_LIMIT = 100 * math.log(10)
+# Periods of the multi-period trend-strength view
+DMI_PERIODS = (7, 14, 21, 28)
+
+DMIResult = namedtuple('DMIResult', ['pdi', 'mdi', 'adx'])
+
+def wilder_smooth(values, period):
+    """Wilder's running average (RMA) seeded with the simple mean of the first period values
     
-    # Calculate simple RSI based on price changes
-    gains = 0
-    losses = 0
+    Smooths along the last axis, so stacked series (e.g. TR, +DM and -DM) share one call.
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, np.nan)
+    if period < 1 or values.shape[-1] < period:
+        return out
     
-    for i in range(1, period + 1):
-        change = prices[-i] - prices[-i-1]
-        if change > 0:
-            gains += change
-        else:
-            losses += abs(change)
+    out[..., period - 1] = values[..., :period].mean(axis=-1)
+    tail = values[..., period:] / period
+    decay = 1.0 - 1.0 / period
+    if decay == 0.0:
+        out[..., period:] = tail
+        return out
     
-    if losses == 0:
+    # y[j] = decay^j * (y0 + sum_{i<=j} x[i] / decay^i), evaluated in chunks so decay^-j stays finite
+    chunk_size = max(1, int(WILDER_CHUNK_LOG_LIMIT / -math.log(decay)))
+    prev = out[..., period - 1:period]
+    for start in range(0, tail.shape[-1], chunk_size):
+        chunk = tail[..., start:start + chunk_size]
+        powers = decay ** np.arange(1, chunk.shape[-1] + 1)
+        smoothed = powers * (prev + np.cumsum(chunk / powers, axis=-1))
+        out[..., period + start:period + start + chunk.shape[-1]] = smoothed
+        prev = smoothed[..., -1:]
+    return out
+
+def rsi_from_averages(avg_gain, avg_loss):
+    """Convert average gain/loss into an RSI value"""
+    if avg_loss == 0:
         return 100
-    if gains == 0:
+    if avg_gain == 0:
         return 0
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
+@instrument()
+def rsi_series(prices, period=14):
+    """Calculate the full Wilder RSI series (NaN until period + 1 prices are available)"""
+    # A CandleSeries is read through its close column
+    prices = np.asarray(getattr(prices, 'close', prices), dtype=float)
+    rsi = np.full(len(prices), np.nan)
+    if len(prices) < period + 1:
+        return rsi
+    
+    changes = np.diff(prices)
+    avg_gain = wilder_smooth(np.clip(changes, 0, None), period)
+    avg_loss = wilder_smooth(np.clip(-changes, 0, None), period)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = 100 - (100 / (1 + avg_gain / avg_loss))
+    values = np.where(avg_loss == 0, 100.0, values)
+    values = np.where((avg_gain == 0) & (avg_loss > 0), 0.0, values)
+    values[np.isnan(avg_gain)] = np.nan
+    
+    rsi[1:] = values
+    return rsi
+
+def directional_movement(high_prices, low_prices, close_prices):
+    """True range, +DM and -DM for each bar after the first, stacked as a (3, bars - 1) array"""
+    high = np.asarray(high_prices, dtype=float)
+    low = np.asarray(low_prices, dtype=float)
+    close = np.asarray(close_prices, dtype=float)
+    prev_close = close[:-1]
+    tr = np.maximum.reduce([
+        high[1:] - low[1:],
+        np.abs(high[1:] - prev_close),
+        np.abs(low[1:] - prev_close)
+    ])
+    hd = high[1:] - high[:-1]
+    ld = low[:-1] - low[1:]
+    plus_dm = np.where((hd > 0) & (hd > ld), hd, 0.0)
+    minus_dm = np.where((ld > 0) & (ld > hd), ld, 0.0)
+    return np.stack([tr, plus_dm, minus_dm])
+
+def _dmi_from_movement(movement, period):
+    """+DI, -DI and ADX series for one period from directional_movement output"""
+    n = movement.shape[1] + 1
+    pdi = np.full(n, np.nan)
+    mdi = np.full(n, np.nan)
+    adx = np.full(n, np.nan)
+    if n < period + 1:
+        return pdi, mdi, adx
+    
+    smooth_tr, smooth_pdm, smooth_mdm = wilder_smooth(movement, period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        plus = np.where(smooth_tr > 0, 100 * smooth_pdm / smooth_tr, 0.0)
+        minus = np.where(smooth_tr > 0, 100 * smooth_mdm / smooth_tr, 0.0)
+        di_sum = plus + minus
+        dx = np.where(di_sum > 0, 100 * np.abs(plus - minus) / di_sum, 0.0)
+    valid = ~np.isnan(smooth_tr)
+    plus[~valid] = np.nan
+    minus[~valid] = np.nan
     
-    rs = gains / losses
-    rsi = 100 - (100 / (1 + rs))
-    return min(max(rsi, 0), 100)  # Clamp between 0 and 100
-
-def calculate_dmi(high_prices, low_prices, close_prices, period=14):
-    """Calculate DMI components (Simplified version for demonstration)"""
-    if len(high_prices) < period + 1:
-        return 25, 25  # Default to neutral if not enough data
-    
-    # Calculate simplified DMI components
-    tr_sum = 0
-    hd_sum = 0
-    ld_sum = 0
-    
-    for i in range(1, period + 1):
-        tr = max(
-            high_prices[-i] - low_prices[-i],
-            abs(high_prices[-i] - close_prices[-i-1]),
-            abs(low_prices[-i] - close_prices[-i-1])
-        )
-        tr_sum += tr
-        
-        hd = high_prices[-i] - high_prices[-i-1]
-        ld = low_prices[-i-1] - low_prices[-i]
-        
-        if hd > 0 and hd > ld:
-            hd_sum += hd
-        if ld > 0 and ld > hd:
-            ld_sum += ld
-    
-    if tr_sum == 0:
-        return 0, 0
-    
-    pdi = (hd_sum / tr_sum) * 100 if tr_sum != 0 else 0
-    mdi = (ld_sum / tr_sum) * 100 if tr_sum != 0 else 0
-    
-    return min(pdi, 100), min(mdi, 100)
+    pdi[1:] = plus
+    mdi[1:] = minus
+    adx[period:] = wilder_smooth(dx[period - 1:], period)
+    return pdi, mdi, adx
 
+def _hlc(high_prices, low_prices, close_prices):
+    # A CandleSeries passed alone supplies all three columns
+    if low_prices is None:
+        return high_prices.high, high_prices.low, high_prices.close
+    return high_prices, low_prices, close_prices
+
+@instrument()
+def dmi_series(high_prices, low_prices=None, close_prices=None, period=14):
+    """Calculate full Wilder +DI, -DI and ADX series (NaN until enough bars are available)
+    
+    +DI/-DI start after period + 1 bars and ADX after 2 * period. Pass a CandleSeries
+    as the only positional argument to read its high/low/close columns.
+    """
+    high_prices, low_prices, close_prices = _hlc(high_prices, low_prices, close_prices)
+    if len(high_prices) < 2:
+        return tuple(np.full(len(high_prices), np.nan) for _ in range(3))
+    return _dmi_from_movement(directional_movement(high_prices, low_prices, close_prices), period)
+
+@instrument()
+def dmi_multi(high_prices, low_prices=None, close_prices=None, periods=DMI_PERIODS):
+    """dmi_series for several periods at once: {period: (pdi, mdi, adx)}
+    
+    True range and directional movement are computed once and shared by every period;
+    each period then smooths the stacked TR/+DM/-DM rows in a single pass.
+    """
+    high_prices, low_prices, close_prices = _hlc(high_prices, low_prices, close_prices)
+    if len(high_prices) < 2:
+        return {period: tuple(np.full(len(high_prices), np.nan) for _ in range(3)) for period in periods}
+    movement = directional_movement(high_prices, low_prices, close_prices)
+    return {period: _dmi_from_movement(movement, period) for period in periods}
+
+@instrument()
+def calculate_rsi(prices, period=14):
+    """Calculate the latest Wilder RSI value"""
+    if len(prices) < period + 1:
+        return 50  # Default to neutral if not enough data
+    
+    return float(rsi_series(prices, period)[-1])
+
+@instrument()
+def calculate_dmi(high_prices, low_prices=None, close_prices=None, period=14):
+    """Calculate the latest Wilder +DI, -DI and ADX as a DMIResult (NaN until enough bars)"""
+    pdi, mdi, adx = dmi_series(high_prices, low_prices, close_prices, period)
+    if len(pdi) == 0:
+        return DMIResult(math.nan, math.nan, math.nan)
+    return DMIResult(float(pdi[-1]), float(mdi[-1]), float(adx[-1]))
+
+def classify_volume_ratio(volume_ratio):
+    """Label a current/average volume ratio as HIGH, LOW or AVERAGE"""
+    if volume_ratio > 1.5:
+        return "HIGH"
+    elif volume_ratio < 0.7:
+        return "LOW"
+    return "AVERAGE"
+
+def classify_volume_delta(recent_avg, older_avg):
+    """Label the recent vs older average volume as INCREASING, DECREASING or STABLE"""
+    if recent_avg > older_avg * 1.2:
+        return "INCREASING"
+    elif recent_avg < older_avg * 0.8:
+        return "DECREASING"
+    return "STABLE"
+
+@instrument(size_arg=1)
 def calculate_volume_analysis(current_volume, volume_history):
     """Calculate volume analysis: current vs average, delta, and MA comparison"""
     if len(volume_history) < 2:
         return 50, "NEUTRAL", "NEUTRAL"  # Default values
     
-    avg_volume = sum(volume_history) / len(volume_history)
+    # Candle / CandleSeries inputs are read through their volume fields
+    current_volume = getattr(current_volume, 'volume', current_volume)
+    volume_history = np.asarray(getattr(volume_history, 'volume', volume_history), dtype=float)
+    avg_volume = volume_history.mean()
     
     # Volume vs average
-    volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1
-    if volume_ratio > 1.5:
-        volume_status = "HIGH"
-    elif volume_ratio < 0.7:
-        volume_status = "LOW"
-    else:
-        volume_status = "AVERAGE"
+    volume_ratio = float(current_volume / avg_volume) if avg_volume > 0 else 1
+    volume_status = classify_volume_ratio(volume_ratio)
     
     # Volume delta (trend)
-    recent_avg = sum(volume_history[-5:]) / min(5, len(volume_history))
-    older_avg = sum(volume_history[:5]) / min(5, len(volume_history))
-    
-    if recent_avg > older_avg * 1.2:
-        delta_status = "INCREASING"
-    elif recent_avg < older_avg * 0.8:
-        delta_status = "DECREASING"
-    else:
-        delta_status = "STABLE"
+    recent_avg = volume_history[-5:].mean()
+    older_avg = volume_history[:5].mean()
+    delta_status = classify_volume_delta(recent_avg, older_avg)
     
     return volume_ratio, volume_status, delta_status
 
-def calculate_vwap(prices, volumes):
-    """Calculate VWAP (Volume Weighted Average Price)"""
-    if len(prices) != len(volumes) or len(prices) == 0:
-        return sum(prices) / len(prices) if prices else 0
+@instrument()
+def calculate_vwap(prices, volumes=None):
+    """Calculate VWAP (Volume Weighted Average Price); a CandleSeries alone uses its close and volume"""
+    if volumes is None:
+        prices, volumes = prices.close, prices.volume
+    prices = np.asarray(prices, dtype=float)
+    volumes = np.asarray(volumes, dtype=float)
+    if len(prices) == 0:
+        return 0
+    if len(prices) != len(volumes):
+        return float(prices.mean())
+    
+    total_volume = volumes.sum()
+    return float(np.dot(prices, volumes) / total_volume) if total_volume > 0 else float(prices.mean())
+
+def solve_arbitrage(odds_list, bankroll, commission=0.0, stake_increment=0.0):
+    """Stakes, per-outcome payouts and guaranteed profit for one market
+    
+    commission is charged on net winnings, so each outcome pays stake * (1 + (odds - 1) * (1 - commission)).
+    With a stake_increment, stakes are rounded down to the bookmaker's unit and the leftover bankroll
+    tops up the weakest outcome while that still raises the guaranteed profit. Raises ValueError on
+    invalid inputs, including zero, negative or NaN odds: the pre-kernel formula priced those at
+    probability 0 and reported an arb that left the outcome unhedged.
+    """
+    if not validate_positive_number(bankroll):
+        raise ValueError("Bankroll must be positive")
+    if commission and not validate_commission(commission):
+        raise ValueError("Commission must be between 0 and 1")
+    if stake_increment and not validate_positive_number(stake_increment):
+        raise ValueError("Stake increment must be positive")
+    
+    keep = 1.0 - commission
+    implied_probs = []
+    total_implied = 0.0
+    for odds in odds_list:
+        # OddsQuote objects are read through their odds field
+        odds = getattr(odds, 'odds', odds)
+        if not validate_decimal_odds(odds):
+            raise ValueError(f"Invalid decimal odds: {odds}")
+        # Implied probability of the commission-adjusted odds
+        prob = 1.0 / (commission + odds * keep)
+        implied_probs.append(prob)
+        total_implied += prob
+    
+    if total_implied >= 1.0:
+        return {
+            'is_arb_found': False,
+            'stakes': [],
+            'payouts': [],
+            'profit': 0,
+            'total_staked': 0,
+            'total_implied': total_implied,
+            'implied_probs': implied_probs
+        }
+    
+    # Stake proportional to implied probability so every outcome pays bankroll / total_implied
+    scale = bankroll / total_implied
+    stakes = [prob * scale for prob in implied_probs]
+    if not stake_increment:
+        return {
+            'is_arb_found': scale > bankroll,
+            'stakes': stakes,
+            'payouts': [scale] * len(stakes),
+            'profit': scale - bankroll,
+            'total_staked': bankroll,
+            'total_implied': total_implied,
+            'implied_probs': implied_probs
+        }
     
-    total_value = sum(p * v for p, v in zip(prices, volumes))
-    total_volume = sum(volumes)
+    # Round down to the bookmaker's unit, then top up the weakest outcome with the leftover
+    payouts = [scale] * len(stakes)
+    total_staked = 0.0
+    for i, prob in enumerate(implied_probs):
+        # Small epsilon so exact multiples are not floored a unit down by float error
+        stakes[i] = float(math.floor(stakes[i] / stake_increment + 1e-9)) * stake_increment
+        payouts[i] = stakes[i] / prob
+        total_staked += stakes[i]
+    while total_staked + stake_increment <= bankroll + 1e-9:
+        weakest = min(range(len(payouts)), key=payouts.__getitem__)
+        raised = payouts[weakest] + stake_increment / implied_probs[weakest]
+        others = min((payout for i, payout in enumerate(payouts) if i != weakest), default=raised)
+        if min(raised, others) - stake_increment <= payouts[weakest]:
+            break
+        stakes[weakest] += stake_increment
+        payouts[weakest] = raised
+        total_staked += stake_increment
     
-    return total_value / total_volume if total_volume > 0 else sum(prices) / len(prices)
+    profit = min(payouts) - total_staked
+    return {
+        'is_arb_found': profit > 0,
+        'stakes': stakes,
+        'payouts': payouts,
+        'profit': profit,
+        'total_staked': total_staked,
+        'total_implied': total_implied,
+        'implied_probs': implied_probs
+    }
 
-def process_arbitrage_calculation(odds_list, bankroll):
-    """Process the complete arbitrage calculation"""
+@instrument()
+def process_arbitrage_calculation(odds_list, bankroll, commission=0.0, stake_increment=0.0):
+    """Process the complete arbitrage calculation; invalid odds come back in result['error']"""
     try:
         # Log calculation attempt
-        logger.info(f"Calculation attempt: odds={odds_list}, bankroll={bankroll}")
-        
-        # Calculate implied probabilities
-        implied_probs = [calculate_implied_probability(odd) for odd in odds_list]
-        
-        # Calculate total implied probability
-        total_implied = calculate_total_implied_probability(implied_probs)
-        
-        # Check for arbitrage
-        is_arb_found = total_implied < 1.0
-        
-        if is_arb_found:
-            # Calculate stakes
-            stakes = calculate_stakes(bankroll, implied_probs, total_implied)
-            
-            # Calculate profit (same for all outcomes in valid arb)
-            profit = (stakes[0] * odds_list[0]) - bankroll
-            
-            return {
-                'is_arb_found': True,
-                'stakes': stakes,
-                'profit': profit,
-                'total_implied': total_implied,
-                'implied_probs': implied_probs,
-                'error': None
-            }
-        else:
-            return {
-                'is_arb_found': False,
-                'stakes': [],
-                'profit': 0,
-                'total_implied': total_implied,
-                'implied_probs': implied_probs,
-                'error': None
-            }
+        logger.debug("Calculation attempt: odds=%s, bankroll=%s", odds_list, bankroll)
+        result = solve_arbitrage(odds_list, bankroll, commission, stake_increment)
+        result['error'] = None
+        return result
     except Exception as e:
-        logger.error(f"Calculation error: {str(e)}")
+        logger.error("Calculation error: %s", e)
         return {
             'is_arb_found': False,
             'stakes': [],
+            'payouts': [],
             'profit': 0,
+            'total_staked': 0,
             'total_implied': 0,
             'implied_probs': [],
             'error': str(e)
         }
+
+@instrument()
+def scan_arbitrage_batch(odds, bankroll, mask=None):
+    """Vectorized arbitrage scan over N markets x K outcomes
+    
+    Ragged markets are padded with NaN (or excluded through a boolean mask, True = quoted).
+    Returns the same keys as process_arbitrage_calculation, as arrays with one row per market.
+    """
+    odds = np.asarray(odds, dtype=float)
+    if odds.ndim != 2:
+        raise ValueError("odds must be a 2-D array of shape (markets, outcomes)")
+    valid = ~np.isnan(odds) if mask is None else np.asarray(mask, dtype=bool) & ~np.isnan(odds)
+    bankroll = np.broadcast_to(np.asarray(bankroll, dtype=float), odds.shape[:1])
+    
+    # Non-positive odds imply zero probability, as in calculate_implied_probability
+    quoted = valid & (odds > 0)
+    implied_probs = np.divide(1.0, odds, out=np.zeros_like(odds), where=quoted)
+    total_implied = implied_probs.sum(axis=1)
+    is_arb_found = (total_implied > 0) & (total_implied < 1.0)
+    
+    scale = np.divide(bankroll, total_implied, out=np.zeros_like(total_implied), where=is_arb_found)
+    stakes = implied_probs * scale[:, None]
+    # Every outcome pays bankroll / total_implied in a valid arb
+    profit = np.where(is_arb_found, scale - bankroll, 0.0)
+    
+    return {
+        'is_arb_found': is_arb_found,
+        'stakes': stakes,
+        'profit': profit,
+        'total_implied': total_implied,
+        'implied_probs': implied_probs
+    }
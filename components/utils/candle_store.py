@@ -0,0 +1,96 @@
+import os
+
+import numpy as np
+
+from utils.validators import validate_timeframe
+
+# Fixed-width little-endian columns, one file each
+CANDLE_COLUMNS = {
+    'ts': np.dtype('<i8'),
+    'open': np.dtype('<f8'),
+    'high': np.dtype('<f8'),
+    'low': np.dtype('<f8'),
+    'close': np.dtype('<f8'),
+    'volume': np.dtype('<f8')
+}
+
+class CandleStore:
+    """Append-only memory-mapped columnar candle store for one symbol/timeframe
+
+    Each column lives in its own fixed-width file under <root>/<symbol>/<timeframe>/,
+    so a time-range slice is a zero-copy view of the mapped files.
+    """
+
+    def __init__(self, root, symbol, timeframe):
+        if not validate_timeframe(timeframe):
+            raise ValueError(f"Invalid timeframe: {timeframe}")
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.path = os.path.join(root, symbol.replace('/', '-'), timeframe)
+        os.makedirs(self.path, exist_ok=True)
+        self._maps = None
+        self._mapped_rows = -1
+
+    def _column_path(self, name):
+        return os.path.join(self.path, f"{name}.bin")
+
+    def __len__(self):
+        # A torn append leaves some columns longer; only rows present in every column count
+        rows = []
+        for name, dtype in CANDLE_COLUMNS.items():
+            column_path = self._column_path(name)
+            size = os.path.getsize(column_path) if os.path.exists(column_path) else 0
+            rows.append(size // dtype.itemsize)
+        return min(rows)
+
+    def _columns(self):
+        rows = len(self)
+        if rows != self._mapped_rows:
+            if rows == 0:
+                self._maps = {name: np.empty(0, dtype=dtype) for name, dtype in CANDLE_COLUMNS.items()}
+            else:
+                self._maps = {
+                    name: np.memmap(self._column_path(name), dtype=dtype, mode='r', shape=(rows,))
+                    for name, dtype in CANDLE_COLUMNS.items()
+                }
+            self._mapped_rows = rows
+        return self._maps
+
+    def append(self, ts, open_prices, high_prices, low_prices, close_prices, volumes):
+        """Append candles (scalars or equal-length arrays) with strictly increasing ts"""
+        values = dict(zip(CANDLE_COLUMNS, (ts, open_prices, high_prices, low_prices, close_prices, volumes)))
+        arrays = {name: np.atleast_1d(np.asarray(values[name], dtype=dtype)) for name, dtype in CANDLE_COLUMNS.items()}
+        new_ts = arrays['ts']
+        if len({len(array) for array in arrays.values()}) != 1:
+            raise ValueError("All candle columns must have the same length")
+        if len(new_ts) == 0:
+            return 0
+        if np.any(np.diff(new_ts) <= 0):
+            raise ValueError("Candle timestamps must be strictly increasing")
+        rows = len(self)
+        if rows and new_ts[0] <= self._columns()['ts'][-1]:
+            raise ValueError("Candles must be appended after the last stored timestamp")
+
+        for name, array in arrays.items():
+            with open(self._column_path(name), 'r+b' if os.path.exists(self._column_path(name)) else 'wb') as f:
+                # Drop any torn tail from an interrupted append before writing
+                f.truncate(rows * array.dtype.itemsize)
+                f.seek(0, os.SEEK_END)
+                f.write(array.tobytes())
+        return len(new_ts)
+
+    def columns(self):
+        """Zero-copy read-only views of every stored column"""
+        return dict(self._columns())
+
+    def range(self, start_ts=None, end_ts=None):
+        """Zero-copy column views for start_ts <= ts < end_ts (None leaves that side open)"""
+        columns = self._columns()
+        ts = columns['ts']
+        lo = 0 if start_ts is None else int(np.searchsorted(ts, start_ts, side='left'))
+        hi = len(ts) if end_ts is None else int(np.searchsorted(ts, end_ts, side='left'))
+        return {name: column[lo:hi] for name, column in columns.items()}
+
+    def tail(self, rows):
+        """Zero-copy views of the last rows candles"""
+        return {name: column[-rows:] if rows else column[:0] for name, column in self._columns().items()}
@@ -0,0 +1,145 @@
+from collections import namedtuple
+
+import numpy as np
+
+from utils.instrumentation import instrument
+
+# Thresholds shared by the Pressure Gauge, Technical Indicators, Volume and Confluence tabs
+PRESSURE_EXTREME = 0.5
+PRESSURE_HIGH = 0.2
+DMI_SPREAD = 10
+RSI_OVERBOUGHT = 70
+RSI_OVERSOLD = 30
+
+# Series results hold int8 codes indexing into these label tuples
+PRESSURE_LABELS = ('BALANCED', 'HIGH_LONGS', 'HIGH_SHORTS', 'EXTREME_LONGS', 'EXTREME_SHORTS')
+CONFLUENCE_LABELS = ('INSUFFICIENT', 'STRONG', 'ACHIEVED')
+DMI_LABELS = ('NEUTRAL', 'BULLISH', 'BEARISH')
+RSI_LABELS = ('NEUTRAL', 'OVERSOLD', 'OVERBOUGHT')
+TECHNICAL_LABELS = ('MIXED', 'BULLISH_CONFLUENCE', 'BEARISH_CONFLUENCE', 'BULLISH_DIVERGENCE', 'BEARISH_DIVERGENCE')
+VOLUME_LABELS = ('NONE', 'BREAKOUT_WATCH', 'CONSOLIDATION')
+
+ConfluenceResult = namedtuple('ConfluenceResult', [
+    'pressure_gauge', 'pressure', 'trend_bullish', 'pressure_extreme', 'funding_favorable',
+    'trend_aligned', 'confluence', 'dmi', 'rsi_zone', 'technical', 'volume'
+])
+
+def _codes(conditions, default=0):
+    """First matching condition's 1-based index per element, else default"""
+    return np.select(conditions, np.arange(1, len(conditions) + 1, dtype=np.int8), default).astype(np.int8)
+
+def pressure_gauge_series(long_oi, short_oi):
+    """Vectorized calculate_pressure_gauge"""
+    long_oi = np.asarray(long_oi, dtype=float)
+    short_oi = np.asarray(short_oi, dtype=float)
+    total_oi = long_oi + short_oi
+    return np.divide(long_oi - short_oi, total_oi, out=np.zeros_like(total_oi), where=total_oi != 0)
+
+def pressure_codes(pressure_gauge):
+    pressure_gauge = np.asarray(pressure_gauge, dtype=float)
+    return _codes([
+        (pressure_gauge > PRESSURE_HIGH) & (pressure_gauge <= PRESSURE_EXTREME),
+        (pressure_gauge < -PRESSURE_HIGH) & (pressure_gauge >= -PRESSURE_EXTREME),
+        pressure_gauge > PRESSURE_EXTREME,
+        pressure_gauge < -PRESSURE_EXTREME
+    ])
+
+def dmi_codes(pdi, mdi):
+    pdi = np.asarray(pdi, dtype=float)
+    mdi = np.asarray(mdi, dtype=float)
+    return _codes([pdi > mdi + DMI_SPREAD, mdi > pdi + DMI_SPREAD])
+
+def rsi_codes(rsi):
+    rsi = np.asarray(rsi, dtype=float)
+    return _codes([rsi < RSI_OVERSOLD, rsi > RSI_OVERBOUGHT])
+
+def technical_codes(dmi, rsi_zone):
+    """Combine DMI trend strength and RSI zone as in the Technical Indicators tab"""
+    return _codes([
+        (dmi == 1) & (rsi_zone == 0),
+        (dmi == 2) & (rsi_zone == 0),
+        (dmi == 1) & (rsi_zone == 1),
+        (dmi == 2) & (rsi_zone == 2)
+    ])
+
+def volume_codes(volume_status, delta_status):
+    volume_status = np.asarray(volume_status)
+    delta_status = np.asarray(delta_status)
+    return _codes([
+        (volume_status == "HIGH") & (delta_status == "INCREASING"),
+        (volume_status == "LOW") & (delta_status == "DECREASING")
+    ])
+
+@instrument()
+def evaluate_confluence_series(price, ma50, long_oi, short_oi, funding_rate,
+                               pdi=None, mdi=None, rsi=None, volume_status=None, delta_status=None,
+                               predicted_funding=None):
+    """Evaluate the Quantum Confluence rules over whole time series
+
+    All inputs broadcast against each other. Returns a dict of arrays; categorical
+    fields are int8 codes into the *_LABELS tuples. Where ma50 is NaN the trend is
+    neither bullish nor aligned, so confluence stops at STRONG. Optional groups (DMI/RSI,
+    volume) are omitted from the result when their inputs are not given. With
+    predicted_funding (e.g. from FundingBook.analytics), funding only counts as
+    favorable when the next print is expected to stay negative too.
+    """
+    pressure_gauge = pressure_gauge_series(long_oi, short_oi)
+    price = np.asarray(price, dtype=float)
+    ma50 = np.asarray(ma50, dtype=float)
+    trend_bullish = price > ma50
+    pressure_extreme = np.abs(pressure_gauge) > PRESSURE_EXTREME
+    # Negative funding: shorts pay longs
+    funding_favorable = np.asarray(funding_rate, dtype=float) < 0
+    if predicted_funding is not None:
+        # NaN predictions (no history yet) leave the current-rate rule unchanged
+        predicted_funding = np.asarray(predicted_funding, dtype=float)
+        funding_favorable = funding_favorable & ((predicted_funding < 0) | np.isnan(predicted_funding))
+    # A NaN MA50 (still warming up) leaves the trend undecided, so it can align with nothing
+    trend_known = ~(np.isnan(price) | np.isnan(ma50))
+    trend_aligned = trend_known & ((trend_bullish & (pressure_gauge < 0)) | (~trend_bullish & (pressure_gauge > 0)))
+    strong = pressure_extreme & funding_favorable
+
+    result = {
+        'pressure_gauge': pressure_gauge,
+        'pressure': pressure_codes(pressure_gauge),
+        'trend_bullish': trend_bullish,
+        'pressure_extreme': pressure_extreme,
+        'funding_favorable': funding_favorable,
+        'trend_aligned': trend_aligned,
+        'confluence': _codes([strong & ~trend_aligned, strong & trend_aligned])
+    }
+    if pdi is not None and mdi is not None and rsi is not None:
+        result['dmi'] = dmi_codes(pdi, mdi)
+        result['rsi_zone'] = rsi_codes(rsi)
+        result['technical'] = technical_codes(result['dmi'], result['rsi_zone'])
+    if volume_status is not None and delta_status is not None:
+        result['volume'] = volume_codes(volume_status, delta_status)
+    return result
+
+def evaluate_confluence(price, ma50, long_oi, short_oi, funding_rate,
+                        pdi=None, mdi=None, rsi=None, volume_status=None, delta_status=None,
+                        predicted_funding=None):
+    """Evaluate the Quantum Confluence rules for one bar; returns a ConfluenceResult with labels"""
+    series = evaluate_confluence_series(
+        price, ma50, long_oi, short_oi, funding_rate, pdi, mdi, rsi, volume_status, delta_status,
+        predicted_funding
+    )
+    labels = {
+        'pressure': PRESSURE_LABELS,
+        'confluence': CONFLUENCE_LABELS,
+        'dmi': DMI_LABELS,
+        'rsi_zone': RSI_LABELS,
+        'technical': TECHNICAL_LABELS,
+        'volume': VOLUME_LABELS
+    }
+    fields = {}
+    for name in ConfluenceResult._fields:
+        if name not in series:
+            fields[name] = None
+        elif name in labels:
+            fields[name] = labels[name][int(series[name])]
+        elif series[name].dtype == bool:
+            fields[name] = bool(series[name])
+        else:
+            fields[name] = float(series[name])
+    return ConfluenceResult(**fields)
@@ -0,0 +1,144 @@
+import numpy as np
+
+from utils.resample import COLUMNS
+
+class Candle:
+    """One OHLCV bar without a per-instance __dict__"""
+    __slots__ = COLUMNS
+
+    def __init__(self, ts, open_price, high, low, close, volume):
+        self.ts = ts
+        self.open = open_price
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    def __iter__(self):
+        return iter((self.ts, self.open, self.high, self.low, self.close, self.volume))
+
+    def __eq__(self, other):
+        return isinstance(other, Candle) and tuple(self) == tuple(other)
+
+    def __repr__(self):
+        return f"Candle(ts={self.ts}, open={self.open}, high={self.high}, low={self.low}, close={self.close}, volume={self.volume})"
+
+class CandleSeries:
+    """Struct-of-arrays candle history: one contiguous numpy column per field
+
+    A bar costs 48 bytes instead of a Python object per value. Columns are exposed as
+    views (series.close, series['close']), so a series can be passed wherever the
+    calculations expect price arrays or a candles dict. Appends grow capacity geometrically.
+    """
+
+    def __init__(self, capacity=1024):
+        self.size = 0
+        self._columns = {name: np.empty(capacity, dtype=np.int64 if name == 'ts' else float) for name in COLUMNS}
+
+    @classmethod
+    def from_columns(cls, columns):
+        """Build from a {column: array} mapping such as MultiTimeframeResampler.bars() or CandleStore.range()"""
+        series = cls(capacity=len(columns['close']))
+        series.extend(*(columns[name] for name in COLUMNS))
+        return series
+
+    @classmethod
+    def from_candles(cls, candles):
+        candles = list(candles)
+        series = cls(capacity=len(candles))
+        if candles:
+            series.extend(*zip(*candles))
+        return series
+
+    def __len__(self):
+        return self.size
+
+    def _reserve(self, extra):
+        needed = self.size + extra
+        capacity = len(self._columns['close'])
+        if needed <= capacity:
+            return
+        capacity = max(needed, 2 * capacity)
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            self._columns[name] = grown
+
+    def append(self, ts, open_price, high, low, close, volume):
+        self._reserve(1)
+        i = self.size
+        for name, value in zip(COLUMNS, (ts, open_price, high, low, close, volume)):
+            self._columns[name][i] = value
+        self.size += 1
+
+    def append_candle(self, candle):
+        self.append(*candle)
+
+    def extend(self, ts, open_prices, high_prices, low_prices, close_prices, volumes):
+        count = len(close_prices)
+        self._reserve(count)
+        for name, values in zip(COLUMNS, (ts, open_prices, high_prices, low_prices, close_prices, volumes)):
+            self._columns[name][self.size:self.size + count] = values
+        self.size += count
+
+    def column(self, name):
+        return self._columns[name][:self.size]
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.column(key)
+        if isinstance(key, slice):
+            # Slices copy into a new series so later appends cannot alias
+            return CandleSeries.from_columns({name: self.column(name)[key] for name in COLUMNS})
+        return Candle(*(self.column(name)[key].item() for name in COLUMNS))
+
+    def __iter__(self):
+        for i in range(self.size):
+            yield self[i]
+
+    def keys(self):
+        return COLUMNS
+
+    def to_columns(self):
+        return {name: self.column(name) for name in COLUMNS}
+
+    @property
+    def ts(self):
+        return self.column('ts')
+
+    @property
+    def open(self):
+        return self.column('open')
+
+    @property
+    def high(self):
+        return self.column('high')
+
+    @property
+    def low(self):
+        return self.column('low')
+
+    @property
+    def close(self):
+        return self.column('close')
+
+    @property
+    def volume(self):
+        return self.column('volume')
+
+class OddsQuote:
+    """One bookmaker price for one outcome of an event"""
+    __slots__ = ('event_id', 'outcome', 'bookmaker', 'odds', 'ts')
+
+    def __init__(self, event_id, outcome, bookmaker, odds, ts=None):
+        self.event_id = event_id
+        self.outcome = outcome
+        self.bookmaker = bookmaker
+        self.odds = odds
+        self.ts = ts
+
+    def __iter__(self):
+        return iter((self.event_id, self.outcome, self.bookmaker, self.odds, self.ts))
+
+    def __repr__(self):
+        return f"OddsQuote(event_id={self.event_id!r}, outcome={self.outcome}, bookmaker={self.bookmaker!r}, odds={self.odds})"
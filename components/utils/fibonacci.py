@@ -0,0 +1,82 @@
+from bisect import bisect_left, bisect_right
+from collections import deque
+
+import numpy as np
+
+from utils.calculations import calculate_fibonacci_levels
+from utils.instrumentation import instrument
+
+def _rolling_extreme(values, window, better):
+    """Trailing rolling extreme over window values using a monotonic deque of indices"""
+    out = np.empty(len(values))
+    candidates = deque()
+    for i, value in enumerate(values):
+        while candidates and not better(values[candidates[-1]], value):
+            candidates.pop()
+        candidates.append(i)
+        if candidates[0] <= i - window:
+            candidates.popleft()
+        out[i] = values[candidates[0]]
+    return out
+
+def rolling_max(values, window):
+    """Trailing rolling maximum (the first window - 1 entries cover a partial window)"""
+    return _rolling_extreme(list(values), window, lambda kept, new: kept > new)
+
+def rolling_min(values, window):
+    """Trailing rolling minimum (the first window - 1 entries cover a partial window)"""
+    return _rolling_extreme(list(values), window, lambda kept, new: kept < new)
+
+@instrument()
+def detect_swings(high_prices, low_prices, window=5):
+    """Indices of confirmed swing highs/lows: bars that are the extreme of window bars on each side"""
+    high = np.asarray(high_prices, dtype=float)
+    low = np.asarray(low_prices, dtype=float)
+    span = 2 * window + 1
+    if len(high) < span:
+        return np.array([], dtype=int), np.array([], dtype=int)
+
+    # The trailing extreme ending at i + window is the centered extreme around i
+    centered_max = rolling_max(high, span)[span - 1:]
+    centered_min = rolling_min(low, span)[span - 1:]
+    centers = np.arange(window, len(high) - window)
+    swing_highs = centers[high[centers] == centered_max]
+    swing_lows = centers[low[centers] == centered_min]
+    return swing_highs, swing_lows
+
+def latest_swing(high_prices, low_prices, window=5):
+    """Most recent confirmed swing high and swing low, falling back to the series extremes"""
+    swing_highs, swing_lows = detect_swings(high_prices, low_prices, window)
+    swing_high = high_prices[swing_highs[-1]] if len(swing_highs) else max(high_prices)
+    swing_low = low_prices[swing_lows[-1]] if len(swing_lows) else min(low_prices)
+    return float(swing_high), float(swing_low)
+
+class FibLadder:
+    """Fibonacci levels sorted by price for bisect-based proximity queries"""
+    __slots__ = ('high', 'low', 'names', 'prices', 'levels')
+
+    def __init__(self, high, low):
+        self.high = high
+        self.low = low
+        self.levels = calculate_fibonacci_levels(high, low)
+        ordered = sorted(self.levels.items(), key=lambda item: item[1])
+        self.names = tuple(name for name, _ in ordered)
+        self.prices = tuple(price for _, price in ordered)
+
+    @classmethod
+    def from_series(cls, series, window=5):
+        """Ladder over the latest confirmed swing of a CandleSeries"""
+        return cls(*latest_swing(series.high, series.low, window))
+
+    def nearest(self, price):
+        """Closest level to price: (name, level price, distance)"""
+        i = bisect_left(self.prices, price)
+        if i == len(self.prices) or (i > 0 and price - self.prices[i - 1] <= self.prices[i] - price):
+            i -= 1
+        return self.names[i], self.prices[i], abs(price - self.prices[i])
+
+    def within(self, price, distance):
+        """Levels strictly closer than distance to price, in ascending price order"""
+        lo = bisect_right(self.prices, price - distance)
+        hi = bisect_left(self.prices, price + distance)
+        return [(self.names[i], self.prices[i]) for i in range(lo, hi)]
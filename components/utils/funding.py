@@ -0,0 +1,179 @@
+import numpy as np
+
+# Funding prints per year for an interval in hours (1h perps print 8760 times a year)
+HOURS_PER_YEAR = 8760
+# Exchange-style premium clamp: funding = premium + clamp(interest - premium, -clamp, +clamp),
+# then capped at +-FUNDING_CAP_PER_8H; all three scale with the venue's settlement interval
+INTEREST_PER_8H = 0.0001
+PREMIUM_CLAMP = 0.0005
+FUNDING_CAP_PER_8H = 0.0075
+# Units venues quote funding in, as multipliers to the fraction-per-interval the book stores
+FUNDING_UNITS = {'fraction': 1.0, 'percent': 0.01, 'bps': 0.0001}
+
+def to_fraction(rate, unit='fraction'):
+    """A funding rate quoted in unit (fraction, percent or bps per interval) as a fraction"""
+    try:
+        return rate * FUNDING_UNITS[unit]
+    except KeyError:
+        raise ValueError(f"Unknown funding unit {unit!r}; expected one of {', '.join(FUNDING_UNITS)}") from None
+
+class FundingBook:
+    """Per-venue funding histories for many perps in (instruments, venues, capacity) ring buffers
+
+    Every analytic is a handful of vectorized passes over the whole universe, so a
+    refresh of hundreds of instruments costs milliseconds. Rates are fractions per
+    interval, the unit of INTEREST_PER_8H and PREMIUM_CLAMP; convert venue quotes with
+    to_fraction() before recording them, and to percent only for display. Venues may
+    settle on different intervals (interval_hours and cap_per_8h take a scalar or one
+    value per venue); cross-venue figures compare rates per hour.
+    """
+
+    def __init__(self, instruments, venues, capacity=512, interval_hours=1.0, cap_per_8h=FUNDING_CAP_PER_8H):
+        self.instruments = list(instruments)
+        self.venues = list(venues)
+        self.index = {name: i for i, name in enumerate(self.instruments)}
+        self.venue_index = {name: j for j, name in enumerate(self.venues)}
+        self.capacity = capacity
+        self.interval_hours = np.broadcast_to(np.asarray(interval_hours, dtype=float), (len(self.venues),)).copy()
+        self.cap = np.broadcast_to(np.asarray(cap_per_8h, dtype=float), (len(self.venues),)) * self.interval_hours / 8
+        shape = (len(self.instruments), len(self.venues))
+        self.rates = np.full(shape + (capacity,), np.nan)
+        self.ts = np.zeros(shape + (capacity,), dtype=np.int64)
+        self.counts = np.zeros(shape, dtype=np.int64)
+        self.positions = np.zeros(shape, dtype=np.int64)
+        self.mark = np.full(shape, np.nan)
+        self.index_price = np.full(shape, np.nan)
+
+    @property
+    def periods_per_year(self):
+        """Funding prints per year for each venue"""
+        return HOURS_PER_YEAR / self.interval_hours
+
+    def update(self, rates, ts=0):
+        """Record one funding print per (instrument, venue); NaN marks cells with no new print"""
+        rates = np.asarray(rates, dtype=float)
+        rows, cols = np.nonzero(~np.isnan(rates))
+        slots = self.positions[rows, cols]
+        self.rates[rows, cols, slots] = rates[rows, cols]
+        self.ts[rows, cols, slots] = ts
+        self.positions[rows, cols] = (slots + 1) % self.capacity
+        self.counts[rows, cols] = np.minimum(self.counts[rows, cols] + 1, self.capacity)
+
+    def record(self, instrument, venue, rate, ts=0):
+        """Record a single print, as delivered by a polling feed"""
+        i = self.index[instrument]
+        j = self.venue_index[venue]
+        slot = self.positions[i, j]
+        self.rates[i, j, slot] = rate
+        self.ts[i, j, slot] = ts
+        self.positions[i, j] = (slot + 1) % self.capacity
+        self.counts[i, j] = min(self.counts[i, j] + 1, self.capacity)
+
+    def set_prices(self, mark, index_price):
+        """Perp mark and index prices, (instruments, venues) arrays taken at the same moment"""
+        self.mark[...] = mark
+        self.index_price[...] = index_price
+
+    def set_price(self, instrument, venue, mark, index_price):
+        """Mark and index of one venue, from the same message so the basis has no timing skew"""
+        i = self.index[instrument]
+        j = self.venue_index[venue]
+        self.mark[i, j] = mark
+        self.index_price[i, j] = index_price
+
+    def latest(self):
+        """Most recent print per (instrument, venue), NaN where none has arrived"""
+        last = self.rates[
+            np.arange(len(self.instruments))[:, None],
+            np.arange(len(self.venues))[None, :],
+            (self.positions - 1) % self.capacity
+        ]
+        return np.where(self.counts > 0, last, np.nan)
+
+    def rolling_mean(self, window):
+        """Mean of the last window prints per (instrument, venue)"""
+        # Gather only the newest window slots; ages at or beyond the count are empty
+        window = min(window, self.capacity)
+        ages = np.arange(window)
+        slots = (self.positions[..., None] - 1 - ages) % self.capacity
+        recent = np.take_along_axis(self.rates, slots, axis=2)
+        in_window = ages < self.counts[..., None]
+        counts = in_window.sum(axis=2)
+        with np.errstate(invalid='ignore'):
+            return np.where(in_window, recent, 0.0).sum(axis=2) / np.where(counts > 0, counts, np.nan)
+
+    def basis(self):
+        """Perp premium over the index, (mark - index) / index"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (self.mark - self.index_price) / self.index_price
+
+    def predicted(self, window=8):
+        """Predicted next funding per (instrument, venue)
+
+        Uses the premium/interest formula where both mark and index prices are known,
+        otherwise the rolling mean of recent prints; either is capped at the venue's cap.
+        """
+        scale = self.interval_hours / 8
+        interest = INTEREST_PER_8H * scale
+        premium = self.basis()
+        from_premium = premium + np.clip(interest - premium, -PREMIUM_CLAMP * scale, PREMIUM_CLAMP * scale)
+        predicted = np.where(np.isnan(premium), self.rolling_mean(window), from_premium)
+        return np.clip(predicted, -self.cap, self.cap)
+
+    def analytics(self, window=24, predict_window=8):
+        """Universe-wide funding analytics as a dict of arrays
+
+        Per (instrument, venue), per settlement interval: latest, rolling_mean, predicted,
+        basis; annualized and rolling_annualized; hourly (latest per hour). Per instrument,
+        on hourly rates: consensus and predicted_consensus (mean across venues), spread
+        (max - min across venues), long_venue / short_venue (venue indices with the
+        cheapest / richest funding, -1 when none has printed).
+        """
+        latest = self.latest()
+        rolling = self.rolling_mean(window)
+        hourly = latest / self.interval_hours
+        predicted = self.predicted(predict_window)
+        predicted_hourly = predicted / self.interval_hours
+        quoted = ~np.isnan(latest)
+        any_quoted = quoted.any(axis=1)
+        with np.errstate(invalid='ignore'):
+            consensus = np.where(any_quoted, np.nansum(hourly, axis=1) / np.maximum(quoted.sum(axis=1), 1), np.nan)
+            predicted_quoted = ~np.isnan(predicted_hourly)
+            predicted_consensus = np.where(
+                predicted_quoted.any(axis=1),
+                np.nansum(predicted_hourly, axis=1) / np.maximum(predicted_quoted.sum(axis=1), 1),
+                np.nan
+            )
+        high = np.where(quoted, hourly, -np.inf)
+        low = np.where(quoted, hourly, np.inf)
+        return {
+            'latest': latest,
+            'hourly': hourly,
+            'annualized': latest * self.periods_per_year,
+            'rolling_mean': rolling,
+            'rolling_annualized': rolling * self.periods_per_year,
+            'basis': self.basis(),
+            'predicted': predicted,
+            'consensus': consensus,
+            'predicted_consensus': predicted_consensus,
+            'spread': np.where(any_quoted, high.max(axis=1) - low.min(axis=1), np.nan),
+            'long_venue': np.where(any_quoted, low.argmin(axis=1), -1),
+            'short_venue': np.where(any_quoted, high.argmax(axis=1), -1)
+        }
+
+    def instrument_view(self, instrument, window=24, predict_window=8):
+        """Scalar analytics for one instrument, with venue names resolved; rates are per hour"""
+        result = self.analytics(window, predict_window)
+        i = self.index[instrument]
+        long_venue = result['long_venue'][i]
+        short_venue = result['short_venue'][i]
+        rolling = result['rolling_mean'][i] / self.interval_hours
+        return {
+            'consensus': float(result['consensus'][i]),
+            'annualized': float(result['consensus'][i] * HOURS_PER_YEAR),
+            'predicted': float(result['predicted_consensus'][i]),
+            'rolling_mean': float(np.nanmean(rolling)) if (~np.isnan(rolling)).any() else float('nan'),
+            'spread': float(result['spread'][i]),
+            'long_venue': self.venues[long_venue] if long_venue >= 0 else None,
+            'short_venue': self.venues[short_venue] if short_venue >= 0 else None
+        }
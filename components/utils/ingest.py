@@ -0,0 +1,293 @@
+import io
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from utils.candle_store import CANDLE_COLUMNS
+from utils.resample import COLUMNS
+from utils.validators import candle_row_errors
+
+# pyarrow is optional: it adds Parquet and a multi-threaded CSV reader
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pa_parquet
+except ImportError:
+    pa = None
+
+# Header names used by common exchange exports, lower-cased
+COLUMN_ALIASES = {
+    'ts': ('ts', 'timestamp', 'time', 'open_time', 'opentime', 'date', 'datetime', 't'),
+    'open': ('open', 'o', 'open_price'),
+    'high': ('high', 'h', 'high_price'),
+    'low': ('low', 'l', 'low_price'),
+    'close': ('close', 'c', 'close_price'),
+    'volume': ('volume', 'v', 'vol', 'base_volume', 'volume_base')
+}
+# Little-endian packed records, the same field layout as a CandleStore column set
+CANDLE_RECORD = np.dtype([(name, CANDLE_COLUMNS[name]) for name in COLUMNS])
+# Lines per np.loadtxt slice in the numpy CSV parser
+CSV_CHUNK_ROWS = 10_000
+FORMATS = {'.csv': 'csv', '.txt': 'csv', '.parquet': 'parquet', '.pq': 'parquet', '.bin': 'binary', '.dat': 'binary', '.npy': 'npy'}
+# Server-side candle files may only be read from under this directory
+DATA_DIR = os.environ.get('ORACLE_DATA_DIR', 'data')
+
+RowError = namedtuple('RowError', ['row', 'column', 'value', 'message'])
+IngestResult = namedtuple('IngestResult', ['columns', 'errors', 'error_count', 'rows_read', 'rows_loaded', 'source_format'])
+
+def resolve_data_path(path, root=None):
+    """Real path of a file under the data directory; ValueError for anything that resolves outside it"""
+    root = os.path.realpath(DATA_DIR if root is None else root)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise ValueError(f"{path!r} is outside the data directory {root}")
+    return resolved
+
+def detect_format(name):
+    fmt = FORMATS.get(os.path.splitext(name or '')[1].lower())
+    if fmt is None:
+        raise ValueError(f"Cannot tell the candle format of {name!r}; use one of {sorted(FORMATS)}")
+    return fmt
+
+def _read_source(source):
+    """(bytes, name) from a path or a file-like object such as a Streamlit upload"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            return f.read(), os.fspath(source)
+    data = source.getvalue() if hasattr(source, 'getvalue') else source.read()
+    return data, getattr(source, 'name', None)
+
+def resolve_columns(header):
+    """Index of each candle column in a header row (raises ValueError when one is missing)"""
+    names = [name.strip().strip('"').lower() for name in header]
+    indices = {}
+    for column, aliases in COLUMN_ALIASES.items():
+        matches = [names.index(alias) for alias in aliases if alias in names]
+        if not matches:
+            raise ValueError(f"No {column!r} column in header {header}")
+        indices[column] = matches[0]
+    return indices
+
+# Epoch unit thresholds (current epochs are ~1.7e9 s, ~1.7e12 ms, ~1.7e15 us, ~1.7e18 ns)
+# and the factor taking each unit to milliseconds
+EPOCH_UNITS = ((1e11, 1000), (1e14, 1), (1e17, 1e-3), (np.inf, 1e-6))
+
+def epoch_ms_factor(value):
+    """Multiplier taking an epoch timestamp of this magnitude to milliseconds"""
+    return next(factor for limit, factor in EPOCH_UNITS if abs(value) < limit)
+
+_EPOCH_LIMITS = np.array([limit for limit, _ in EPOCH_UNITS])
+_EPOCH_FACTORS = np.array([factor for _, factor in EPOCH_UNITS])
+
+def epoch_to_ms(values):
+    """Epoch timestamps as float milliseconds, each scaled by its own magnitude like epoch_ms_factor"""
+    values = np.asarray(values, dtype=float)
+    units = np.minimum(np.searchsorted(_EPOCH_LIMITS, np.abs(values), side='right'), len(_EPOCH_LIMITS) - 1)
+    return values * _EPOCH_FACTORS[units]
+
+def _iso_to_ms(fields):
+    """ISO-8601 strings ('T' or space separated, optional Z) as float epoch milliseconds, in one pass"""
+    fields = np.char.strip(np.char.replace(np.char.strip(np.asarray(fields, dtype=str)), ' ', 'T'), '"Z')
+    return fields.astype('datetime64[ms]').astype(np.int64).astype(float)
+
+def normalize_timestamps(ts):
+    """Epoch timestamps in s/ms/us/ns or datetime64 values as int64 milliseconds"""
+    ts = np.asarray(ts)
+    if np.issubdtype(ts.dtype, np.datetime64):
+        return ts.astype('datetime64[ms]').astype(np.int64)
+    if len(ts) == 0:
+        return ts.astype(np.int64)
+    factor = epoch_ms_factor(ts[len(ts) // 2])
+    if factor == 1:
+        return ts.astype(np.int64)
+    if factor > 1 or np.issubdtype(ts.dtype, np.floating):
+        return (ts * factor).astype(np.int64)
+    # Integer division keeps ns/us timestamps exact
+    return ts.astype(np.int64) // round(1 / factor)
+
+def _parse_timestamp(field):
+    """One CSV timestamp as epoch milliseconds: numeric in any epoch unit, or ISO-8601"""
+    try:
+        value = float(field)
+    except ValueError:
+        return float(_iso_to_ms([field])[0])
+    return value * epoch_ms_factor(value)
+
+def _parse_rows(lines, indices, first_row):
+    """Row-by-row fallback used only when the vectorized parse rejects a chunk; records each bad field
+
+    Timestamps come back as epoch milliseconds, like every chunk of _parse_chunks.
+    """
+    columns = {name: [] for name in COLUMNS}
+    rows = []
+    errors = []
+    width = max(indices.values()) + 1
+    for row, line in enumerate(lines, start=first_row):
+        if not line.strip():
+            continue
+        fields = line.split(',')
+        if len(fields) < width:
+            errors.append(RowError(row, None, line[:80], f"expected at least {width} fields, found {len(fields)}"))
+            continue
+        values = {}
+        for name, index in indices.items():
+            try:
+                values[name] = _parse_timestamp(fields[index]) if name == 'ts' else float(fields[index])
+            except ValueError:
+                errors.append(RowError(row, name, fields[index].strip(), "not a number" if name != 'ts' else "not a timestamp"))
+        if len(values) == len(COLUMNS):
+            for name in COLUMNS:
+                columns[name].append(values[name])
+            rows.append(row)
+    return {name: np.array(values, dtype=float) for name, values in columns.items()}, errors, np.array(rows, dtype=np.int64)
+
+def read_csv(data):
+    """Candle columns, parse errors and the file row of the first candle (or of every candle) from CSV bytes"""
+    text = data.decode('utf-8-sig')
+    first_line = text[:text.find('\n')] if '\n' in text else text
+    header = first_line.strip().split(',')
+    # A first field that reads as a timestamp (epoch or ISO-8601) means the file starts with data
+    try:
+        _parse_timestamp(header[0])
+        has_header = False
+        indices = {name: i for i, name in enumerate(COLUMNS)}
+    except ValueError:
+        has_header = True
+        indices = resolve_columns(header)
+    usecols = [indices[name] for name in COLUMNS]
+
+    if pa is not None:
+        read_options = pa_csv.ReadOptions(autogenerate_column_names=not has_header)
+        try:
+            table = pa_csv.read_csv(io.BytesIO(data), read_options=read_options)
+            arrays = [table.column(i) for i in usecols]
+            columns = {}
+            for name, array in zip(COLUMNS, arrays):
+                if name == 'ts':
+                    if pa.types.is_timestamp(array.type) or pa.types.is_date(array.type):
+                        array = pc.cast(array, pa.timestamp('ms'))
+                    columns[name] = array.to_numpy(zero_copy_only=False)
+                else:
+                    columns[name] = pc.cast(array, pa.float64()).to_numpy(zero_copy_only=False)
+            return columns, [], 1 + int(has_header)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            # Malformed rows: fall through to the parse that reports them
+            pass
+
+    lines = text.splitlines()[int(has_header):]
+    return _parse_chunks(lines, indices, usecols, first_row=1 + int(has_header))
+
+def _parse_chunk(chunk, usecols, iso):
+    """One CSV slice parsed by numpy, timestamps as epoch milliseconds; ValueError on any bad line"""
+    if iso:
+        ts = _iso_to_ms(np.loadtxt(chunk, delimiter=',', usecols=usecols[0], ndmin=1, dtype=str))
+        table = np.loadtxt(chunk, delimiter=',', usecols=usecols[1:], ndmin=2, dtype=float)
+        if len(ts) != len(table):
+            raise ValueError("ragged chunk")
+        table = np.column_stack([ts, table])
+    else:
+        table = np.loadtxt(chunk, delimiter=',', usecols=usecols, ndmin=2, dtype=float)
+        table[:, 0] = epoch_to_ms(table[:, 0])
+    return {name: table[:, i] for i, name in enumerate(COLUMNS)}
+
+def _parse_chunks(lines, indices, usecols, first_row):
+    """Vectorized numpy parse in CSV_CHUNK_ROWS slices; only slices containing a bad line go row by row
+
+    Every slice converts its own timestamps to milliseconds, so a slice parsed row by row
+    joins the others in the same unit. ISO-8601 timestamps are detected from the first line.
+    """
+    parts = []
+    errors = []
+    try:
+        float(lines[0].split(',')[usecols[0]]) if lines else 0.0
+        iso = False
+    except (ValueError, IndexError):
+        iso = True
+    for start in range(0, len(lines), CSV_CHUNK_ROWS):
+        chunk = lines[start:start + CSV_CHUNK_ROWS]
+        try:
+            columns = _parse_chunk(chunk, usecols, iso)
+            rows = np.arange(len(columns['ts']), dtype=np.int64) + first_row + start
+        except ValueError:
+            columns, chunk_errors, rows = _parse_rows(chunk, indices, first_row + start)
+            errors.extend(chunk_errors)
+        parts.append((columns, rows))
+    columns = {name: np.concatenate([part[name] for part, _ in parts]) if parts else np.empty(0) for name in COLUMNS}
+    rows = np.concatenate([rows for _, rows in parts]) if parts else np.empty(0, dtype=np.int64)
+    return columns, errors, rows
+
+def read_parquet(data):
+    if pa is None:
+        raise ImportError("Parquet ingest needs pyarrow (pip install pyarrow)")
+    table = pa_parquet.read_table(io.BytesIO(data))
+    indices = resolve_columns(table.column_names)
+    columns = {}
+    for name in COLUMNS:
+        array = table.column(indices[name])
+        if name == 'ts' and (pa.types.is_timestamp(array.type) or pa.types.is_date(array.type)):
+            array = pc.cast(array, pa.timestamp('ms'))
+        elif name != 'ts':
+            array = pc.cast(array, pa.float64())
+        columns[name] = array.to_numpy(zero_copy_only=False)
+    return columns, [], 1
+
+def read_binary(data):
+    """Packed little-endian (ts int64, open/high/low/close/volume float64) records; zero-copy"""
+    rows, remainder = divmod(len(data), CANDLE_RECORD.itemsize)
+    errors = []
+    if remainder:
+        errors.append(RowError(rows + 1, None, f"{remainder} bytes", f"truncated record (expected {CANDLE_RECORD.itemsize} bytes)"))
+    records = np.frombuffer(data, dtype=CANDLE_RECORD, count=rows)
+    return {name: records[name] for name in COLUMNS}, errors, 1
+
+def read_npy(data):
+    """A .npy dump: a structured array with candle fields or a (rows, 6) array in COLUMNS order"""
+    array = np.load(io.BytesIO(data), allow_pickle=False)
+    if array.dtype.names:
+        indices = resolve_columns(array.dtype.names)
+        return {name: array[array.dtype.names[indices[name]]] for name in COLUMNS}, [], 1
+    if array.ndim != 2 or array.shape[1] < len(COLUMNS):
+        raise ValueError(f"Expected a (rows, {len(COLUMNS)}) array, got shape {array.shape}")
+    return {name: array[:, i] for i, name in enumerate(COLUMNS)}, [], 1
+
+READERS = {'csv': read_csv, 'parquet': read_parquet, 'binary': read_binary, 'npy': read_npy}
+
+def load_candles(source, fmt=None, max_errors=100):
+    """Load and validate candles from a path or uploaded file
+
+    Rows failing the candle_row_errors schema checks are dropped and reported as
+    RowError(row, column, value, message) with 1-based file rows (header included for
+    CSV); at most max_errors are listed. error_count is the number of rejected rows, so
+    rows_loaded + error_count == rows_read. Raises ValueError for files that cannot be
+    read at all.
+    """
+    data, name = _read_source(source)
+    fmt = fmt or detect_format(name)
+    columns, errors, rows = READERS[fmt](data)
+    rows_read = len(columns['close']) + len({error.row for error in errors})
+    columns['ts'] = normalize_timestamps(columns['ts'])
+
+    bad = np.zeros(len(columns['close']), dtype=bool)
+    for column, message, mask in candle_row_errors(*(columns[name] for name in COLUMNS)):
+        new = np.flatnonzero(mask & ~bad)
+        for index in new[:max(0, max_errors - len(errors))]:
+            row = rows[index] if isinstance(rows, np.ndarray) else rows + index
+            errors.append(RowError(int(row), column, columns[column][index].item(), message))
+        bad |= mask
+    if bad.any():
+        columns = {name: values[~bad] for name, values in columns.items()}
+    else:
+        columns = {name: np.ascontiguousarray(values) for name, values in columns.items()}
+    errors = sorted(errors[:max_errors], key=lambda error: error.row)
+    # Rows, not fields: a row with several bad fields is one rejection
+    rows_loaded = len(columns['close'])
+    return IngestResult(columns, errors, rows_read - rows_loaded, rows_read, rows_loaded, fmt)
+
+def write_binary(path, columns):
+    """Dump candle columns as packed records readable by read_binary"""
+    records = np.empty(len(columns['close']), dtype=CANDLE_RECORD)
+    for name in COLUMNS:
+        records[name] = columns[name]
+    records.tofile(path)
@@ -0,0 +1,184 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Latency histogram upper bounds in seconds (Prometheus-style, cumulative on export)
+LATENCY_BUCKETS = (1e-6, 1e-5, 1e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+class FunctionStats:
+    """Call count, latency histogram and input sizes for one instrumented name"""
+
+    __slots__ = ('calls', 'errors', 'total_seconds', 'max_seconds', 'buckets', 'items', 'max_items')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.items = 0
+        self.max_items = 0
+
+    def to_dict(self):
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'total_seconds': self.total_seconds,
+            'mean_seconds': self.total_seconds / self.calls if self.calls else 0.0,
+            'max_seconds': self.max_seconds,
+            'buckets': dict(zip([str(bound) for bound in LATENCY_BUCKETS] + ['+Inf'], self.buckets)),
+            'items': self.items,
+            'max_items': self.max_items
+        }
+
+class MetricsRegistry:
+    """Process-wide instrumentation store; recording is a no-op while disabled"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started = time.time()
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds, items=0, error=False):
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = FunctionStats()
+            stats.calls += 1
+            stats.errors += error
+            stats.total_seconds += seconds
+            if seconds > stats.max_seconds:
+                stats.max_seconds = seconds
+            stats.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            stats.items += items
+            if items > stats.max_items:
+                stats.max_items = items
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        """{name: stats dict}, heaviest total time first"""
+        with self._lock:
+            items = [(name, stats.to_dict()) for name, stats in self._stats.items()]
+        return dict(sorted(items, key=lambda item: item[1]['total_seconds'], reverse=True))
+
+    def to_json(self, indent=None):
+        return json.dumps({'enabled': self.enabled, 'started': self.started, 'functions': self.snapshot()}, indent=indent)
+
+    def dump_json(self, path):
+        with open(path, 'w') as f:
+            f.write(self.to_json(indent=2))
+
+    def prometheus_text(self):
+        """Metrics in the Prometheus text exposition format"""
+        lines = [
+            '# HELP oracle_calculation_seconds Latency of instrumented calculations',
+            '# TYPE oracle_calculation_seconds histogram'
+        ]
+        snapshot = self.snapshot()
+        for name, stats in snapshot.items():
+            cumulative = 0
+            for bound, count in stats['buckets'].items():
+                cumulative += count
+                lines.append(f'oracle_calculation_seconds_bucket{{function="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'oracle_calculation_seconds_sum{{function="{name}"}} {stats["total_seconds"]!r}')
+            lines.append(f'oracle_calculation_seconds_count{{function="{name}"}} {stats["calls"]}')
+        lines.append('# HELP oracle_calculation_errors_total Calls that raised')
+        lines.append('# TYPE oracle_calculation_errors_total counter')
+        for name, stats in snapshot.items():
+            lines.append(f'oracle_calculation_errors_total{{function="{name}"}} {stats["errors"]}')
+        lines.append('# HELP oracle_calculation_input_items_total Input items (len of the sized argument) processed')
+        lines.append('# TYPE oracle_calculation_input_items_total counter')
+        for name, stats in snapshot.items():
+            lines.append(f'oracle_calculation_input_items_total{{function="{name}"}} {stats["items"]}')
+        return '\n'.join(lines) + '\n'
+
+metrics = MetricsRegistry(enabled=os.environ.get('ORACLE_METRICS', '') not in ('', '0'))
+
+def enable():
+    metrics.enabled = True
+
+def disable():
+    metrics.enabled = False
+
+def _input_size(value):
+    try:
+        return len(value)
+    except TypeError:
+        return 0
+
+def instrument(name=None, size_arg=0):
+    """Decorator recording calls, latency and len(args[size_arg]) when metrics are enabled
+
+    While disabled the wrapper costs one attribute check per call.
+    """
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return func(*args, **kwargs)
+            items = _input_size(args[size_arg]) if size_arg is not None and len(args) > size_arg else 0
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                metrics.record(label, time.perf_counter() - start, items, error=True)
+                raise
+            metrics.record(label, time.perf_counter() - start, items)
+            return result
+        return wrapper
+    return decorator
+
+@contextmanager
+def timed(name, items=0):
+    """Context manager form of instrument for blocks that are not a single function"""
+    if not metrics.enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        metrics.record(name, time.perf_counter() - start, items, error=True)
+        raise
+    metrics.record(name, time.perf_counter() - start, items)
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == '/metrics':
+            body, content_type = metrics.prometheus_text(), 'text/plain; version=0.0.4'
+        elif self.path == '/metrics.json':
+            body, content_type = metrics.to_json(), 'application/json'
+        else:
+            self.send_error(404)
+            return
+        payload = body.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+_server = None
+
+def start_metrics_server(port=9108, host='127.0.0.1'):
+    """Serve /metrics (Prometheus text) and /metrics.json from a daemon thread; idempotent"""
+    global _server
+    if _server is None:
+        _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        threading.Thread(target=_server.serve_forever, name='metrics-server', daemon=True).start()
+    return _server
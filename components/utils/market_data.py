@@ -0,0 +1,346 @@
+import asyncio
+import json
+import logging
+import random
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import aiohttp
+
+from utils.funding import FUNDING_CAP_PER_8H, FundingBook, to_fraction
+from utils.pressure import RollingPressureStats
+from utils.validators import parse_endpoints
+
+logger = logging.getLogger(__name__)
+
+MarketSnapshot = namedtuple(
+    'MarketSnapshot',
+    ['symbol', 'price', 'long_oi', 'short_oi', 'funding_rate', 'next_funding_ts', 'updated_ts']
+)
+
+# Keys each normalized message type must carry before it is applied
+REQUIRED_FIELDS = {
+    'trade': ('symbol', 'price', 'ts'),
+    'open_interest': ('symbol', 'long_oi', 'short_oi', 'ts'),
+    'funding': ('symbol', 'funding_rate', 'next_funding_ts', 'ts')
+}
+
+# funding_unit is how the venue quotes funding_rate (see utils.funding.FUNDING_UNITS),
+# funding_interval_hours how often it settles and funding_cap its cap per 8 hours
+Venue = namedtuple(
+    'Venue',
+    ['name', 'rest_url', 'ws_url', 'requests_per_second', 'poll_interval', 'funding_unit', 'funding_interval_hours', 'funding_cap'],
+    defaults=('fraction', 1.0, FUNDING_CAP_PER_8H)
+)
+
+def proxy_venue(base_url='http://127.0.0.1:8765', name='Mock Exchange'):
+    """Venue config for a proxy serving the normalized format (see utils.mock_exchange)"""
+    ws_url = base_url.replace('http://', 'ws://').replace('https://', 'wss://') + '/ws'
+    return Venue(name, base_url, ws_url, requests_per_second=10, poll_interval=5.0, funding_unit='percent')
+
+class RateLimiter:
+    """Async token bucket: at most rate acquisitions per second, bursting up to burst"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+def backoff_delays(base=0.5, cap=30.0):
+    """Exponential reconnect delays with full jitter"""
+    attempt = 0
+    while True:
+        yield random.uniform(0, min(cap, base * 2 ** attempt))
+        attempt += 1
+
+class VenueStatus:
+    """Connection health counters for one venue"""
+    __slots__ = ('connected', 'messages', 'reconnects', 'dropped', 'errors', 'last_error', 'last_message_ts')
+
+    def __init__(self):
+        self.connected = False
+        self.messages = 0
+        self.reconnects = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_error = None
+        self.last_message_ts = None
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+class MarketDataFeed:
+    """Asyncio ingestion of price, OI and funding on a background thread
+
+    One pooled aiohttp session serves every venue. Each venue gets a rate-limited REST
+    poller and a WebSocket trade stream that reconnects with backoff. Raw messages
+    pass through a bounded queue (oldest dropped when full) to a single consumer that
+    updates the latest MarketSnapshot per symbol. Funding rates are converted from each
+    venue's funding_unit to fractions per interval on ingest. snapshot() and status()
+    are safe to call from the Streamlit script thread and never block on the network.
+    """
+
+    def __init__(self, venues, symbols=('BTC/USDT',), queue_size=10_000, connection_limit=20):
+        self.venues = list(venues)
+        self.symbols = list(symbols)
+        self.queue_size = queue_size
+        self.connection_limit = connection_limit
+        self.trade_callbacks = []
+        self._snapshots = {
+            symbol: MarketSnapshot(symbol, None, None, None, None, None, None) for symbol in self.symbols
+        }
+        self._status = {venue.name: VenueStatus() for venue in self.venues}
+        self._funding_units = {venue.name: venue.funding_unit for venue in self.venues}
+        self._pressure_stats = {symbol: RollingPressureStats() for symbol in self.symbols}
+        self._pressure = {symbol: None for symbol in self.symbols}
+        self._funding = FundingBook(
+            self.symbols, [venue.name for venue in self.venues],
+            interval_hours=[venue.funding_interval_hours for venue in self.venues],
+            cap_per_8h=[venue.funding_cap for venue in self.venues]
+        )
+        self._lock = threading.Lock()
+        self._thread = None
+        self._loop = None
+        self._stopping = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return self
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name="market-data-feed", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self, timeout=5.0):
+        if not self.running:
+            return
+        self._loop.call_soon_threadsafe(self._stopping.set)
+        self._thread.join(timeout)
+
+    def snapshot(self, symbol):
+        with self._lock:
+            return self._snapshots.get(symbol)
+
+    def pressure(self, symbol):
+        """Latest PressureReading (gauge with rolling z-score/percentile/regime) for a symbol"""
+        with self._lock:
+            return self._pressure.get(symbol)
+
+    def funding(self, symbol):
+        """Funding consensus, annualized carry, predicted next print and cross-venue spread for a symbol"""
+        with self._lock:
+            return self._funding.instrument_view(symbol)
+
+    def status(self):
+        with self._lock:
+            return {name: status.as_dict() for name, status in self._status.items()}
+
+    def _run(self, ready):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._stopping = asyncio.Event()
+        ready.set()
+        try:
+            self._loop.run_until_complete(self._main())
+        finally:
+            self._loop.close()
+
+    async def _main(self):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        connector = aiohttp.TCPConnector(limit=self.connection_limit)
+        async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=10)) as session:
+            tasks = [asyncio.ensure_future(self._consume(queue))]
+            for venue in self.venues:
+                limiter = RateLimiter(venue.requests_per_second)
+                tasks.append(asyncio.ensure_future(self._poll(session, venue, limiter, queue)))
+                tasks.append(asyncio.ensure_future(self._stream(session, venue, queue)))
+            await self._stopping.wait()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _enqueue(self, queue, venue, message):
+        """Non-blocking put; under backpressure the oldest message is discarded"""
+        try:
+            queue.put_nowait((venue.name, message))
+        except asyncio.QueueFull:
+            queue.get_nowait()
+            queue.put_nowait((venue.name, message))
+            with self._lock:
+                self._status[venue.name].dropped += 1
+
+    async def _poll(self, session, venue, limiter, queue):
+        endpoints = ('open_interest', 'funding')
+        while True:
+            for symbol in self.symbols:
+                for endpoint in endpoints:
+                    await limiter.acquire()
+                    try:
+                        async with session.get(f"{venue.rest_url}/api/v1/{endpoint}", params={'symbol': symbol}) as response:
+                            response.raise_for_status()
+                            payload = await response.json()
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        with self._lock:
+                            self._status[venue.name].last_error = f"{endpoint}: {e}"
+                        logger.warning("%s %s poll failed: %s", venue.name, endpoint, e)
+                        continue
+                    except ValueError as e:
+                        # Malformed JSON is counted like a rejected message; the poller keeps going
+                        with self._lock:
+                            self._record_error(venue.name, f"{endpoint}: invalid JSON: {e}")
+                        logger.warning("%s %s returned invalid JSON: %s", venue.name, endpoint, e)
+                        continue
+                    if not isinstance(payload, dict):
+                        with self._lock:
+                            self._record_error(venue.name, f"{endpoint}: expected a JSON object, got {type(payload).__name__}")
+                        logger.warning("%s %s returned %r", venue.name, endpoint, payload)
+                        continue
+                    payload['type'] = endpoint
+                    self._enqueue(queue, venue, payload)
+            await asyncio.sleep(venue.poll_interval)
+
+    async def _stream(self, session, venue, queue):
+        status = self._status[venue.name]
+        delays = backoff_delays()
+        while True:
+            try:
+                async with session.ws_connect(venue.ws_url, heartbeat=20) as ws:
+                    await ws.send_str(json.dumps({'op': 'subscribe', 'symbols': self.symbols}))
+                    with self._lock:
+                        status.connected = True
+                    delays = backoff_delays()
+                    async for msg in ws:
+                        if msg.type != aiohttp.WSMsgType.TEXT:
+                            break
+                        payload = json.loads(msg.data)
+                        for message in payload if isinstance(payload, list) else [payload]:
+                            self._enqueue(queue, venue, message)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                with self._lock:
+                    status.last_error = f"stream: {e}"
+                logger.warning("%s stream error: %s", venue.name, e)
+            with self._lock:
+                status.connected = False
+                status.reconnects += 1
+            await asyncio.sleep(next(delays))
+
+    async def _consume(self, queue):
+        while True:
+            venue_name, message = await queue.get()
+            # Drain whatever else is queued so one lock acquisition covers the batch
+            batch = [(venue_name, message)]
+            while not queue.empty() and len(batch) < 1000:
+                batch.append(queue.get_nowait())
+            trades = []
+            with self._lock:
+                for venue_name, message in batch:
+                    # A bad message is counted and skipped; it must not end the consumer
+                    try:
+                        self._apply(venue_name, message, trades)
+                    except Exception as e:
+                        self._record_error(venue_name, f"message: {e!r}")
+                        logger.warning("%s rejected message %r: %r", venue_name, message, e)
+            for callback in list(self.trade_callbacks):
+                for venue_name, trade in trades:
+                    try:
+                        callback(trade)
+                    except Exception as e:
+                        with self._lock:
+                            self._record_error(venue_name, f"callback {getattr(callback, '__qualname__', callback)}: {e!r}")
+                        logger.exception("Trade callback %r failed", callback)
+
+    def _record_error(self, venue_name, error):
+        status = self._status[venue_name]
+        status.errors += 1
+        status.last_error = error
+
+    def _apply(self, venue_name, message, trades):
+        if not isinstance(message, dict):
+            raise TypeError(f"expected a JSON object, got {type(message).__name__}")
+        kind = message.get('type')
+        missing = [key for key in REQUIRED_FIELDS.get(kind, ()) if message.get(key) is None]
+        if missing:
+            raise KeyError(f"{kind} message missing {', '.join(missing)}")
+        snapshot = self._snapshots.get(message.get('symbol'))
+        if snapshot is None:
+            return
+        status = self._status[venue_name]
+        status.messages += 1
+        status.last_message_ts = message.get('ts')
+        if kind == 'trade':
+            snapshot = snapshot._replace(price=message['price'], updated_ts=message['ts'])
+            trades.append((venue_name, message))
+        elif kind == 'open_interest':
+            snapshot = snapshot._replace(long_oi=message['long_oi'], short_oi=message['short_oi'], updated_ts=message['ts'])
+            self._pressure[snapshot.symbol] = self._pressure_stats[snapshot.symbol].update(message['long_oi'], message['short_oi'])
+        elif kind == 'funding':
+            funding_rate = to_fraction(float(message['funding_rate']), self._funding_units[venue_name])
+            snapshot = snapshot._replace(
+                funding_rate=funding_rate,
+                next_funding_ts=message['next_funding_ts'],
+                updated_ts=message['ts']
+            )
+            self._funding.record(snapshot.symbol, venue_name, funding_rate, message['ts'])
+            # The basis needs mark and index from one moment: the message's own mark, else
+            # the last trade price as of this poll (never a later trade against this index)
+            mark = message.get('mark_price', snapshot.price)
+            if message.get('index_price') is not None and mark is not None:
+                self._funding.set_price(snapshot.symbol, venue_name, mark, message['index_price'])
+        self._snapshots[snapshot.symbol] = snapshot
+
+# Proxies the dashboard may connect to when ORACLE_MARKET_FEEDS is not set
+DEFAULT_FEEDS = 'Mock Exchange=http://127.0.0.1:8765'
+
+def configured_feeds(value=None):
+    """Market-data proxies allowed on this server: {name: url} from ORACLE_MARKET_FEEDS
+
+    Comma-separated name=url pairs, defaulting to the local mock exchange. Feeds come only
+    from server configuration, never from dashboard input. Raises ValueError on a
+    malformed entry.
+    """
+    value = os.environ.get('ORACLE_MARKET_FEEDS', DEFAULT_FEEDS) if value is None else value
+    return parse_endpoints(value, 'ORACLE_MARKET_FEEDS')
+
+# One feed per configured proxy URL, shared by every Streamlit session in the process.
+# Each feed owns a thread and event loop; beyond MAX_FEEDS the least recently used is stopped.
+MAX_FEEDS = 4
+_feeds = OrderedDict()
+_feeds_lock = threading.Lock()
+
+def get_market_feed(base_url, symbols=('BTC/USDT',)):
+    """Start (once) and return the process-wide feed for a configured proxy or mock exchange URL"""
+    if base_url not in configured_feeds().values():
+        raise ValueError(f"{base_url!r} is not a configured market feed (ORACLE_MARKET_FEEDS)")
+    evicted = []
+    with _feeds_lock:
+        feed = _feeds.get(base_url)
+        if feed is None or not feed.running:
+            feed = MarketDataFeed([proxy_venue(base_url, name=base_url)], symbols)
+            _feeds[base_url] = feed.start()
+        _feeds.move_to_end(base_url)
+        while len(_feeds) > MAX_FEEDS:
+            evicted.append(_feeds.popitem(last=False)[1])
+    # Joining a feed's thread can take a moment; do it without holding the registry lock
+    for stale in evicted:
+        stale.stop()
+    return feed
@@ -0,0 +1,243 @@
+import itertools
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from utils.cache import computation_cache, fingerprint
+from utils.resample import COLUMNS, MINUTE_MS, MultiTimeframeResampler
+
+# Point-in-time state of one symbol. candles is a CandleFrame shared by every view
+# published between two candle writes; snapshot/pressure/funding come from the feed.
+MarketView = namedtuple('MarketView', ['symbol', 'version', 'candles', 'snapshot', 'pressure', 'funding', 'updated'])
+
+HLC = ('high', 'low', 'close')
+
+_sources = itertools.count()
+
+def _frozen(column):
+    column.flags.writeable = False
+    return column
+
+class CandleFrame:
+    """Read-only candles of one symbol at one candle version, on every timeframe
+
+    The 1m columns are views of the writer's base buffer up to the captured size (the
+    writer only appends past it); higher timeframes keep views of the completed bars plus
+    the open bar, and get the open bar appended on first access. Arrays and
+    indicator() results are then shared by every session reading this frame.
+    """
+    __slots__ = ('source', 'symbol', 'version', 'size', '_base', '_frames', '_bars', '_lock')
+
+    def __init__(self, source, symbol, version, resampler):
+        self.source = source
+        self.symbol = symbol
+        self.version = version
+        self.size = len(resampler)
+        self._base = {name: _frozen(column) for name, column in resampler.base().items()}
+        self._frames = {
+            tf: (state.completed(), state.partial())
+            for tf, state in resampler.states.items()
+        }
+        self._bars = {'1m': self._base}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.size
+
+    def bars(self, timeframe):
+        """OHLCV column arrays for a timeframe, including the still-open bar"""
+        with self._lock:
+            bars = self._bars.get(timeframe)
+            if bars is None:
+                completed, partial = self._frames[timeframe]
+                if partial[0] is None:
+                    bars = {name: column.view() for name, column in completed.items()}
+                else:
+                    bars = {name: np.append(completed[name], value) for name, value in zip(COLUMNS, partial)}
+                bars = self._bars[timeframe] = {name: _frozen(column) for name, column in bars.items()}
+        return bars
+
+    def indicator(self, timeframe, func, columns, *args, **kwargs):
+        """func(*bar columns, *args, **kwargs), computed once per candle version for all readers
+
+        The cache key is the frame's identity rather than a hash of the bar arrays, so a
+        hit costs the same for a million bars as for fifteen.
+        """
+        key = (
+            'market_state', self.source, self.symbol, self.version, timeframe,
+            func.__module__, func.__qualname__, tuple(columns), fingerprint(args), fingerprint(kwargs)
+        )
+        return computation_cache.get_or_compute(
+            key, lambda: func(*(self.bars(timeframe)[name] for name in columns), *args, **kwargs)
+        )
+
+class MarketState:
+    """Process-wide candle, OI and funding state for a set of symbols, shared by every session
+
+    Writers (bulk loads, closed 1m candles, trades from an attached MarketDataFeed) hold
+    the lock and publish a new MarketView; published views and their CandleFrames are
+    never modified, so readers take a view without locking and see one consistent
+    state for a whole script run. Price, OI, pressure and funding are pulled from the
+    feed by whichever reader first finds them older than market_interval seconds.
+    """
+
+    def __init__(self, symbols=('BTC/USDT',), market_interval=1.0, capacity=1024):
+        self.symbols = list(symbols)
+        self.market_interval = market_interval
+        self.feed = None
+        self.ingest = None
+        self.loading = threading.Lock()  # held while a bulk load for this source runs
+        self.publishes = 0
+        self.market_refreshes = 0
+        self.last_used = time.monotonic()
+        self._source = next(_sources)
+        self._resamplers = {symbol: MultiTimeframeResampler(capacity=capacity) for symbol in self.symbols}
+        self._minutes = {symbol: None for symbol in self.symbols}  # open 1m bar folded from trades
+        self._views = {
+            symbol: MarketView(symbol, 0, CandleFrame(self._source, symbol, 0, resampler), None, None, None, 0.0)
+            for symbol, resampler in self._resamplers.items()
+        }
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()
+
+    def view(self, symbol):
+        """Latest published MarketView for a symbol"""
+        view = self._views[symbol]
+        if self.feed is not None and time.monotonic() - view.updated > self.market_interval:
+            # One reader refreshes; the rest keep the current view instead of queueing
+            if self._refreshing.acquire(blocking=False):
+                try:
+                    view = self._refresh_market(symbol)
+                finally:
+                    self._refreshing.release()
+        return view
+
+    def extend(self, symbol, ts, open_prices, high_prices, low_prices, close_prices, volumes):
+        """Bulk-load 1m history for a symbol"""
+        with self._lock:
+            self._resamplers[symbol].extend(ts, open_prices, high_prices, low_prices, close_prices, volumes)
+            self._publish_candles(symbol)
+
+    def update(self, symbol, ts, open_price, high, low, close, volume):
+        """Append one closed 1m candle; returns the timeframes whose previous bar just closed"""
+        with self._lock:
+            rolled = self._resamplers[symbol].update(ts, open_price, high, low, close, volume)
+            self._publish_candles(symbol)
+        return rolled
+
+    def attach_feed(self, feed):
+        """Take price, OI and funding from a MarketDataFeed and build 1m candles from its trades"""
+        with self._lock:
+            if self.feed is feed:
+                return self
+            if self.feed is not None and self.on_trade in self.feed.trade_callbacks:
+                self.feed.trade_callbacks.remove(self.on_trade)
+            self.feed = feed
+            feed.trade_callbacks.append(self.on_trade)
+        return self
+
+    def close(self):
+        """Stop taking trades from the attached feed so the state can be released"""
+        with self._lock:
+            if self.feed is not None and self.on_trade in self.feed.trade_callbacks:
+                self.feed.trade_callbacks.remove(self.on_trade)
+            self.feed = None
+
+    def on_trade(self, trade):
+        """Fold a trade into the open 1m candle; the candle is appended once a later minute starts"""
+        symbol = trade.get('symbol')
+        if symbol not in self._minutes:
+            return
+        bucket = trade['ts'] // MINUTE_MS * MINUTE_MS
+        price, size = trade['price'], trade.get('size', 0.0)
+        with self._lock:
+            minute = self._minutes[symbol]
+            if minute is not None and bucket == minute[0]:
+                minute[2] = max(minute[2], price)
+                minute[3] = min(minute[3], price)
+                minute[4] = price
+                minute[5] += size
+                return
+            if minute is not None and bucket < minute[0]:
+                return
+            resampler = self._resamplers[symbol]
+            if minute is not None and (not len(resampler) or minute[0] > resampler.base()['ts'][-1]):
+                resampler.update(*minute)
+                self._publish_candles(symbol)
+            self._minutes[symbol] = [bucket, price, price, price, price, size]
+
+    def _publish_candles(self, symbol):
+        view = self._views[symbol]
+        frame = CandleFrame(self._source, symbol, view.candles.version + 1, self._resamplers[symbol])
+        self._views[symbol] = view._replace(version=view.version + 1, candles=frame)
+        self.publishes += 1
+
+    def _refresh_market(self, symbol):
+        feed = self.feed
+        snapshot, pressure, funding = feed.snapshot(symbol), feed.pressure(symbol), feed.funding(symbol)
+        with self._lock:
+            view = self._views[symbol]
+            view = self._views[symbol] = view._replace(
+                version=view.version + 1, snapshot=snapshot, pressure=pressure, funding=funding, updated=time.monotonic()
+            )
+            self.publishes += 1
+            self.market_refreshes += 1
+        return view
+
+    def stats(self):
+        with self._lock:
+            return {
+                'symbols': len(self.symbols),
+                'bars': {symbol: len(view.candles) for symbol, view in self._views.items()},
+                'publishes': self.publishes,
+                'market_refreshes': self.market_refreshes
+            }
+
+# One MarketState per data source (candle file, live feed URL), shared by every session.
+# States idle for STATE_IDLE_SECONDS, or beyond the MAX_STATES most recently used, are
+# dropped; a session whose state was dropped gets it rebuilt by its loader on the next run.
+MAX_STATES = 8
+STATE_IDLE_SECONDS = 3600.0
+_states = OrderedDict()
+_states_lock = threading.Lock()
+
+def _evict(now):
+    # Least recently used first; caller holds _states_lock
+    while _states:
+        key, state = next(iter(_states.items()))
+        if len(_states) <= MAX_STATES and now - state.last_used <= STATE_IDLE_SECONDS:
+            break
+        del _states[key]
+        state.close()
+
+def _lookup(key, create=None):
+    now = time.monotonic()
+    with _states_lock:
+        state = _states.get(key)
+        if state is None and create is not None:
+            state = _states[key] = create()
+        if state is not None:
+            state.last_used = now
+            _states.move_to_end(key)
+        _evict(now)
+        return state
+
+def get_market_state(key, symbols=('BTC/USDT',), **kwargs):
+    """Create (once) and return the process-wide MarketState registered under key"""
+    return _lookup(key, lambda: MarketState(symbols, **kwargs))
+
+def find_market_state(key):
+    """The MarketState registered under key, or None if it was never created or has been evicted"""
+    return _lookup(key) if key is not None else None
+
+def session_view(session_state, symbol='BTC/USDT'):
+    """The MarketView a session reads: its loaded candle file, else its live feed once it has candles"""
+    for name in ('candle_source', 'live_feed'):
+        state = find_market_state(session_state.get(name))
+        if state is not None and symbol in state.symbols:
+            view = state.view(symbol)
+            if len(view.candles):
+                return view
+    return None
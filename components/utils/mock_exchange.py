@@ -0,0 +1,163 @@
+"""Local stand-in exchange for offline testing of the market-data layer
+
+Serves the normalized REST/WebSocket format that utils.market_data expects:
+
+    GET /api/v1/ticker?symbol=BTC/USDT
+    GET /api/v1/open_interest?symbol=BTC/USDT
+    GET /api/v1/funding?symbol=BTC/USDT  (funding_rate in percent per hour, mark_price and index_price)
+    WS  /ws  (send {"op": "subscribe", "symbols": [...]}, receive batches of trade ticks)
+    POST /api/v1/alerts  (webhook stand-in: stores posted alert batches)
+    GET  /api/v1/alerts  (the most recent posted alerts)
+
+Run from components/:  python -m utils.mock_exchange --port 8765 --tick-rate 5000
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import deque
+
+from aiohttp import web, WSMsgType
+
+class MockExchange:
+    """Random-walk prices, open interest and funding for a set of symbols"""
+
+    def __init__(self, symbols=('BTC/USDT',), tick_rate=1000, drop_after=None, seed=None, alert_history=10_000):
+        self.symbols = list(symbols)
+        self.tick_rate = tick_rate
+        # Close each WebSocket after this many ticks to exercise client reconnects
+        self.drop_after = drop_after
+        self.rng = random.Random(seed)
+        self.prices = {symbol: 110000.0 for symbol in self.symbols}
+        self.long_oi = {symbol: 1_700_000.0 for symbol in self.symbols}
+        self.short_oi = {symbol: 3_600_000.0 for symbol in self.symbols}
+        self.funding = {symbol: -0.00096 for symbol in self.symbols}  # percent per hour
+        self.basis = {symbol: -0.0002 for symbol in self.symbols}
+        self.alerts = deque(maxlen=alert_history)
+
+    def _symbol(self, request):
+        symbol = request.query.get('symbol', self.symbols[0])
+        if symbol not in self.prices:
+            raise web.HTTPNotFound(text=json.dumps({'error': f"Unknown symbol {symbol}"}), content_type='application/json')
+        return symbol
+
+    def _tick(self, symbol):
+        price = self.prices[symbol] * (1 + self.rng.gauss(0, 0.0002))
+        self.prices[symbol] = price
+        return {
+            'type': 'trade',
+            'symbol': symbol,
+            'price': price,
+            'size': self.rng.expovariate(4.0),
+            'ts': int(time.time() * 1000)
+        }
+
+    async def ticker(self, request):
+        symbol = self._symbol(request)
+        return web.json_response({'symbol': symbol, 'price': self.prices[symbol], 'ts': int(time.time() * 1000)})
+
+    async def open_interest(self, request):
+        symbol = self._symbol(request)
+        self.long_oi[symbol] *= 1 + self.rng.gauss(0, 0.002)
+        self.short_oi[symbol] *= 1 + self.rng.gauss(0, 0.002)
+        return web.json_response({
+            'symbol': symbol,
+            'long_oi': self.long_oi[symbol],
+            'short_oi': self.short_oi[symbol],
+            'ts': int(time.time() * 1000)
+        })
+
+    async def funding_rate(self, request):
+        symbol = self._symbol(request)
+        self.funding[symbol] += self.rng.gauss(0, 0.00002)
+        # Perp discount to the index, mean-reverting around -2bp like the negative funding
+        self.basis[symbol] = -0.0002 + 0.9 * (self.basis[symbol] + 0.0002) + self.rng.gauss(0, 0.00002)
+        now = int(time.time() * 1000)
+        return web.json_response({
+            'symbol': symbol,
+            'funding_rate': self.funding[symbol],
+            'mark_price': self.prices[symbol],
+            'index_price': self.prices[symbol] / (1 + self.basis[symbol]),
+            'next_funding_ts': now - now % 3_600_000 + 3_600_000,
+            'ts': now
+        })
+
+    async def receive_alerts(self, request):
+        try:
+            payload = await request.json()
+        except ValueError:
+            raise web.HTTPBadRequest(text=json.dumps({'error': "Expected a JSON body"}), content_type='application/json')
+        alerts = payload if isinstance(payload, list) else [payload]
+        self.alerts.extend(alerts)
+        return web.json_response({'received': len(alerts)})
+
+    async def list_alerts(self, request):
+        limit = int(request.query.get('limit', 100))
+        return web.json_response(list(self.alerts)[-limit:])
+
+    async def stream(self, request):
+        ws = web.WebSocketResponse(heartbeat=15)
+        await ws.prepare(request)
+        symbols = list(self.symbols)
+
+        async def read_subscriptions():
+            nonlocal symbols
+            async for msg in ws:
+                if msg.type == WSMsgType.TEXT:
+                    payload = json.loads(msg.data)
+                    if payload.get('op') == 'subscribe':
+                        symbols = [s for s in payload.get('symbols', []) if s in self.prices] or symbols
+
+        reader = asyncio.ensure_future(read_subscriptions())
+        interval = 0.01
+        per_batch = max(1, int(self.tick_rate * interval))
+        sent = 0
+        try:
+            while not ws.closed:
+                batch = [self._tick(symbols[i % len(symbols)]) for i in range(per_batch)]
+                await ws.send_str(json.dumps(batch))
+                sent += len(batch)
+                if self.drop_after is not None and sent >= self.drop_after:
+                    break
+                await asyncio.sleep(interval)
+        except ConnectionResetError:
+            pass
+        finally:
+            reader.cancel()
+            await ws.close()
+        return ws
+
+    def app(self):
+        app = web.Application()
+        app.add_routes([
+            web.get('/api/v1/ticker', self.ticker),
+            web.get('/api/v1/open_interest', self.open_interest),
+            web.get('/api/v1/funding', self.funding_rate),
+            web.get('/ws', self.stream),
+            web.post('/api/v1/alerts', self.receive_alerts),
+            web.get('/api/v1/alerts', self.list_alerts)
+        ])
+        return app
+
+async def start_mock_exchange(host='127.0.0.1', port=8765, **kwargs):
+    """Start a MockExchange on the running loop; returns the aiohttp runner (call cleanup() to stop)"""
+    runner = web.AppRunner(MockExchange(**kwargs).app())
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in exchange for the market-data layer")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--symbols', default='BTC/USDT', help="Comma-separated symbols")
+    parser.add_argument('--tick-rate', type=int, default=1000, help="Trade ticks per second per connection")
+    parser.add_argument('--drop-after', type=int, default=None, help="Close each WebSocket after N ticks")
+    args = parser.parse_args()
+
+    exchange = MockExchange(args.symbols.split(','), args.tick_rate, args.drop_after)
+    web.run_app(exchange.app(), host=args.host, port=args.port)
+
+if __name__ == '__main__':
+    main()
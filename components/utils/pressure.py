@@ -0,0 +1,191 @@
+import math
+from bisect import bisect_left, bisect_right, insort
+from collections import deque, namedtuple
+
+import numpy as np
+
+from utils.calculations import calculate_pressure_gauge
+from utils.confluence import pressure_gauge_series
+
+# Adaptive regimes come from the gauge's z-score against its own rolling history
+REGIME_LABELS = ('NORMAL', 'ELEVATED_LONGS', 'ELEVATED_SHORTS', 'EXTREME_LONGS', 'EXTREME_SHORTS')
+ELEVATED_Z = 1.5
+EXTREME_Z = 2.5
+
+# Rows per block of the batch percentile's (rows, window) comparison
+PERCENTILE_BLOCK = 16_384
+
+PressureReading = namedtuple('PressureReading', ['gauge', 'mean', 'std', 'zscore', 'percentile', 'regime'])
+
+def regime_codes(zscore, elevated_z=ELEVATED_Z, extreme_z=EXTREME_Z):
+    """int8 codes into REGIME_LABELS; NaN z-scores (warm-up) are NORMAL"""
+    zscore = np.asarray(zscore, dtype=float)
+    return np.select(
+        [zscore >= extreme_z, zscore <= -extreme_z, zscore >= elevated_z, zscore <= -elevated_z],
+        np.array([3, 4, 1, 2], dtype=np.int8),
+        0
+    ).astype(np.int8)
+
+def rolling_pressure_stats(long_oi, short_oi, window=288, min_periods=30):
+    """Gauge series with rolling mean/std/z-score/percentile rank over trailing window readings
+
+    Mean and std come from cumulative sums; the percentile is the fraction of the
+    window (including the current reading) at or below the current gauge, compared over
+    sliding-window views in blocks of PERCENTILE_BLOCK readings.
+    """
+    gauge = pressure_gauge_series(long_oi, short_oi)
+    n = len(gauge)
+    counts = np.minimum(np.arange(1, n + 1), window)
+    sums = np.cumsum(np.r_[0.0, gauge])
+    sqsums = np.cumsum(np.r_[0.0, gauge * gauge])
+    starts = np.arange(n) + 1 - counts
+    ends = np.arange(1, n + 1)
+    mean = (sums[ends] - sums[starts]) / counts
+    var = np.maximum((sqsums[ends] - sqsums[starts]) / counts - mean * mean, 0.0)
+    std = np.sqrt(var)
+
+    # NaN padding fills the partial windows at the start and never compares <= the gauge
+    windows = np.lib.stride_tricks.sliding_window_view(np.r_[np.full(window - 1, np.nan), gauge], window)
+    percentile = np.empty(n)
+    for start in range(0, n, PERCENTILE_BLOCK):
+        block = slice(start, start + PERCENTILE_BLOCK)
+        percentile[block] = np.count_nonzero(windows[block] <= gauge[block, None], axis=1) / counts[block]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        zscore = np.where(std > 0, (gauge - mean) / std, 0.0)
+    warm = counts >= min_periods
+    zscore[~warm] = np.nan
+    percentile[~warm] = np.nan
+    return {
+        'gauge': gauge,
+        'mean': mean,
+        'std': std,
+        'zscore': zscore,
+        'percentile': percentile,
+        'regime': regime_codes(zscore)
+    }
+
+class RollingPressureStats:
+    """O(1) mean/std and O(log window) percentile rank of the gauge for one instrument
+
+    Keeps running sums plus a sorted copy of the window for bisect-based ranks. The sums
+    are recomputed from the window every window updates to bound floating-point drift.
+    """
+
+    def __init__(self, window=288, min_periods=30):
+        self.window = window
+        self.min_periods = min_periods
+        self.values = deque()
+        self.sorted_values = []
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.updates = 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def update(self, long_oi, short_oi):
+        """Add one OI snapshot and return a PressureReading"""
+        gauge = calculate_pressure_gauge(long_oi, short_oi)
+        if len(self.values) == self.window:
+            old = self.values.popleft()
+            del self.sorted_values[bisect_left(self.sorted_values, old)]
+            self.total -= old
+            self.total_sq -= old * old
+        self.values.append(gauge)
+        insort(self.sorted_values, gauge)
+        self.total += gauge
+        self.total_sq += gauge * gauge
+        self.updates += 1
+        if self.updates % self.window == 0:
+            self.total = sum(self.values)
+            self.total_sq = sum(value * value for value in self.values)
+        return self.reading(gauge)
+
+    def reading(self, gauge):
+        count = len(self.values)
+        mean = self.total / count
+        std = max(self.total_sq / count - mean * mean, 0.0) ** 0.5
+        if count < self.min_periods:
+            # NaN while warming up, like rolling_pressure_stats and PressureRegimeMonitor
+            return PressureReading(gauge, mean, std, math.nan, math.nan, REGIME_LABELS[0])
+        zscore = (gauge - mean) / std if std > 0 else 0.0
+        percentile = bisect_right(self.sorted_values, gauge) / count
+        return PressureReading(gauge, mean, std, zscore, percentile, REGIME_LABELS[int(regime_codes(zscore))])
+
+class PressureRegimeMonitor:
+    """Rolling gauge statistics for many instruments, updated together in one vectorized step
+
+    Ring buffers of shape (instruments, window) with running sums give O(1) work per
+    instrument for mean/std; percentile ranks are one vectorized comparison per tick over
+    the windows of the instruments that updated, so a sparse tick only pays for its rows.
+    """
+
+    def __init__(self, instruments, window=288, min_periods=30):
+        self.instruments = list(instruments)
+        self.index = {name: i for i, name in enumerate(self.instruments)}
+        self.window = window
+        self.min_periods = min_periods
+        count = len(self.instruments)
+        self.buffer = np.full((count, window), np.nan)
+        self.counts = np.zeros(count, dtype=np.int64)
+        self.total = np.zeros(count)
+        self.total_sq = np.zeros(count)
+        self.positions = np.zeros(count, dtype=np.int64)
+        self.percentile = np.full(count, np.nan)
+        self.ticks = 0
+
+    def update(self, long_oi, short_oi):
+        """Add one OI snapshot per instrument (arrays in self.instruments order)
+
+        Returns a dict of per-instrument arrays: gauge, mean, std, zscore, percentile, regime.
+        NaN OI marks an instrument with no new snapshot this tick; its window is left unchanged.
+        """
+        gauge = pressure_gauge_series(long_oi, short_oi)
+        fresh = ~(np.isnan(np.asarray(long_oi, dtype=float)) | np.isnan(np.asarray(short_oi, dtype=float)))
+        rows = np.flatnonzero(fresh)
+        slots = self.positions[rows]
+        old = self.buffer[rows, slots]
+        full = self.counts[rows] == self.window
+
+        self.total[rows[full]] -= old[full]
+        self.total_sq[rows[full]] -= old[full] ** 2
+        self.buffer[rows, slots] = gauge[rows]
+        self.total[rows] += gauge[rows]
+        self.total_sq[rows] += gauge[rows] ** 2
+        self.counts[rows[~full]] += 1
+        self.positions[rows] = (slots + 1) % self.window
+        # NaN slots of a filling window never compare <= the gauge; a full tick skips the row gather
+        if len(rows) == len(self.instruments):
+            self.percentile = np.count_nonzero(self.buffer <= gauge[:, None], axis=1) / self.counts
+        else:
+            self.percentile[rows] = np.count_nonzero(self.buffer[rows] <= gauge[rows, None], axis=1) / self.counts[rows]
+        self.ticks += 1
+        if self.ticks % self.window == 0:
+            # Re-anchor the running sums to bound floating-point drift
+            self.total = np.nansum(self.buffer, axis=1)
+            self.total_sq = np.nansum(self.buffer ** 2, axis=1)
+
+        counts = np.maximum(self.counts, 1)
+        mean = self.total / counts
+        std = np.sqrt(np.maximum(self.total_sq / counts - mean * mean, 0.0))
+        current = self.buffer[np.arange(len(self.instruments)), (self.positions - 1) % self.window]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            zscore = np.where(std > 0, (current - mean) / std, 0.0)
+        percentile = self.percentile.copy()
+        warm = self.counts >= self.min_periods
+        zscore[~warm] = np.nan
+        percentile[~warm] = np.nan
+        return {
+            'gauge': current,
+            'mean': mean,
+            'std': std,
+            'zscore': zscore,
+            'percentile': percentile,
+            'regime': regime_codes(zscore)
+        }
+
+    def extremes(self, result):
+        """Instruments currently in an EXTREME regime, as (name, regime label, z-score)"""
+        flagged = np.flatnonzero(result['regime'] >= REGIME_LABELS.index('EXTREME_LONGS'))
+        return [(self.instruments[i], REGIME_LABELS[result['regime'][i]], float(result['zscore'][i])) for i in flagged]
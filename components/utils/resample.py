@@ -0,0 +1,190 @@
+import numpy as np
+
+from utils.calculations import calculate_timeframe_multiplier
+
+TIMEFRAMES = ['1m', '5m', '15m', '30m', '1h', '4h', '1d', '1w']
+MINUTE_MS = 60_000
+# Weekly bars open on Monday 00:00 UTC; the epoch (1970-01-01) was a Thursday
+BUCKET_OFFSET_MS = {'1w': 4 * 1440 * MINUTE_MS}
+COLUMNS = ('ts', 'open', 'high', 'low', 'close', 'volume')
+
+def timeframe_ms(timeframe):
+    """Length of one bar in milliseconds"""
+    return calculate_timeframe_multiplier(timeframe) * MINUTE_MS
+
+def bucket_start(ts, timeframe):
+    """Open time (ms) of the timeframe bar containing ts; works on scalars and arrays"""
+    size = timeframe_ms(timeframe)
+    offset = BUCKET_OFFSET_MS.get(timeframe, 0)
+    return (ts - offset) // size * size + offset
+
+def resample_ohlcv(ts, open_prices, high_prices, low_prices, close_prices, volumes, timeframe):
+    """Aggregate time-ordered 1m OHLCV columns into timeframe bars in one vectorized pass"""
+    ts = np.asarray(ts, dtype=np.int64)
+    if len(ts) == 0:
+        return {name: np.array([], dtype=np.int64 if name == 'ts' else float) for name in COLUMNS}
+
+    buckets = bucket_start(ts, timeframe)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(ts)] - 1
+    return {
+        'ts': buckets[starts],
+        'open': np.asarray(open_prices, dtype=float)[starts],
+        'high': np.maximum.reduceat(np.asarray(high_prices, dtype=float), starts),
+        'low': np.minimum.reduceat(np.asarray(low_prices, dtype=float), starts),
+        'close': np.asarray(close_prices, dtype=float)[ends],
+        'volume': np.add.reduceat(np.asarray(volumes, dtype=float), starts)
+    }
+
+def _empty_columns(capacity):
+    return {name: np.empty(capacity, dtype=np.int64 if name == 'ts' else float) for name in COLUMNS}
+
+def _grown(columns, size):
+    """Copies of the first size rows in buffers of twice the capacity"""
+    grown = _empty_columns(max(2 * len(columns['ts']), 16))
+    for name, column in columns.items():
+        grown[name][:size] = column[:size]
+    return grown
+
+class _TimeframeState:
+    """Running aggregate of the open bar plus the completed bars for one timeframe
+
+    Completed bars live in preallocated column buffers (count rows used), so readers
+    get views instead of per-call arrays; the row after the last completed bar is
+    scratch space for the open bar in bars().
+    """
+    __slots__ = ('timeframe', 'size', 'offset', 'bucket', 'open', 'high', 'low', 'close', 'volume', 'columns', 'count')
+
+    def __init__(self, timeframe, capacity=64):
+        self.timeframe = timeframe
+        self.size = timeframe_ms(timeframe)
+        self.offset = BUCKET_OFFSET_MS.get(timeframe, 0)
+        self.bucket = None
+        self.open = self.high = self.low = self.close = self.volume = 0.0
+        self.columns = _empty_columns(capacity)
+        self.count = 0
+
+    def completed(self):
+        """Zero-copy views of the completed bars"""
+        return {name: column[:self.count] for name, column in self.columns.items()}
+
+    def partial(self):
+        """(ts, open, high, low, close, volume) of the open bar"""
+        return self.bucket, self.open, self.high, self.low, self.close, self.volume
+
+    def update(self, ts, open_price, high, low, close, volume):
+        """Fold one 1m candle in; returns True when it closed the previous bar"""
+        bucket = (ts - self.offset) // self.size * self.size + self.offset
+        if bucket == self.bucket:
+            if high > self.high:
+                self.high = high
+            if low < self.low:
+                self.low = low
+            self.close = close
+            self.volume += volume
+            return False
+
+        rolled = self.bucket is not None
+        if rolled:
+            # Keep one spare row for the open bar written by bars()
+            if self.count + 1 >= len(self.columns['ts']):
+                self.columns = _grown(self.columns, self.count)
+            i = self.count
+            columns = self.columns
+            columns['ts'][i] = self.bucket
+            columns['open'][i] = self.open
+            columns['high'][i] = self.high
+            columns['low'][i] = self.low
+            columns['close'][i] = self.close
+            columns['volume'][i] = self.volume
+            self.count += 1
+        self.bucket = bucket
+        self.open, self.high, self.low, self.close, self.volume = open_price, high, low, close, volume
+        return rolled
+
+class MultiTimeframeResampler:
+    """Incremental 1m -> 5m..1w resampler over one shared 1m base buffer
+
+    The 1m timeframe is served straight from the base buffer; every higher timeframe
+    keeps only its open-bar aggregate and a growable buffer of its completed bars.
+    """
+
+    def __init__(self, timeframes=None, capacity=1024):
+        self.timeframes = [tf for tf in (timeframes or TIMEFRAMES) if tf != '1m']
+        self.states = {tf: _TimeframeState(tf) for tf in self.timeframes}
+        self.size = 0
+        self._base = {name: np.empty(capacity, dtype=np.int64 if name == 'ts' else float) for name in COLUMNS}
+
+    def __len__(self):
+        return self.size
+
+    def _grow(self):
+        for name, column in self._base.items():
+            grown = np.empty(len(column) * 2, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            self._base[name] = grown
+
+    def update(self, ts, open_price, high, low, close, volume):
+        """Append one closed 1m candle; returns the timeframes whose previous bar just closed"""
+        if self.size and ts <= self._base['ts'][self.size - 1]:
+            raise ValueError(f"1m candles must arrive in time order (got {ts} after {self._base['ts'][self.size - 1]})")
+        if self.size == len(self._base['ts']):
+            self._grow()
+
+        i = self.size
+        base = self._base
+        base['ts'][i] = ts
+        base['open'][i] = open_price
+        base['high'][i] = high
+        base['low'][i] = low
+        base['close'][i] = close
+        base['volume'][i] = volume
+        self.size += 1
+
+        return [tf for tf, state in self.states.items() if state.update(ts, open_price, high, low, close, volume)]
+
+    def extend(self, ts, open_prices, high_prices, low_prices, close_prices, volumes):
+        """Bulk-load 1m history; higher timeframes are rebuilt with resample_ohlcv"""
+        ts = np.asarray(ts, dtype=np.int64)
+        columns = dict(zip(COLUMNS, (ts, open_prices, high_prices, low_prices, close_prices, volumes)))
+        if len(ts) == 0:
+            return
+        if self.size and ts[0] <= self._base['ts'][self.size - 1]:
+            raise ValueError("Bulk history must start after the last buffered candle")
+        while self.size + len(ts) > len(self._base['ts']):
+            self._grow()
+        for name, values in columns.items():
+            self._base[name][self.size:self.size + len(ts)] = values
+        self.size += len(ts)
+
+        base = self.base()
+        for tf, state in self.states.items():
+            bars = resample_ohlcv(*(base[name] for name in COLUMNS), tf)
+            state.count = len(bars['ts']) - 1
+            state.columns = _empty_columns(max(2 * len(bars['ts']), 16))
+            for name in COLUMNS:
+                state.columns[name][:state.count] = bars[name][:-1]
+            state.bucket = int(bars['ts'][-1])
+            state.open, state.high, state.low, state.close, state.volume = (
+                float(bars[name][-1]) for name in ('open', 'high', 'low', 'close', 'volume')
+            )
+
+    def base(self):
+        """Zero-copy views of the 1m base buffer"""
+        return {name: column[:self.size] for name, column in self._base.items()}
+
+    def bars(self, timeframe, include_partial=True):
+        """OHLCV column views for a timeframe, optionally including the still-open bar
+
+        The views share the resampler's buffers: completed rows never change, but the
+        open-bar row is overwritten by the next update, so copy it to keep it.
+        """
+        if timeframe == '1m':
+            return self.base()
+
+        state = self.states[timeframe]
+        if not include_partial or state.bucket is None:
+            return state.completed()
+        for name, value in zip(COLUMNS, state.partial()):
+            state.columns[name][state.count] = value
+        return {name: column[:state.count + 1] for name, column in state.columns.items()}
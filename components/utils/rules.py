@@ -0,0 +1,764 @@
+import ast
+import functools
+import json
+import os
+import queue
+import threading
+import urllib.request
+from collections import namedtuple, deque
+
+import numpy as np
+
+from utils.confluence import (
+    PRESSURE_EXTREME,
+    RSI_OVERBOUGHT,
+    RSI_OVERSOLD,
+    PRESSURE_LABELS,
+    CONFLUENCE_LABELS,
+    DMI_LABELS,
+    RSI_LABELS,
+    TECHNICAL_LABELS,
+    VOLUME_LABELS,
+    pressure_gauge_series,
+    pressure_codes,
+    dmi_codes,
+    rsi_codes,
+    technical_codes,
+    evaluate_confluence_series
+)
+from utils.instrumentation import instrument
+from utils.validators import parse_endpoints
+
+# Volume labels as returned by calculate_volume_analysis; NEUTRAL while history is short
+VOLUME_STATUS_LABELS = ('NEUTRAL', 'AVERAGE', 'HIGH', 'LOW')
+VOLUME_DELTA_LABELS = ('NEUTRAL', 'STABLE', 'INCREASING', 'DECREASING')
+FIB_RATIOS = np.array([0.0, 0.236, 0.382, 0.5, 0.618, 0.786, 1.0])
+PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+# Categorical fields are int8 codes; rules compare them against these labels
+CATEGORIES = {
+    'pressure': PRESSURE_LABELS,
+    'confluence': CONFLUENCE_LABELS,
+    'dmi': DMI_LABELS,
+    'rsi_zone': RSI_LABELS,
+    'technical': TECHNICAL_LABELS,
+    'volume': VOLUME_LABELS,
+    'volume_status': VOLUME_STATUS_LABELS,
+    'delta_status': VOLUME_DELTA_LABELS
+}
+
+# field: (fields it is derived from, streaming states it needs)
+FIELDS = {
+    'open': ((), ()),
+    'high': ((), ()),
+    'low': ((), ()),
+    'close': ((), ()),
+    'volume': ((), ()),
+    'prev_close': ((), ('window',)),
+    'rsi': ((), ('rsi',)),
+    'pdi': ((), ('dmi',)),
+    'mdi': ((), ('dmi',)),
+    'adx': ((), ('dmi',)),
+    'ma50': ((), ('window',)),
+    'vwap': ((), ('window',)),
+    'volume_ratio': (('volume_stats',), ()),
+    'volume_status': (('volume_stats',), ()),
+    'delta_status': (('volume_stats',), ()),
+    'volume_stats': ((), ('window',)),
+    'swing_high': ((), ('window',)),
+    'swing_low': ((), ('window',)),
+    'fib_distance': (('close', 'swing_high', 'swing_low'), ()),
+    'trend_bullish': (('close', 'ma50'), ()),
+    'pressure_gauge': ((), ('market',)),
+    'funding_rate': ((), ('market',)),
+    'pressure': (('pressure_gauge',), ()),
+    'dmi': (('pdi', 'mdi'), ()),
+    'rsi_zone': (('rsi',), ()),
+    'technical': (('dmi', 'rsi_zone'), ()),
+    'volume': (('volume_status', 'delta_status'), ()),
+    'confluence': (('close', 'ma50', 'funding_rate'), ('market',))
+}
+# Internal intermediates that rules cannot name directly
+HIDDEN_FIELDS = ('volume_stats',)
+
+Rule = namedtuple('Rule', ['name', 'condition'])
+Trigger = namedtuple('Trigger', ['rule', 'symbol', 'ts', 'close'])
+
+# The interpretations hard-coded in the tabs, as declarative rules
+DEFAULT_RULES = (
+    Rule('RSI overbought', f"rsi > {RSI_OVERBOUGHT}"),
+    Rule('RSI oversold', f"rsi < {RSI_OVERSOLD}"),
+    Rule('Extreme pressure', f"abs(pressure_gauge) > {PRESSURE_EXTREME}"),
+    Rule('Near Fibonacci level', "fib_distance < 0.005"),
+    Rule('Breakout watch', 'volume_status == "HIGH" and delta_status == "INCREASING"'),
+    Rule('Confluence achieved', 'confluence == "ACHIEVED"')
+)
+
+def required_states(fields):
+    """Streaming states needed to serve fields, following derived-field dependencies"""
+    states = set()
+    pending = list(fields)
+    seen = set()
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        parents, needs = FIELDS[name]
+        states.update(needs)
+        pending.extend(parents)
+    return states
+
+class _WilderArrays:
+    """Vectorized WilderAverage: one seed-then-RMA average per symbol"""
+
+    def __init__(self, period, size):
+        self.period = period
+        self.count = np.zeros(size, dtype=np.int64)
+        self.seed = np.zeros(size)
+        self.value = np.full(size, np.nan)
+
+    def update(self, x, rows):
+        """Add x[rows] to the averages of rows; returns the full value array (NaN while warming up)"""
+        ready = rows[self.count[rows] >= self.period]
+        warming = rows[self.count[rows] < self.period]
+        self.value[ready] = self.value[ready] * (1.0 - 1.0 / self.period) + x[ready] / self.period
+        self.seed[warming] += x[warming]
+        self.count[rows] += 1
+        seeded = warming[self.count[warming] == self.period]
+        self.value[seeded] = self.seed[seeded] / self.period
+        return self.value
+
+class IndicatorBank:
+    """Streaming indicators for many symbols, advanced one bar at a time
+
+    Each update is a handful of vectorized passes across the whole universe, and only
+    the states that the requested fields need are maintained. Field values are computed
+    on first read after a bar and shared by every rule that references them. NaN marks
+    symbols without a new bar this tick and values still warming up.
+    """
+
+    def __init__(self, symbols, fields=(), period=14, ma_period=50, vwap_window=20, volume_window=20, swing_window=50):
+        self.symbols = list(symbols)
+        self.period = period
+        self.ma_period = ma_period
+        self.vwap_window = vwap_window
+        self.volume_window = volume_window
+        self.swing_window = swing_window
+        size = len(self.symbols)
+        # The window ring holds the current bar plus the volume history before it
+        self.depth = max(ma_period, vwap_window, volume_window + 1, swing_window, 2)
+        self.history = np.full((len(PRICE_COLUMNS), size, self.depth), np.nan)
+        self.positions = np.zeros(size, dtype=np.int64)
+        self.counts = np.zeros(size, dtype=np.int64)
+        self.long_oi = np.zeros(size)
+        self.short_oi = np.zeros(size)
+        self.funding = np.zeros(size)
+        self.ts = None
+        self.bar = {name: np.full(size, np.nan) for name in PRICE_COLUMNS}
+        self.states = set()
+        self._prev_close = np.full(size, np.nan)
+        self._values = {}
+        self.require(fields)
+
+    def require(self, fields):
+        """Start maintaining the states behind fields (new states warm up from the next bar)"""
+        unknown = [name for name in fields if name not in FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown indicator fields {unknown}")
+        size = len(self.symbols)
+        for state in required_states(fields) - self.states:
+            if state == 'rsi':
+                self._gain = _WilderArrays(self.period, size)
+                self._loss = _WilderArrays(self.period, size)
+            elif state == 'dmi':
+                self._tr = _WilderArrays(self.period, size)
+                self._pdm = _WilderArrays(self.period, size)
+                self._mdm = _WilderArrays(self.period, size)
+                self._dx = _WilderArrays(self.period, size)
+                self._prev_high = np.full(size, np.nan)
+                self._prev_low = np.full(size, np.nan)
+                self._dmi = (np.full(size, np.nan), np.full(size, np.nan))
+            self.states.add(state)
+
+    def set_market(self, long_oi=None, short_oi=None, funding_rate=None):
+        """Open interest and funding per symbol, arrays aligned with symbols"""
+        if long_oi is not None:
+            self.long_oi[...] = long_oi
+        if short_oi is not None:
+            self.short_oi[...] = short_oi
+        if funding_rate is not None:
+            self.funding[...] = funding_rate
+        for name in ('pressure_gauge', 'pressure', 'funding_rate', 'confluence'):
+            self._values.pop(name, None)
+
+    def update(self, ts, open_prices, high_prices, low_prices, close_prices, volumes):
+        """Advance every symbol with a bar this tick; NaN closes mark symbols without one"""
+        self.ts = ts
+        self._values = {}
+        for name, values in zip(PRICE_COLUMNS, (open_prices, high_prices, low_prices, close_prices, volumes)):
+            self.bar[name] = np.asarray(values, dtype=float)
+        close = self.bar['close']
+        rows = np.flatnonzero(~np.isnan(close))
+        has_prev = rows[~np.isnan(self._prev_close[rows])]
+
+        if 'window' in self.states:
+            slots = self.positions[rows]
+            for j, name in enumerate(PRICE_COLUMNS):
+                self.history[j, rows, slots] = self.bar[name][rows]
+            self.positions[rows] = (slots + 1) % self.depth
+            self.counts[rows] = np.minimum(self.counts[rows] + 1, self.depth)
+
+        if 'rsi' in self.states:
+            change = np.zeros(len(close))
+            change[has_prev] = close[has_prev] - self._prev_close[has_prev]
+            self._gain.update(np.maximum(change, 0.0), has_prev)
+            self._loss.update(np.maximum(-change, 0.0), has_prev)
+
+        if 'dmi' in self.states:
+            self._update_dmi(rows)
+
+        self._prev_close[rows] = close[rows]
+
+    def _update_dmi(self, rows):
+        high = self.bar['high']
+        low = self.bar['low']
+        rows_prev = rows[~np.isnan(self._prev_high[rows])]
+        prev_close = self._prev_close
+        tr = np.zeros(len(high))
+        pdm = np.zeros(len(high))
+        mdm = np.zeros(len(high))
+        h, l = high[rows_prev], low[rows_prev]
+        tr[rows_prev] = np.maximum(h - l, np.maximum(np.abs(h - prev_close[rows_prev]), np.abs(l - prev_close[rows_prev])))
+        hd = h - self._prev_high[rows_prev]
+        ld = self._prev_low[rows_prev] - l
+        pdm[rows_prev] = np.where((hd > 0) & (hd > ld), hd, 0.0)
+        mdm[rows_prev] = np.where((ld > 0) & (ld > hd), ld, 0.0)
+        smooth_tr = self._tr.update(tr, rows_prev)
+        smooth_pdm = self._pdm.update(pdm, rows_prev)
+        smooth_mdm = self._mdm.update(mdm, rows_prev)
+
+        pdi, mdi = self._dmi
+        ready = rows_prev[~np.isnan(smooth_tr[rows_prev])]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            positive = smooth_tr[ready] > 0
+            pdi[ready] = np.where(positive, 100 * smooth_pdm[ready] / smooth_tr[ready], 0.0)
+            mdi[ready] = np.where(positive, 100 * smooth_mdm[ready] / smooth_tr[ready], 0.0)
+            di_sum = pdi[ready] + mdi[ready]
+            dx = np.zeros(len(high))
+            dx[ready] = np.where(di_sum > 0, 100 * np.abs(pdi[ready] - mdi[ready]) / di_sum, 0.0)
+        self._dx.update(dx, ready)
+        self._prev_high[rows] = high[rows]
+        self._prev_low[rows] = low[rows]
+
+    def recent(self, name, count):
+        """(symbols, count) window of a price column, oldest first, NaN beyond each symbol's history"""
+        ages = np.arange(count - 1, -1, -1)
+        slots = (self.positions[:, None] - 1 - ages) % self.depth
+        values = np.take_along_axis(self.history[PRICE_COLUMNS.index(name)], slots, axis=1)
+        return np.where(ages < self.counts[:, None], values, np.nan)
+
+    def field(self, name):
+        """Current value of a field for every symbol, computed once per bar"""
+        value = self._values.get(name)
+        if value is None:
+            value = self._values[name] = getattr(self, '_field_' + name)() if name not in PRICE_COLUMNS else self.bar[name]
+        return value
+
+    def _field_prev_close(self):
+        return self.recent('close', 2)[:, 0]
+
+    def _field_rsi(self):
+        avg_gain = self._gain.value
+        avg_loss = self._loss.value
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+        # Same edge cases as rsi_from_averages
+        rsi = np.where(avg_loss == 0, 100.0, np.where(avg_gain == 0, 0.0, rsi))
+        return np.where(np.isnan(avg_gain), np.nan, rsi)
+
+    def _field_pdi(self):
+        return self._dmi[0].copy()
+
+    def _field_mdi(self):
+        return self._dmi[1].copy()
+
+    def _field_adx(self):
+        return self._dx.value.copy()
+
+    def _field_ma50(self):
+        window = self.recent('close', self.ma_period)
+        return np.where(self.counts >= self.ma_period, window.mean(axis=1), np.nan)
+
+    def _field_vwap(self):
+        prices = self.recent('close', self.vwap_window)
+        volumes = self.recent('volume', self.vwap_window)
+        total_volume = np.nansum(volumes, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # calculate_vwap falls back to the mean price when the window traded nothing
+            return np.where(total_volume > 0, np.nansum(prices * volumes, axis=1) / total_volume, np.nanmean(prices, axis=1))
+
+    def _field_volume_stats(self):
+        """calculate_volume_analysis of the current volume against the volume_window before it"""
+        window = self.volume_window
+        history = self.recent('volume', window + 1)[:, :-1]
+        current = self.bar['volume']
+        size = np.minimum(np.maximum(self.counts - 1, 0), window)
+        filled = np.nan_to_num(history)
+        sums = np.concatenate([np.zeros((len(size), 1)), np.cumsum(filled, axis=1)], axis=1)
+        rows = np.arange(len(size))
+        span = np.minimum(5, np.maximum(size, 1))
+        start = window - np.maximum(size, span)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            average = sums[:, window] / size
+            recent = (sums[:, window] - sums[rows, window - span]) / span
+            older = (sums[rows, start + span] - sums[rows, start]) / span
+            ratio = np.where(average > 0, current / average, 1.0)
+        warm = size >= 2
+        status = np.select([ratio > 1.5, ratio < 0.7], [2, 3], 1).astype(np.int8)
+        delta = np.select([recent > older * 1.2, recent < older * 0.8], [2, 3], 1).astype(np.int8)
+        return np.where(warm, ratio, np.nan), np.where(warm, status, 0).astype(np.int8), np.where(warm, delta, 0).astype(np.int8)
+
+    def _field_volume_ratio(self):
+        return self.field('volume_stats')[0]
+
+    def _field_volume_status(self):
+        return self.field('volume_stats')[1]
+
+    def _field_delta_status(self):
+        return self.field('volume_stats')[2]
+
+    def _field_swing_high(self):
+        window = self.recent('high', self.swing_window)
+        return np.where(self.counts > 0, np.nanmax(np.where(np.isnan(window), -np.inf, window), axis=1), np.nan)
+
+    def _field_swing_low(self):
+        window = self.recent('low', self.swing_window)
+        return np.where(self.counts > 0, np.nanmin(np.where(np.isnan(window), np.inf, window), axis=1), np.nan)
+
+    def _field_fib_distance(self):
+        """Distance to the nearest retracement level of the swing range as a fraction of close, as the scanner ranks it"""
+        high = self.field('swing_high')
+        low = self.field('swing_low')
+        close = self.field('close')
+        levels = high[:, None] - (high - low)[:, None] * FIB_RATIOS
+        gap = np.abs(levels - close[:, None]).min(axis=1)
+        return np.divide(gap, close, out=np.full_like(gap, np.nan), where=close != 0)
+
+    def _field_trend_bullish(self):
+        return self.field('close') > self.field('ma50')
+
+    def _field_pressure_gauge(self):
+        return pressure_gauge_series(self.long_oi, self.short_oi)
+
+    def _field_funding_rate(self):
+        return self.funding.copy()
+
+    def _field_pressure(self):
+        return pressure_codes(self.field('pressure_gauge'))
+
+    def _field_dmi(self):
+        return dmi_codes(self.field('pdi'), self.field('mdi'))
+
+    def _field_rsi_zone(self):
+        return rsi_codes(self.field('rsi'))
+
+    def _field_technical(self):
+        return technical_codes(self.field('dmi'), self.field('rsi_zone'))
+
+    def _field_volume(self):
+        status = self.field('volume_status')
+        delta = self.field('delta_status')
+        return np.select([
+            (status == VOLUME_STATUS_LABELS.index('HIGH')) & (delta == VOLUME_DELTA_LABELS.index('INCREASING')),
+            (status == VOLUME_STATUS_LABELS.index('LOW')) & (delta == VOLUME_DELTA_LABELS.index('DECREASING'))
+        ], np.array([1, 2], dtype=np.int8), 0).astype(np.int8)
+
+    def _field_confluence(self):
+        # A NaN ma50 without MA history leaves the trend undecided, as in the scanner
+        return evaluate_confluence_series(
+            self.field('close'), self.field('ma50'), self.long_oi, self.short_oi, self.funding
+        )['confluence']
+
+# Operators a rule condition may use, mapped to their numpy ufuncs
+BINARY_OPS = {
+    ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply,
+    ast.Div: np.divide, ast.Mod: np.mod, ast.Pow: np.power
+}
+COMPARE_OPS = {
+    ast.Gt: np.greater, ast.GtE: np.greater_equal, ast.Lt: np.less,
+    ast.LtE: np.less_equal, ast.Eq: np.equal, ast.NotEq: np.not_equal
+}
+def _pairwise(ufunc):
+    # Reduce operand by operand so no argument can land in the ufunc's out= slot
+    return lambda *args: functools.reduce(ufunc, args)
+
+FUNCTIONS = {'abs': np.abs, 'min': _pairwise(np.minimum), 'max': _pairwise(np.maximum)}
+# (min, max) argument counts per function; None means unbounded
+ARITY = {'abs': (1, 1), 'min': (2, None), 'max': (2, None)}
+
+class _Template(ast.NodeTransformer):
+    """Validate a condition, resolve category labels to codes and lift numbers out as parameters
+
+    Rules that differ only in their numbers share a template and are evaluated together
+    as one (rules, symbols) array.
+    """
+
+    def __init__(self, rule):
+        self.rule = rule
+        self.params = []
+        self.fields = set()
+
+    def reject(self, node, reason):
+        raise ValueError(f"Rule {self.rule.name!r}: {reason} in {self.rule.condition!r}")
+
+    def generic_visit(self, node):
+        if not isinstance(node, (ast.Expression, ast.BoolOp, ast.BinOp, ast.UnaryOp, ast.Compare, ast.Call,
+                                 ast.Name, ast.Constant, ast.Load, ast.And, ast.Or, ast.Not, ast.USub, ast.UAdd,
+                                 *BINARY_OPS, *COMPARE_OPS)):
+            self.reject(node, f"unsupported syntax {type(node).__name__}")
+        return super().generic_visit(node)
+
+    def visit_Name(self, node):
+        if node.id not in FIELDS or node.id in HIDDEN_FIELDS:
+            self.reject(node, f"unknown field {node.id!r}")
+        self.fields.add(node.id)
+        return node
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS or node.keywords:
+            self.reject(node, "only abs(), min() and max() calls are allowed")
+        low, high = ARITY[node.func.id]
+        if len(node.args) < low or (high is not None and len(node.args) > high):
+            expected = f"exactly {low}" if low == high else f"at least {low}"
+            self.reject(node, f"{node.func.id}() takes {expected} argument{'s' if low > 1 else ''}, got {len(node.args)}")
+        node.args = [self.visit(arg) for arg in node.args]
+        return node
+
+    def visit_Compare(self, node):
+        # A category compared with a label string becomes a code comparison
+        operands = [node.left] + node.comparators
+        for i, operand in enumerate(operands):
+            if isinstance(operand, ast.Constant) and isinstance(operand.value, str):
+                names = [other.id for other in operands[max(0, i - 1):i + 2] if isinstance(other, ast.Name) and other.id in CATEGORIES]
+                if not names:
+                    self.reject(node, f"label {operand.value!r} must be compared with a category field")
+                labels = CATEGORIES[names[0]]
+                if operand.value not in labels:
+                    self.reject(node, f"{operand.value!r} is not one of {names[0]}'s labels {labels}")
+                operands[i] = ast.Constant(labels.index(operand.value))
+        node.left, node.comparators = operands[0], operands[1:]
+        return self.generic_visit(node)
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool):
+            return node
+        if not isinstance(node.value, (int, float)):
+            self.reject(node, f"unsupported constant {node.value!r}")
+        self.params.append(float(node.value))
+        return ast.Name(id=f'_param{len(self.params) - 1}', ctx=ast.Load())
+
+def _compile(node, program, cache, group):
+    """Append node's evaluation steps to program; returns the slot holding the node's value
+
+    Steps are (kind, function or source, argument slots). Parameter-free subexpressions
+    are keyed by their syntax tree, so every template containing e.g. close - ma50 reads
+    the same slot; parameter steps read their group's (parameters, rules, 1) array.
+    """
+    key = ast.dump(node)
+    if key in cache:
+        return cache[key]
+    if isinstance(node, ast.Name) and node.id.startswith('_param'):
+        step = ('param', group, int(node.id[len('_param'):]))
+    elif isinstance(node, ast.Name):
+        step = ('field', node.id, ())
+    elif isinstance(node, ast.Constant):
+        step = ('constant', np.bool_(node.value), ())
+    elif isinstance(node, ast.BoolOp):
+        function = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+        step = ('fold', function, [_compile(value, program, cache, group) for value in node.values])
+    elif isinstance(node, ast.UnaryOp):
+        function = {ast.Not: np.logical_not, ast.USub: np.negative, ast.UAdd: np.positive}[type(node.op)]
+        step = ('call', function, [_compile(node.operand, program, cache, group)])
+    elif isinstance(node, ast.BinOp):
+        args = [_compile(node.left, program, cache, group), _compile(node.right, program, cache, group)]
+        step = ('call', BINARY_OPS[type(node.op)], args)
+    elif isinstance(node, ast.Compare):
+        # a < b < c is (a < b) and (b < c)
+        operands = [_compile(operand, program, cache, group) for operand in [node.left] + node.comparators]
+        parts = []
+        for op, left, right in zip(node.ops, operands, operands[1:]):
+            program.append(('call', COMPARE_OPS[type(op)], [left, right]))
+            parts.append(len(program) - 1)
+        step = ('fold', np.logical_and, parts)
+    else:
+        step = ('call', FUNCTIONS[node.func.id], [_compile(arg, program, cache, group) for arg in node.args])
+    if step[0] == 'fold' and len(step[2]) == 1:
+        slot = step[2][0]
+    else:
+        program.append(step)
+        slot = len(program) - 1
+    cache[key] = slot
+    return slot
+
+class _RuleGroup:
+    """Rules sharing one template: params is (parameters, rules, 1) so each step broadcasts to (rules, symbols)"""
+
+    def __init__(self, template):
+        self.template = template
+        self.rules = []
+        self.names = []
+        self.param_rows = []
+        self.params = None
+        self.output = None
+        self.previous = None
+
+class RuleEngine:
+    """Declarative alert rules evaluated over every symbol on each new bar
+
+    Conditions are Python-style expressions over indicator fields (see FIELDS), e.g.
+    'rsi > 70', 'abs(pressure_gauge) > 0.5', 'fib_distance < 0.005' or
+    'volume_status == "HIGH" and delta_status == "INCREASING"'. Each is compiled once
+    into a vectorized program: rules differing only in their numbers are stacked into
+    one (rules, symbols) evaluation, shared subexpressions are evaluated once per bar,
+    and the IndicatorBank maintains only the indicators some rule reads.
+
+    By default a rule triggers when its condition turns true for a symbol (edge=True),
+    not on every bar it stays true. Triggers go to each callable in sinks as one list per bar.
+    """
+
+    def __init__(self, symbols, rules=(), sinks=(), edge=True, **indicator_params):
+        self.symbols = list(symbols)
+        self.edge = edge
+        self.sinks = list(sinks)
+        self.bank = IndicatorBank(self.symbols, **indicator_params)
+        self.rules = []
+        self._groups = {}
+        self._program = None
+        self.add_rules(rules)
+
+    def add_rules(self, rules):
+        """Compile and register rules (raises ValueError naming the first invalid one)"""
+        compiled = []
+        names = {rule.name for rule in self.rules}
+        for rule in rules:
+            rule = Rule(*rule)
+            if rule.name in names:
+                raise ValueError(f"Duplicate rule name {rule.name!r}")
+            names.add(rule.name)
+            try:
+                tree = ast.parse(rule.condition, mode='eval')
+            except SyntaxError as e:
+                raise ValueError(f"Rule {rule.name!r}: {e.msg} in {rule.condition!r}") from None
+            template = _Template(rule)
+            body = template.visit(tree).body
+            compiled.append((rule, ast.dump(body), body, template))
+
+        for rule, key, body, template in compiled:
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = _RuleGroup(body)
+            group.rules.append(rule)
+            group.names.append(rule.name)
+            group.param_rows.append(template.params)
+            self.bank.require(template.fields)
+            self.rules.append(rule)
+        self._program = None
+
+    def _build(self):
+        """Lay every group's template into one shared program, in dependency order"""
+        program = []
+        shared = {}
+        for group in self._groups.values():
+            # Parameterized steps belong to their group; only parameter-free ones are shared
+            cache = dict(shared)
+            group.output = _compile(group.template, program, cache, group)
+            shared.update((key, slot) for key, slot in cache.items() if '_param' not in key)
+            group.params = np.array(group.param_rows, dtype=float).T[:, :, None]
+            if group.previous is None or group.previous.shape[0] != len(group.rules):
+                previous = np.zeros((len(group.rules), len(self.symbols)), dtype=bool)
+                if group.previous is not None:
+                    previous[:group.previous.shape[0]] = group.previous
+                group.previous = previous
+        self._program = program
+
+    def set_market(self, long_oi=None, short_oi=None, funding_rate=None):
+        self.bank.set_market(long_oi, short_oi, funding_rate)
+
+    @instrument(size_arg=None)
+    def on_bar(self, ts, open_prices, high_prices, low_prices, close_prices, volumes):
+        """Advance indicators by one bar for every symbol and return this bar's Triggers
+
+        Arrays are aligned with symbols; NaN closes mark symbols without a bar, whose
+        rule states carry over unchanged.
+        """
+        self.bank.update(ts, open_prices, high_prices, low_prices, close_prices, volumes)
+        return self.evaluate()
+
+    def evaluate(self):
+        """Evaluate every rule against the bank's current values and deliver triggers"""
+        if self._program is None:
+            self._build()
+        values = []
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for kind, source, args in self._program:
+                if kind == 'field':
+                    values.append(self.bank.field(source))
+                elif kind == 'param':
+                    values.append(source.params[args])
+                elif kind == 'constant':
+                    values.append(source)
+                elif kind == 'call':
+                    values.append(source(*(values[i] for i in args)))
+                else:
+                    result = values[args[0]]
+                    for i in args[1:]:
+                        result = source(result, values[i])
+                    values.append(result)
+
+        close = self.bank.bar['close']
+        has_bar = ~np.isnan(close)
+        closes = close.tolist()
+        ts = self.bank.ts
+        triggers = []
+        for group in self._groups.values():
+            state = np.broadcast_to(values[group.output], group.previous.shape).astype(bool)
+            state = np.where(has_bar, state, group.previous)
+            fired = state & ~group.previous if self.edge else state & has_bar
+            group.previous = state
+            rules, symbols = np.nonzero(fired)
+            # Plain-list lookups: numpy scalar indexing would dominate on busy bars
+            triggers.extend(
+                Trigger(group.names[r], self.symbols[s], ts, closes[s]) for r, s in zip(rules.tolist(), symbols.tolist())
+            )
+        if triggers:
+            for sink in self.sinks:
+                sink(triggers)
+        return triggers
+
+    def replay(self, ts, ohlcv, deliver=False):
+        """Run bars through the engine: ts (bars,) and ohlcv (symbols, 5, bars) aligned on time
+
+        Used to warm indicators from history; triggers are only delivered when deliver is set.
+        Returns every trigger raised.
+        """
+        sinks = self.sinks
+        if not deliver:
+            self.sinks = []
+        triggers = []
+        try:
+            for k in range(len(ts)):
+                triggers.extend(self.on_bar(int(ts[k]), *(ohlcv[:, j, k] for j in range(len(PRICE_COLUMNS)))))
+        finally:
+            self.sinks = sinks
+        return triggers
+
+def parse_rules(text):
+    """Rules from 'name: condition' lines; blank lines and # comments are skipped"""
+    rules = []
+    for number, line in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        name, separator, condition = line.partition(':')
+        if not separator or not name.strip() or not condition.strip():
+            raise ValueError(f"Line {number}: expected 'name: condition', got {line!r}")
+        rules.append(Rule(name.strip(), condition.strip()))
+    return rules
+
+def trigger_payload(triggers):
+    """JSON-ready dicts for a batch of triggers"""
+    return [trigger._asdict() for trigger in triggers]
+
+class TriggerQueue:
+    """Bounded local queue sink; the oldest triggers are dropped when it is full"""
+
+    def __init__(self, maxsize=10_000):
+        self.triggers = deque(maxlen=maxsize)
+        self.received = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, triggers):
+        with self._lock:
+            self.triggers.extend(triggers)
+            self.received += len(triggers)
+
+    def __len__(self):
+        return len(self.triggers)
+
+    @property
+    def dropped(self):
+        return self.received - len(self.triggers)
+
+    def drain(self):
+        with self._lock:
+            triggers = list(self.triggers)
+            self.triggers.clear()
+            return triggers
+
+def configured_webhooks(value=None):
+    """Webhook targets allowed on this server: {name: url} from ORACLE_ALERT_WEBHOOKS
+
+    The variable holds comma-separated name=url pairs. Targets come only from server
+    configuration, never from dashboard input, so users cannot point the server at
+    arbitrary hosts. Raises ValueError on a malformed entry.
+    """
+    value = os.environ.get('ORACLE_ALERT_WEBHOOKS', '') if value is None else value
+    return parse_endpoints(value, 'ORACLE_ALERT_WEBHOOKS')
+
+class WebhookSink:
+    """POST trigger batches as JSON to a webhook from a background thread
+
+    Batches wait in a bounded queue (oldest dropped when full) so a slow endpoint never
+    stalls bar processing. Point it at the mock exchange's /api/v1/alerts to test offline.
+    """
+
+    def __init__(self, url, queue_size=1000, timeout=5.0):
+        self.url = url
+        self.timeout = timeout
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.last_error = None
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name='webhook-sink', daemon=True)
+        self._thread.start()
+
+    def __call__(self, triggers):
+        batch = json.dumps(trigger_payload(triggers)).encode()
+        while True:
+            try:
+                self._queue.put_nowait(batch)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def _run(self):
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                return
+            request = urllib.request.Request(self.url, data=batch, headers={'Content-Type': 'application/json'})
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    response.read()
+                self.sent += 1
+            except OSError as e:
+                self.failed += 1
+                self.last_error = str(e)
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued batch has been attempted"""
+        self._queue.join()
+
+    def close(self):
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
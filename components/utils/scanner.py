@@ -0,0 +1,390 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from utils.calculations import (
+    rsi_series,
+    dmi_series,
+    calculate_vwap,
+    calculate_volume_analysis,
+    calculate_trend_status,
+    calculate_timeframe_multiplier
+)
+from utils.confluence import (
+    PRESSURE_LABELS,
+    CONFLUENCE_LABELS,
+    TECHNICAL_LABELS,
+    VOLUME_LABELS,
+    evaluate_confluence_series
+)
+from utils.fibonacci import FibLadder
+from utils.resample import TIMEFRAMES, resample_ohlcv
+from utils.candle_store import CandleStore
+
+PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+NUMERIC_FIELDS = ('close', 'ma50', 'rsi', 'pdi', 'mdi', 'adx', 'vwap', 'volume_ratio', 'fib_distance')
+MA_PERIOD = 50
+INDICATOR_PERIOD = 14
+VWAP_WINDOW = 20
+VOLUME_WINDOW = 20
+SWING_WINDOW = 50
+DEFAULT_CAPACITY = 10_080  # 7 days of 1m bars
+# Bars a timeframe needs before every indicator column is defined (MA50, swing window, ADX)
+MIN_BARS = max(MA_PERIOD, SWING_WINDOW, 2 * INDICATOR_PERIOD + 1)
+# A session's background-rescan request lapses unless renewed within this many seconds
+SUBSCRIBER_TTL = 600.0
+
+def fillable_timeframes(capacity, timeframes=TIMEFRAMES):
+    """Timeframes whose indicators capacity 1m bars can fill (one extra bar for a partial bucket)"""
+    return tuple(tf for tf in timeframes if capacity >= calculate_timeframe_multiplier(tf) * (MIN_BARS + 1))
+
+def scan_symbol(ts, ohlcv, timeframes, lookback):
+    """Indicator row per timeframe for one symbol's 1m history
+
+    Only the last lookback bars of each timeframe are resampled and evaluated.
+    """
+    rows = []
+    for timeframe in timeframes:
+        multiplier = calculate_timeframe_multiplier(timeframe)
+        start = max(0, len(ts) - (lookback + 1) * multiplier)
+        bars = resample_ohlcv(ts[start:], *(ohlcv[j, start:] for j in range(len(PRICE_COLUMNS))), timeframe)
+        high, low, close, volume = bars['high'], bars['low'], bars['close'], bars['volume']
+        count = len(close)
+        if count == 0:
+            continue
+
+        price = float(close[-1])
+        ma50 = float(close[-MA_PERIOD:].mean()) if count >= MA_PERIOD else math.nan
+        rsi = float(rsi_series(close, INDICATOR_PERIOD)[-1])
+        pdi, mdi, adx = (float(series[-1]) for series in dmi_series(high, low, close, INDICATOR_PERIOD))
+        vwap = calculate_vwap(close[-VWAP_WINDOW:], volume[-VWAP_WINDOW:])
+        volume_ratio, volume_status, delta_status = calculate_volume_analysis(volume[-1], volume[-VOLUME_WINDOW - 1:-1])
+        ladder = FibLadder(float(high[-SWING_WINDOW:].max()), float(low[-SWING_WINDOW:].min()))
+        fib_level, _, fib_gap = ladder.nearest(price)
+        rows.append((
+            timeframe, price, ma50, rsi, pdi, mdi, adx, vwap, float(volume_ratio),
+            float(fib_gap / price) if price else math.nan, volume_status, delta_status, fib_level
+        ))
+    return rows
+
+# Workers attach to the shared candle buffers once, in the pool initializer
+_worker_state = None
+
+def _attach_worker(ts_name, ohlcv_name, shape, timeframes, lookback):
+    global _worker_state
+    ts_shm = shared_memory.SharedMemory(name=ts_name)
+    ohlcv_shm = shared_memory.SharedMemory(name=ohlcv_name)
+    symbols, capacity = shape
+    _worker_state = (
+        ts_shm, ohlcv_shm,
+        np.ndarray((symbols, capacity), dtype=np.int64, buffer=ts_shm.buf),
+        np.ndarray((symbols, len(PRICE_COLUMNS), capacity), dtype=float, buffer=ohlcv_shm.buf),
+        timeframes, lookback
+    )
+
+def _scan_chunk(task):
+    _, _, ts, ohlcv, timeframes, lookback = _worker_state
+    return _scan_rows(ts, ohlcv, task, timeframes, lookback)
+
+def _scan_rows(ts, ohlcv, task, timeframes, lookback):
+    start, lengths = task
+    rows = []
+    for offset, length in enumerate(lengths):
+        i = start + offset
+        if length:
+            rows.extend((i,) + row for row in scan_symbol(ts[i, :length], ohlcv[i, :, :length], timeframes, lookback))
+    return rows
+
+class SymbolScanner:
+    """Full indicator set for many symbols x timeframes, fanned out over a process pool
+
+    1m candles live in two shared-memory blocks (timestamps and OHLCV, one row per
+    symbol) that workers map once at start-up, so scans only send symbol ranges and
+    receive compact result rows. Each symbol keeps its latest capacity 1m bars, so
+    timeframes default to those that history can fill; asking for a longer one raises
+    ValueError. At most lookback bars per timeframe are evaluated.
+    """
+
+    def __init__(self, symbols, capacity=DEFAULT_CAPACITY, timeframes=None, lookback=200, max_workers=None):
+        self.symbols = list(symbols)
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.capacity = capacity
+        self.timeframes = fillable_timeframes(capacity) if timeframes is None else tuple(timeframes)
+        short = [tf for tf in self.timeframes if tf not in fillable_timeframes(capacity, self.timeframes)]
+        if short:
+            needed = max(calculate_timeframe_multiplier(tf) for tf in short) * (MIN_BARS + 1)
+            raise ValueError(f"{capacity:,} 1m bars cannot fill {', '.join(short)}; need a capacity of at least {needed:,}")
+        self.lookback = lookback
+        self.max_workers = os.cpu_count() if max_workers is None else max_workers
+        count = len(self.symbols)
+
+        self._ts_shm = shared_memory.SharedMemory(create=True, size=max(1, count * capacity * 8))
+        self._ohlcv_shm = shared_memory.SharedMemory(create=True, size=max(1, count * len(PRICE_COLUMNS) * capacity * 8))
+        self.ts = np.ndarray((count, capacity), dtype=np.int64, buffer=self._ts_shm.buf)
+        self.ohlcv = np.ndarray((count, len(PRICE_COLUMNS), capacity), dtype=float, buffer=self._ohlcv_shm.buf)
+        self.lengths = np.zeros(count, dtype=np.int64)
+        self.long_oi = np.zeros(count)
+        self.short_oi = np.zeros(count)
+        self.funding_rate = np.zeros(count)
+
+        self._pool = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._subscribers = {}
+        self._subscribers_lock = threading.Lock()
+        self.latest = []
+        self.last_scan = None
+        self.last_duration = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def load(self, symbol, ts, open_prices, high_prices, low_prices, close_prices, volumes):
+        """Replace a symbol's 1m history (only the latest capacity bars are kept)"""
+        i = self.index[symbol]
+        ts = np.asarray(ts, dtype=np.int64)[-self.capacity:]
+        count = len(ts)
+        with self._lock:
+            self.ts[i, :count] = ts
+            for j, values in enumerate((open_prices, high_prices, low_prices, close_prices, volumes)):
+                self.ohlcv[i, j, :count] = np.asarray(values, dtype=float)[-count:] if count else []
+            self.lengths[i] = count
+
+    def update(self, symbol, ts, open_price, high, low, close, volume):
+        """Append one 1m bar; a full buffer drops its oldest quarter to make room"""
+        i = self.index[symbol]
+        with self._lock:
+            length = self.lengths[i]
+            if length == self.capacity:
+                keep = self.capacity - max(1, self.capacity // 4)
+                self.ts[i, :keep] = self.ts[i, length - keep:length]
+                self.ohlcv[i, :, :keep] = self.ohlcv[i, :, length - keep:length]
+                length = keep
+            self.ts[i, length] = ts
+            self.ohlcv[i, :, length] = (open_price, high, low, close, volume)
+            self.lengths[i] = length + 1
+
+    def tail(self, bars):
+        """Latest bars 1m candles per symbol, right-aligned: ts (symbols, bars) and OHLCV (symbols, 5, bars)
+
+        Symbols with a shorter history are padded on the left with NaN prices and zero timestamps.
+        """
+        ts = np.zeros((len(self.symbols), bars), dtype=np.int64)
+        ohlcv = np.full((len(self.symbols), len(PRICE_COLUMNS), bars), np.nan)
+        with self._lock:
+            for i, length in enumerate(self.lengths.tolist()):
+                count = min(length, bars)
+                if count:
+                    ts[i, bars - count:] = self.ts[i, length - count:length]
+                    ohlcv[i, :, bars - count:] = self.ohlcv[i, :, length - count:length]
+        return ts, ohlcv
+
+    def set_market(self, symbol, long_oi, short_oi, funding_rate=0.0):
+        """Open interest and funding used for the pressure gauge and confluence columns"""
+        i = self.index[symbol]
+        self.long_oi[i] = long_oi
+        self.short_oi[i] = short_oi
+        self.funding_rate[i] = funding_rate
+
+    def _tasks(self, lengths):
+        chunks = max(1, 4 * max(1, self.max_workers))
+        size = max(1, math.ceil(len(self.symbols) / chunks))
+        return [(start, lengths[start:start + size].tolist()) for start in range(0, len(self.symbols), size)]
+
+    def _ensure_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_attach_worker,
+                initargs=(self._ts_shm.name, self._ohlcv_shm.name, self.ts.shape, self.timeframes, self.lookback)
+            )
+        return self._pool
+
+    def scan(self):
+        """Evaluate every symbol and timeframe; returns result rows ranked best first
+
+        Scores add the confluence state (ACHIEVED 3, STRONG 2), one point each for a
+        technical confluence and a volume breakout watch, and up to one point for
+        closeness to a Fibonacci level.
+        """
+        started = time.perf_counter()
+        # Workers read the shared buffers in place, so update()/load() wait until the pass is done
+        with self._lock:
+            tasks = self._tasks(self.lengths.copy())
+            if self.max_workers > 1:
+                rows = [row for chunk in self._ensure_pool().map(_scan_chunk, tasks) for row in chunk]
+            else:
+                rows = [row for task in tasks for row in _scan_rows(self.ts, self.ohlcv, task, self.timeframes, self.lookback)]
+        ranked = self._rank(rows)
+        self.latest = ranked
+        self.last_scan = time.time()
+        self.last_duration = time.perf_counter() - started
+        return ranked
+
+    def _rank(self, rows):
+        if not rows:
+            return []
+        symbol_index = np.array([row[0] for row in rows])
+        numeric = np.array([row[2:2 + len(NUMERIC_FIELDS)] for row in rows], dtype=float)
+        columns = dict(zip(NUMERIC_FIELDS, numeric.T))
+        volume_status = np.array([row[-3] for row in rows])
+        delta_status = np.array([row[-2] for row in rows])
+        # A timeframe without MA50 history keeps its NaN, which leaves trend alignment undecided
+        confluence = evaluate_confluence_series(
+            columns['close'], columns['ma50'],
+            self.long_oi[symbol_index], self.short_oi[symbol_index], self.funding_rate[symbol_index],
+            columns['pdi'], columns['mdi'], columns['rsi'], volume_status, delta_status
+        )
+        confluence_points = np.select(
+            [confluence['confluence'] == CONFLUENCE_LABELS.index('ACHIEVED'), confluence['confluence'] == CONFLUENCE_LABELS.index('STRONG')],
+            [3.0, 2.0], 0.0
+        )
+        technical_points = np.isin(confluence['technical'], [
+            TECHNICAL_LABELS.index('BULLISH_CONFLUENCE'), TECHNICAL_LABELS.index('BEARISH_CONFLUENCE')
+        ])
+        volume_points = confluence['volume'] == VOLUME_LABELS.index('BREAKOUT_WATCH')
+        fib_points = 1 - np.clip(np.nan_to_num(columns['fib_distance'], nan=1.0) / 0.01, 0, 1)
+        score = confluence_points + technical_points + volume_points + fib_points
+
+        results = []
+        for k in np.argsort(-score, kind='stable'):
+            row = rows[k]
+            entry = {'symbol': self.symbols[row[0]], 'timeframe': row[1], 'score': float(score[k])}
+            entry.update((name, float(columns[name][k])) for name in NUMERIC_FIELDS)
+            entry['volume_status'] = row[-3]
+            entry['delta_status'] = row[-2]
+            entry['fib_level'] = row[-1]
+            entry['trend'] = calculate_trend_status(entry['close'], entry['ma50'])[0] if not math.isnan(entry['ma50']) else "N/A"
+            entry['pressure_gauge'] = float(confluence['pressure_gauge'][k])
+            entry['pressure'] = PRESSURE_LABELS[confluence['pressure'][k]]
+            entry['technical'] = TECHNICAL_LABELS[confluence['technical'][k]]
+            entry['confluence'] = CONFLUENCE_LABELS[confluence['confluence'][k]]
+            results.append(entry)
+        return results
+
+    def start(self, interval=5.0):
+        """Rescan on a daemon thread every interval seconds; callers poll self.latest"""
+        with self._subscribers_lock:
+            self._start(interval)
+        return self
+
+    def _start(self, interval):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, args=(interval,), name='symbol-scanner', daemon=True)
+            self._thread.start()
+
+    def subscribe(self, token, interval=5.0):
+        """Request background rescans for one session; renew on every script run
+
+        The thread rescans at the shortest subscribed interval and exits on its own once
+        every subscription has been withdrawn or has lapsed after SUBSCRIBER_TTL.
+        """
+        with self._subscribers_lock:
+            self._subscribers[token] = (interval, time.monotonic())
+            self._start(None)
+        return self
+
+    def unsubscribe(self, token):
+        """Withdraw one session's request; other sessions keep their rescans"""
+        with self._subscribers_lock:
+            self._subscribers.pop(token, None)
+
+    def _subscribed_interval(self):
+        with self._subscribers_lock:
+            cutoff = time.monotonic() - SUBSCRIBER_TTL
+            for token in [token for token, (_, renewed) in self._subscribers.items() if renewed < cutoff]:
+                del self._subscribers[token]
+            if not self._subscribers:
+                # Cleared under the lock so a racing subscribe() starts a fresh thread
+                self._thread = None
+                return None
+            return min(interval for interval, _ in self._subscribers.values())
+
+    def _run(self, interval):
+        while not self._stop.is_set():
+            wait = interval if interval is not None else self._subscribed_interval()
+            if wait is None:
+                return
+            self.scan()
+            self._stop.wait(wait)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self):
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def close(self):
+        self.stop()
+        # Waits for an in-flight scan from another session; safe to call more than once
+        with self._lock:
+            if self.ts is None:
+                return
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+            # Views must be released before the shared blocks can be closed
+            self.ts = self.ohlcv = None
+            for shm in (self._ts_shm, self._ohlcv_shm):
+                shm.close()
+                shm.unlink()
+
+def load_candle_store(scanner, root, timeframe='1m'):
+    """Fill a scanner from CandleStore directories; returns the symbols that had data"""
+    loaded = []
+    for symbol in scanner.symbols:
+        columns = CandleStore(root, symbol, timeframe).tail(scanner.capacity)
+        if len(columns['ts']):
+            scanner.load(symbol, *(columns[name] for name in ('ts',) + PRICE_COLUMNS))
+            loaded.append(symbol)
+    return loaded
+
+def load_synthetic(scanner, seed=0, end_ts=None):
+    """Fill a scanner with random-walk 1m candles and OI, for demos and benchmarks"""
+    rng = np.random.default_rng(seed)
+    bars = scanner.capacity
+    end_ts = int(time.time() * 1000) // 60_000 * 60_000 if end_ts is None else end_ts
+    ts = end_ts - np.arange(bars)[::-1] * 60_000
+    for symbol in scanner.symbols:
+        close = rng.uniform(0.1, 100_000) * np.exp(np.cumsum(rng.normal(0, 0.0015, bars)))
+        open_prices = np.r_[close[0], close[:-1]]
+        wick = close * np.abs(rng.normal(0, 0.0008, bars))
+        scanner.load(
+            symbol, ts, open_prices, np.maximum(open_prices, close) + wick,
+            np.minimum(open_prices, close) - wick, close, rng.lognormal(6, 0.6, bars)
+        )
+        long_oi, short_oi = rng.uniform(1e5, 1e7, 2)
+        scanner.set_market(symbol, long_oi, short_oi, rng.normal(0, 0.0002))
+
+# Each scanner owns shared memory and a process pool, so only the most recently used
+# MAX_SCANNERS stay open; older ones are closed when a new universe is requested
+MAX_SCANNERS = 2
+_scanners = OrderedDict()
+_scanners_lock = threading.Lock()
+
+def get_scanner(key, symbols, **kwargs):
+    """Create (once) and return the process-wide scanner registered under key"""
+    with _scanners_lock:
+        scanner = _scanners.get(key)
+        if scanner is None:
+            while len(_scanners) >= MAX_SCANNERS:
+                _, evicted = _scanners.popitem(last=False)
+                evicted.close()
+            scanner = _scanners[key] = SymbolScanner(symbols, **kwargs)
+        _scanners.move_to_end(key)
+        return scanner
@@ -0,0 +1,170 @@
+import math
+from collections import deque
+from itertools import islice
+
+from utils.calculations import (
+    DMIResult,
+    rsi_from_averages,
+    classify_volume_ratio,
+    classify_volume_delta
+)
+
+class WilderAverage:
+    """Incremental Wilder average: simple mean over the first period values, then RMA"""
+    __slots__ = ('period', 'count', 'value', '_seed_sum')
+
+    def __init__(self, period):
+        self.period = period
+        self.count = 0
+        self.value = None
+        self._seed_sum = 0.0
+
+    @property
+    def ready(self):
+        return self.value is not None
+
+    def update(self, x):
+        """Add one value and return the current average (None while warming up)"""
+        self.count += 1
+        if self.value is None:
+            self._seed_sum += x
+            if self.count == self.period:
+                self.value = self._seed_sum / self.period
+        else:
+            self.value = self.value * (1.0 - 1.0 / self.period) + x / self.period
+        return self.value
+
+class StreamingRSI:
+    """O(1) Wilder RSI over a live close stream, matching rsi_series/calculate_rsi"""
+    __slots__ = ('period', 'value', '_prev_close', '_gain', '_loss')
+
+    def __init__(self, period=14):
+        self.period = period
+        self.value = 50  # Neutral until enough data, like calculate_rsi
+        self._prev_close = None
+        self._gain = WilderAverage(period)
+        self._loss = WilderAverage(period)
+
+    @property
+    def ready(self):
+        return self._gain.ready
+
+    def update(self, close):
+        """Add one close and return the current RSI"""
+        if self._prev_close is not None:
+            change = close - self._prev_close
+            avg_gain = self._gain.update(change if change > 0 else 0.0)
+            avg_loss = self._loss.update(-change if change < 0 else 0.0)
+            if avg_gain is not None:
+                self.value = rsi_from_averages(avg_gain, avg_loss)
+        self._prev_close = close
+        return self.value
+
+class StreamingDMI:
+    """O(1) Wilder +DI/-DI/ADX over a live candle stream, matching dmi_series/calculate_dmi"""
+    __slots__ = ('period', 'pdi', 'mdi', 'adx', '_prev', '_tr', '_pdm', '_mdm', '_dx')
+
+    def __init__(self, period=14):
+        self.period = period
+        self.pdi = math.nan  # NaN until enough data, like calculate_dmi
+        self.mdi = math.nan
+        self.adx = math.nan
+        self._prev = None
+        self._tr = WilderAverage(period)
+        self._pdm = WilderAverage(period)
+        self._mdm = WilderAverage(period)
+        self._dx = WilderAverage(period)
+
+    @property
+    def ready(self):
+        return self._tr.ready
+
+    def update(self, high, low, close):
+        """Add one candle and return the current DMIResult(+DI, -DI, ADX)"""
+        if self._prev is not None:
+            prev_high, prev_low, prev_close = self._prev
+            tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+            hd = high - prev_high
+            ld = prev_low - low
+            smooth_tr = self._tr.update(tr)
+            smooth_pdm = self._pdm.update(hd if hd > 0 and hd > ld else 0.0)
+            smooth_mdm = self._mdm.update(ld if ld > 0 and ld > hd else 0.0)
+
+            if smooth_tr is not None:
+                self.pdi = 100 * smooth_pdm / smooth_tr if smooth_tr > 0 else 0.0
+                self.mdi = 100 * smooth_mdm / smooth_tr if smooth_tr > 0 else 0.0
+                di_sum = self.pdi + self.mdi
+                adx = self._dx.update(100 * abs(self.pdi - self.mdi) / di_sum if di_sum > 0 else 0.0)
+                if adx is not None:
+                    self.adx = adx
+        self._prev = (high, low, close)
+        return DMIResult(self.pdi, self.mdi, self.adx)
+
+class StreamingVWAP:
+    """O(1) cumulative VWAP over a live stream, matching calculate_vwap"""
+    __slots__ = ('total_value', 'total_volume', 'price_sum', 'count')
+
+    def __init__(self):
+        self.total_value = 0
+        self.total_volume = 0
+        self.price_sum = 0
+        self.count = 0
+
+    @property
+    def value(self):
+        if self.count == 0:
+            return 0
+        if self.total_volume > 0:
+            return self.total_value / self.total_volume
+        return self.price_sum / self.count
+
+    def update(self, price, volume):
+        """Add one price/volume pair and return the current VWAP"""
+        self.total_value += price * volume
+        self.total_volume += volume
+        self.price_sum += price
+        self.count += 1
+        return self.value
+
+class RollingVolumeStats:
+    """O(1) rolling volume history, matching calculate_volume_analysis over the last window volumes
+
+    The running total is recomputed from the history every window updates to bound
+    floating-point drift, as in RollingPressureStats.
+    """
+    __slots__ = ('window', 'history', 'total', 'updates')
+
+    # calculate_volume_analysis compares the first and last five volumes of the history
+    DELTA_SPAN = 5
+
+    def __init__(self, window=20):
+        self.window = window
+        self.history = deque(maxlen=window)
+        self.total = 0.0
+        self.updates = 0
+
+    def analyze(self, current_volume):
+        """Compare a volume against the current history: (ratio, volume status, delta status)"""
+        size = len(self.history)
+        if size < 2:
+            return 50, "NEUTRAL", "NEUTRAL"  # Default values
+
+        avg_volume = self.total / size
+        volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1
+
+        span = min(self.DELTA_SPAN, size)
+        recent_avg = sum(islice(reversed(self.history), span)) / span
+        older_avg = sum(islice(self.history, span)) / span
+        return volume_ratio, classify_volume_ratio(volume_ratio), classify_volume_delta(recent_avg, older_avg)
+
+    def update(self, volume):
+        """Analyze a closed candle's volume against the prior history, then append it"""
+        result = self.analyze(volume)
+        if len(self.history) == self.window:
+            self.total -= self.history[0]
+        self.history.append(volume)
+        self.total += volume
+        self.updates += 1
+        if self.updates % self.window == 0:
+            self.total = sum(self.history)
+        return result
@@ -1,3 +1,17 @@
+import urllib.parse
+
+import numpy as np
+
+def parse_endpoints(value, variable):
+    """{name: url} from comma-separated name=http(s)://url pairs (raises ValueError naming variable)"""
+    endpoints = {}
+    for entry in filter(None, (item.strip() for item in value.split(','))):
+        name, _, url = entry.partition('=')
+        if not url or urllib.parse.urlsplit(url.strip()).scheme not in ('http', 'https'):
+            raise ValueError(f"{variable} entry {entry!r} is not name=http(s)://...")
+        endpoints[name.strip()] = url.strip()
+    return endpoints
+
 def validate_positive_number(value):
     """Validate that input is a positive number"""
     return value and value > 0
@@ -10,6 +24,10 @@ def validate_decimal_odds(value):
     """Validate that input is a valid decimal odds value"""
     return value and value > 0
 
+def validate_commission(value):
+    """Validate that input is a commission rate on winnings (0 <= rate < 1)"""
+    return 0 <= value < 1
+
 def validate_timeframe(timeframe):
     """Validate that input is a valid timeframe"""
     valid_timeframes = ['1m', '5m', '15m', '30m', '1h', '4h', '1d', '1w']
@@ -18,3 +36,39 @@ def validate_timeframe(timeframe):
 def validate_oi_data(long_oi, short_oi):
     """Validate Open Interest data"""
     return long_oi >= 0 and short_oi >= 0
+
+def parse_number_list(text):
+    """Parse a comma-separated list of numbers into a tuple (raises ValueError naming the first bad item)"""
+    fields = text.split(',')
+    try:
+        return tuple(np.array(fields, dtype=float).tolist())
+    except ValueError:
+        for i, field in enumerate(fields, start=1):
+            try:
+                float(field)
+            except ValueError:
+                raise ValueError(f"Item {i} ({field.strip()!r}) is not a number") from None
+        raise
+
+def candle_row_errors(ts, open_prices, high_prices, low_prices, close_prices, volumes):
+    """Vectorized candle schema checks: a list of (column, message, bad-row mask)
+
+    Row rules follow the scalar validators: prices positive, volume non-negative (like
+    validate_oi_data), high/low bracketing open and close, timestamps strictly increasing.
+    """
+    ts = np.asarray(ts)
+    prices = {
+        'open': np.asarray(open_prices, dtype=float),
+        'high': np.asarray(high_prices, dtype=float),
+        'low': np.asarray(low_prices, dtype=float),
+        'close': np.asarray(close_prices, dtype=float)
+    }
+    volumes = np.asarray(volumes, dtype=float)
+    checks = []
+    for name, values in prices.items():
+        checks.append((name, "must be a positive number", ~(np.isfinite(values) & (values > 0))))
+    checks.append(('volume', "must be a non-negative number", ~(np.isfinite(volumes) & (volumes >= 0))))
+    checks.append(('high', "below open, close or low", (prices['high'] < np.maximum(prices['open'], prices['close'])) | (prices['high'] < prices['low'])))
+    checks.append(('low', "above open or close", prices['low'] > np.minimum(prices['open'], prices['close'])))
+    checks.append(('ts', "not after the previous row", np.r_[False, ts[1:] <= ts[:-1]]))
+    return checks
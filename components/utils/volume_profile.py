@@ -0,0 +1,178 @@
+from collections import namedtuple
+
+import numpy as np
+
+from utils.calculations import classify_volume_ratio
+from utils.instrumentation import instrument
+
+ProfileSummary = namedtuple('ProfileSummary', ['poc', 'value_area_high', 'value_area_low', 'total_volume'])
+# 8 MB of float64 bins; a wider grid means the bin size is far too small for the price range
+MAX_BINS = 1_000_000
+
+class VolumeProfile:
+    """Volume-at-price histogram on a fixed price grid that grows to fit incoming trades
+
+    Bin i covers [origin + i * bin_size, origin + (i + 1) * bin_size). Bulk history is
+    bucketed with one bincount; live trades add in O(1). Price sub-range queries use a
+    prefix sum over the bins, rebuilt lazily after updates. checkpoint() (e.g. on each
+    bar close) stores only the bins traded since the previous checkpoint, keyed by an
+    absolute bin number that grid growth never invalidates, so any time range between
+    checkpoints is the sum of its deltas.
+    """
+
+    VALUE_AREA = 0.70
+
+    def __init__(self, bin_size, origin=None):
+        if bin_size <= 0:
+            raise ValueError("bin_size must be positive")
+        self.bin_size = float(bin_size)
+        self.origin = None if origin is None else float(origin)
+        self.bins = np.zeros(0)
+        self.checkpoints = []
+        self._prefix = None
+        # Index shift applied by every grid growth so far; absolute bin = index - _shift
+        self._shift = 0
+        self._pending_keys = []
+        self._pending_sizes = []
+
+    def _bin_index(self, prices):
+        return np.floor((np.asarray(prices, dtype=float) - self.origin) / self.bin_size).astype(np.int64)
+
+    def _fit(self, low_index, high_index):
+        """Grow the grid so bins low_index..high_index exist; returns the index shift applied"""
+        shift = max(0, -low_index)
+        size = max(len(self.bins) + shift, high_index + shift + 1)
+        if size > MAX_BINS:
+            raise ValueError(
+                f"Prices span {size:,} bins of {self.bin_size:g}, over the {MAX_BINS:,} limit; use a larger bin_size"
+            )
+        if shift or size > len(self.bins):
+            grown = np.zeros(size)
+            grown[shift:shift + len(self.bins)] = self.bins
+            self.bins = grown
+            self.origin -= shift * self.bin_size
+            self._shift += shift
+        return shift
+
+    def add_trades(self, prices, sizes):
+        """Bucket many trades in one vectorized pass"""
+        prices = np.asarray(prices, dtype=float)
+        sizes = np.asarray(sizes, dtype=float)
+        if len(prices) == 0:
+            return
+        if self.origin is None:
+            self.origin = np.floor(prices.min() / self.bin_size) * self.bin_size
+        index = self._bin_index(prices)
+        index += self._fit(int(index.min()), int(index.max()))
+        self.bins += np.bincount(index, weights=sizes, minlength=len(self.bins))
+        if self.checkpoints:
+            self._pending_keys.append(index - self._shift)
+            self._pending_sizes.append(sizes)
+        self._prefix = None
+
+    def add_trade(self, price, size):
+        """Add one streaming trade"""
+        if self.origin is None:
+            self.origin = np.floor(price / self.bin_size) * self.bin_size
+        index = int((price - self.origin) // self.bin_size)
+        index += self._fit(index, index)
+        self.bins[index] += size
+        if self.checkpoints:
+            self._pending_keys.append(index - self._shift)
+            self._pending_sizes.append(size)
+        self._prefix = None
+
+    def _pending(self):
+        """(absolute bins, volumes) traded since the last checkpoint, one entry per bin"""
+        if not self._pending_keys:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        keys = np.concatenate([np.atleast_1d(k) for k in self._pending_keys])
+        sizes = np.concatenate([np.atleast_1d(v) for v in self._pending_sizes]).astype(float)
+        keys, inverse = np.unique(keys, return_inverse=True)
+        return keys, np.bincount(inverse, weights=sizes, minlength=len(keys))
+
+    def checkpoint(self):
+        """Record the trades since the previous checkpoint; returns the checkpoint number
+
+        Ranges always start at a checkpoint, so trades before the first one are never
+        needed and are not tracked.
+        """
+        self.checkpoints.append(self._pending())
+        self._pending_keys = []
+        self._pending_sizes = []
+        return len(self.checkpoints) - 1
+
+    def bin_prices(self):
+        """Lower edge of every bin"""
+        return self.origin + np.arange(len(self.bins)) * self.bin_size
+
+    def between(self, start_checkpoint, end_checkpoint=None):
+        """Bins traded after start_checkpoint up to end_checkpoint (None = now)"""
+        deltas = self.checkpoints[start_checkpoint + 1:None if end_checkpoint is None else end_checkpoint + 1]
+        if end_checkpoint is None:
+            deltas.append(self._pending())
+        if not deltas:
+            return np.zeros(len(self.bins))
+        keys = np.concatenate([keys for keys, _ in deltas]) + self._shift
+        sizes = np.concatenate([sizes for _, sizes in deltas])
+        return np.bincount(keys, weights=sizes, minlength=len(self.bins))
+
+    def volume_in_range(self, low_price, high_price):
+        """Volume in bins overlapping [low_price, high_price], O(1) after the first query"""
+        if self._prefix is None:
+            self._prefix = np.r_[0.0, np.cumsum(self.bins)]
+        lo = int(np.clip(np.floor((low_price - self.origin) / self.bin_size), 0, len(self.bins)))
+        hi = int(np.clip(np.floor((high_price - self.origin) / self.bin_size) + 1, 0, len(self.bins)))
+        return float(self._prefix[hi] - self._prefix[lo]) if hi > lo else 0.0
+
+    def summary(self, bins=None, low_price=None, high_price=None):
+        """POC and 70% value area for the profile (or the given bins), optionally within a price range"""
+        bins = self.bins if bins is None else bins
+        if self.origin is None:
+            return ProfileSummary(None, None, None, 0.0)
+        # Bins overlapping the price range form one contiguous slice of the grid
+        lo = 0 if low_price is None else int(np.clip(np.floor((low_price - self.origin) / self.bin_size), 0, len(bins)))
+        hi = len(bins) if high_price is None else int(np.clip(np.floor((high_price - self.origin) / self.bin_size) + 1, 0, len(bins)))
+        bins = bins[lo:max(lo, hi)]
+        prices = self.origin + np.arange(lo, lo + len(bins)) * self.bin_size
+        total = float(bins.sum())
+        if total <= 0:
+            return ProfileSummary(None, None, None, 0.0)
+
+        # Expand from the POC towards the heavier neighbour until the value area is covered
+        poc = int(np.argmax(bins))
+        lo = hi = poc
+        covered = bins[poc]
+        while covered < self.VALUE_AREA * total:
+            below = bins[lo - 1] if lo > 0 else -1.0
+            above = bins[hi + 1] if hi + 1 < len(bins) else -1.0
+            if above >= below:
+                hi += 1
+                covered += above
+            else:
+                lo -= 1
+                covered += below
+        half = self.bin_size / 2
+        return ProfileSummary(float(prices[poc] + half), float(prices[hi] + self.bin_size), float(prices[lo]), total)
+
+    def node_status(self, price, bins=None):
+        """HIGH/LOW/AVERAGE volume node at price, using calculate_volume_analysis' ratio thresholds"""
+        bins = self.bins if bins is None else bins
+        traded = bins[bins > 0]
+        index = int((price - self.origin) // self.bin_size)
+        if len(traded) == 0 or index < 0 or index >= len(bins):
+            return 0.0, "LOW"
+        ratio = float(bins[index] / traded.mean())
+        return ratio, classify_volume_ratio(ratio)
+
+@instrument()
+def volume_profile(prices, volumes, bin_size):
+    """Build a VolumeProfile from bulk trades or bars in one pass"""
+    profile = VolumeProfile(bin_size)
+    profile.add_trades(prices, volumes)
+    return profile
+
+def profile_summary(prices, volumes, bin_size, price):
+    """(ProfileSummary, (node ratio, node status at price)) of a bulk volume profile"""
+    profile = volume_profile(prices, volumes, bin_size)
+    return profile.summary(), profile.node_status(price)
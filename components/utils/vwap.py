@@ -0,0 +1,149 @@
+from collections import namedtuple
+
+import numpy as np
+
+DAY_MS = 86_400_000
+
+VWAPSummary = namedtuple(
+    'VWAPSummary', ['vwap', 'lower_2', 'lower_1', 'upper_1', 'upper_2', 'rolling_vwap', 'rolling_std']
+)
+
+class VWAPIndex:
+    """Prefix sums of volume, price*volume and price^2*volume for O(1) VWAP queries
+
+    After an O(n) build, any anchored, rolling or session VWAP and its standard
+    deviation is a difference of two prefix entries. Live candles append in O(1)
+    amortized time. Prices are stored relative to the first price so the squared
+    sums keep their precision on BTC-sized numbers.
+    """
+
+    def __init__(self, prices=(), volumes=(), timestamps=None, capacity=1024):
+        prices = np.asarray(prices, dtype=float)
+        volumes = np.asarray(volumes, dtype=float)
+        if len(prices) != len(volumes):
+            raise ValueError("prices and volumes must have the same length")
+        self.reference = float(prices[0]) if len(prices) else None
+        self.size = 0
+        size = max(capacity, len(prices)) + 1
+        self._cum_v = np.zeros(size)
+        self._cum_pv = np.zeros(size)
+        self._cum_p2v = np.zeros(size)
+        self._ts = np.zeros(size - 1, dtype=np.int64)
+        self.has_timestamps = False
+        if len(prices):
+            self.extend(prices, volumes, timestamps)
+
+    def __len__(self):
+        return self.size
+
+    def _reserve(self, extra):
+        needed = self.size + extra + 1
+        if needed <= len(self._cum_v):
+            return
+        capacity = max(needed, 2 * len(self._cum_v))
+        for name in ('_cum_v', '_cum_pv', '_cum_p2v'):
+            grown = np.zeros(capacity)
+            grown[:self.size + 1] = getattr(self, name)[:self.size + 1]
+            setattr(self, name, grown)
+        grown_ts = np.zeros(capacity - 1, dtype=np.int64)
+        grown_ts[:self.size] = self._ts[:self.size]
+        self._ts = grown_ts
+
+    def extend(self, prices, volumes, timestamps=None):
+        """Append many bars in one vectorized pass"""
+        prices = np.asarray(prices, dtype=float)
+        volumes = np.asarray(volumes, dtype=float)
+        if len(prices) == 0:
+            return
+        if self.reference is None:
+            self.reference = float(prices[0])
+        self._reserve(len(prices))
+        start, end = self.size, self.size + len(prices)
+        offset = prices - self.reference
+        self._cum_v[start + 1:end + 1] = self._cum_v[start] + np.cumsum(volumes)
+        self._cum_pv[start + 1:end + 1] = self._cum_pv[start] + np.cumsum(offset * volumes)
+        self._cum_p2v[start + 1:end + 1] = self._cum_p2v[start] + np.cumsum(offset * offset * volumes)
+        if timestamps is not None:
+            self._ts[start:end] = np.asarray(timestamps, dtype=np.int64)
+            self.has_timestamps = True
+        self.size = end
+
+    def append(self, price, volume, timestamp=None):
+        """Append one live bar in O(1) amortized time"""
+        if self.reference is None:
+            self.reference = float(price)
+        self._reserve(1)
+        i = self.size
+        offset = price - self.reference
+        self._cum_v[i + 1] = self._cum_v[i] + volume
+        self._cum_pv[i + 1] = self._cum_pv[i] + offset * volume
+        self._cum_p2v[i + 1] = self._cum_p2v[i] + offset * offset * volume
+        if timestamp is not None:
+            self._ts[i] = timestamp
+            self.has_timestamps = True
+        self.size += 1
+
+    def anchored(self, start, end=None):
+        """(VWAP, volume-weighted std) over bars [start, end); start/end may be arrays of anchors
+
+        Returns NaN where the range holds no volume.
+        """
+        end = self.size if end is None else end
+        volume = self._cum_v[end] - self._cum_v[start]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_offset = np.where(volume > 0, (self._cum_pv[end] - self._cum_pv[start]) / volume, np.nan)
+            second = (self._cum_p2v[end] - self._cum_p2v[start]) / volume
+        std = np.sqrt(np.maximum(second - mean_offset * mean_offset, 0.0))
+        vwap = mean_offset + self.reference if self.reference is not None else mean_offset
+        if np.ndim(vwap) == 0:
+            return float(vwap), float(std)
+        return vwap, std
+
+    def rolling(self, window, end=None):
+        """VWAP and std over the last window bars ending before end"""
+        end = self.size if end is None else end
+        return self.anchored(np.maximum(np.asarray(end) - window, 0), end)
+
+    def session_start(self, session_ms=DAY_MS, offset_ms=0):
+        """Index of the first bar in the session containing the latest bar"""
+        if not self.has_timestamps:
+            raise ValueError("Session VWAP needs timestamps")
+        last = self._ts[self.size - 1]
+        anchor = (last - offset_ms) // session_ms * session_ms + offset_ms
+        return int(np.searchsorted(self._ts[:self.size], anchor, side='left'))
+
+    def session(self, session_ms=DAY_MS, offset_ms=0):
+        """VWAP and std since the current session opened (UTC days by default)"""
+        return self.anchored(self.session_start(session_ms, offset_ms))
+
+    def bands(self, start=0, end=None, multipliers=(1.0, 2.0)):
+        """VWAP with +-k sigma bands for an anchored range"""
+        vwap, std = self.anchored(start, end)
+        bands = {'vwap': vwap}
+        for k in multipliers:
+            bands[f"upper_{k:g}"] = vwap + k * std
+            bands[f"lower_{k:g}"] = vwap - k * std
+        return bands
+
+    def rolling_series(self, window):
+        """Rolling VWAP and std for every bar (partial windows at the start)"""
+        ends = np.arange(1, self.size + 1)
+        return self.anchored(np.maximum(ends - window, 0), ends)
+
+    def session_series(self, session_ms=DAY_MS, offset_ms=0):
+        """Session-anchored VWAP and std for every bar"""
+        if not self.has_timestamps:
+            raise ValueError("Session VWAP needs timestamps")
+        ts = self._ts[:self.size]
+        sessions = (ts - offset_ms) // session_ms
+        starts = np.flatnonzero(np.r_[True, sessions[1:] != sessions[:-1]])
+        anchors = np.repeat(starts, np.diff(np.r_[starts, self.size]))
+        return self.anchored(anchors, np.arange(1, self.size + 1))
+
+def vwap_summary(prices, volumes, window):
+    """Anchored VWAP with 1/2 sigma bands and the rolling VWAP/std over the last window bars"""
+    index = VWAPIndex(prices, volumes)
+    bands = index.bands()
+    return VWAPSummary(
+        bands['vwap'], bands['lower_2'], bands['lower_1'], bands['upper_1'], bands['upper_2'], *index.rolling(window)
+    )
@@ -1,5 +1,10 @@
 import streamlit as st
 from utils.calculations import calculate_volume_analysis, calculate_vwap
+from utils.confluence import VOLUME_LABELS, volume_codes
+from utils.vwap import vwap_summary
+from utils.volume_profile import profile_summary
+from utils.cache import cached_call
+from utils.validators import parse_number_list
 
 def volume_analysis_tab():
     st.header("📊 Volume Analysis - MA50 Aligned")
@@ -40,29 +45,54 @@ def volume_analysis_tab():
             "Volume Data for VWAP (comma separated, last 20 values):",
             "1200,1300,1400,1250,1350,1450,1300,1200,1300,1400,1250,1350,1450,1300,1200,1300,1400,1250,1350,1450"
         )
+        
+        current_price = st.number_input(
+            "Current Price:",
+            min_value=0.0,
+            value=109550.0,
+            step=100.0,
+            format="%.2f",
+            key="vwap_current_price"
+        )
+        
+        vwap_window = st.number_input(
+            "Rolling VWAP Window (bars):",
+            min_value=1,
+            value=10,
+            step=1,
+            key="vwap_window"
+        )
+        
+        profile_bin = st.number_input(
+            "Volume Profile Bin Size ($):",
+            min_value=1.0,
+            value=100.0,
+            step=10.0,
+            key="profile_bin_size"
+        )
     
     if st.button("📊 Calculate Volume Analysis", type="secondary"):
         with st.spinner("Analyzing volume data..."):
             # Parse volume history
             try:
-                vol_history = [float(x.strip()) for x in volume_history.split(',')]
-            except:
-                st.error("Please enter valid comma-separated volume numbers")
+                vol_history = cached_call(parse_number_list, volume_history)
+            except ValueError as e:
+                st.error(f"Please enter valid comma-separated volume numbers: {e}")
                 return
             
             # Parse price and volume data for VWAP
             try:
-                price_list = [float(x.strip()) for x in prices.split(',')]
-                vol_list = [float(x.strip()) for x in vwap_volumes.split(',')]
-            except:
-                st.error("Please enter valid comma-separated price and volume numbers")
+                price_list = cached_call(parse_number_list, prices)
+                vol_list = cached_call(parse_number_list, vwap_volumes)
+            except ValueError as e:
+                st.error(f"Please enter valid comma-separated price and volume numbers: {e}")
                 return
             
             # Calculate volume analysis
-            volume_ratio, volume_status, delta_status = calculate_volume_analysis(current_volume, vol_history)
+            volume_ratio, volume_status, delta_status = cached_call(calculate_volume_analysis, current_volume, vol_history)
             
             # Calculate VWAP
-            vwap = calculate_vwap(price_list, vol_list)
+            vwap = cached_call(calculate_vwap, price_list, vol_list)
             
             st.markdown("### 📊 Volume Analysis Results:")
             
@@ -103,8 +133,43 @@ def volume_analysis_tab():
             st.markdown("### 🎯 VWAP Analysis:")
             st.metric("VWAP (Institutional Level)", f"${vwap:,.2f}")
             
-            # VWAP vs Current Price (assuming current price is from Market Analysis)
-            current_price = st.session_state.get('current_price', 109550.0)
+            # Anchored (full input) and rolling VWAP with standard-deviation bands
+            if len(price_list) == len(vol_list):
+                bands = cached_call(vwap_summary, price_list, vol_list, int(vwap_window))
+                
+                band_cols = st.columns(4)
+                band_cols[0].metric("VWAP -2σ", f"${bands.lower_2:,.2f}")
+                band_cols[1].metric("VWAP -1σ", f"${bands.lower_1:,.2f}")
+                band_cols[2].metric("VWAP +1σ", f"${bands.upper_1:,.2f}")
+                band_cols[3].metric("VWAP +2σ", f"${bands.upper_2:,.2f}")
+                st.metric(f"Rolling VWAP ({int(vwap_window)} bars)", f"${bands.rolling_vwap:,.2f}", delta=f"σ ${bands.rolling_std:,.2f}", delta_color="off")
+                
+                if current_price > bands.upper_2 or current_price < bands.lower_2:
+                    st.warning("⚠️ PRICE OUTSIDE ±2σ VWAP BANDS - Stretched from institutional value")
+            
+            # Volume profile: POC and 70% value area
+            if len(price_list) == len(vol_list):
+                st.markdown("### 📶 Volume Profile:")
+                try:
+                    summary, (node_ratio, node_status) = cached_call(profile_summary, price_list, vol_list, profile_bin, current_price)
+                except ValueError as e:
+                    st.error(f"❌ Volume profile unavailable: {e}")
+                else:
+                    if summary.poc is None:
+                        st.warning("⚠️ No traded volume in the input - volume profile unavailable")
+                    else:
+                        profile_cols = st.columns(4)
+                        profile_cols[0].metric("POC", f"${summary.poc:,.2f}")
+                        profile_cols[1].metric("Value Area High", f"${summary.value_area_high:,.2f}")
+                        profile_cols[2].metric("Value Area Low", f"${summary.value_area_low:,.2f}")
+                        profile_cols[3].metric("Node at Price", node_status, delta=f"{node_ratio:.2f}x avg", delta_color="off")
+                    
+                        if summary.value_area_low <= current_price <= summary.value_area_high:
+                            st.info("⚖️ PRICE INSIDE VALUE AREA - Accepted value, expect rotation")
+                        else:
+                            st.warning("⚠️ PRICE OUTSIDE VALUE AREA - Watch for acceptance or rejection")
+            
+            # VWAP vs Current Price
             price_vwap_diff = current_price - vwap
             price_vwap_ratio = (current_price / vwap - 1) * 100
             
@@ -121,9 +186,10 @@ def volume_analysis_tab():
             
             # Volume Framework Integration
             st.markdown("### 🎯 Framework Integration:")
-            if volume_status == "HIGH" and delta_status == "INCREASING":
+            volume_signal = VOLUME_LABELS[volume_codes(volume_status, delta_status)]
+            if volume_signal == "BREAKOUT_WATCH":
                 st.info("🚀 HIGH INCREASING VOLUME - Potential for 'Mountain Climb/Drop' - Monitor for breakouts")
-            elif volume_status == "LOW" and delta_status == "DECREASING":
+            elif volume_signal == "CONSOLIDATION":
                 st.warning("⏸️ LOW DECREASING VOLUME - Potential for consolidation - Wait for volume confirmation")
             
             st.info("Volume analysis now feeds into your positioning and entry timing decisions")
@@ -0,0 +1,8 @@
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+# Component modules import their siblings as `utils.*`, as when run from components/;
+# the benchmark helpers (_data, _baselines) double as test fixtures and references
+sys.path.insert(0, os.path.join(ROOT, 'components'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from _baselines import python_arbitrage
+from _data import synthetic_markets
+from utils.calculations import solve_arbitrage
+from utils.datatypes import OddsQuote
+
+MARKETS = 500
+
+
+def check_properties(odds, bankroll, increment, commission):
+    exact = solve_arbitrage(odds, bankroll)
+    expected = python_arbitrage(odds, bankroll)
+    assert exact['is_arb_found'] == expected['is_arb_found']
+    assert np.allclose(exact['stakes'], expected['stakes'])
+    assert np.isclose(exact['profit'], expected['profit'])
+    if not expected['is_arb_found']:
+        return
+
+    rounded = solve_arbitrage(odds, bankroll, stake_increment=increment)
+    units = np.asarray(rounded['stakes']) / increment
+    assert np.allclose(units, np.round(units))
+    assert rounded['total_staked'] <= bankroll + 1e-9
+    assert rounded['profit'] <= exact['profit'] + 1e-9
+    assert np.isclose(rounded['profit'], min(rounded['payouts']) - rounded['total_staked'])
+
+    charged = solve_arbitrage(odds, bankroll, commission=commission)
+    assert not charged['is_arb_found'] or charged['profit'] <= exact['profit'] + 1e-9
+
+
+@pytest.mark.parametrize('odds, bankroll, increment, commission', [
+    ([2.1, 3.4, 5.0], 1000.0, 1.0, 0.02),
+    ([2.05, 2.05], 100.0, 0.5, 0.01),
+    ([1.9, 2.2], 250.0, 5.0, 0.05),
+    ([4.2, 4.1, 4.3, 4.4], 10.0, 0.01, 0.0)
+])
+def test_solve_arbitrage_properties(odds, bankroll, increment, commission):
+    check_properties(odds, bankroll, increment, commission)
+
+
+def test_solve_arbitrage_properties_on_synthetic_markets():
+    odds, bankrolls = synthetic_markets(MARKETS)
+    rng = np.random.default_rng(11)
+    increments = rng.choice([0.01, 0.5, 1.0, 5.0], MARKETS)
+    commissions = rng.uniform(0, 0.05, MARKETS)
+    for row, bankroll, increment, commission in zip(odds.tolist(), bankrolls.tolist(), increments.tolist(), commissions.tolist()):
+        check_properties(row, bankroll, increment, commission)
+
+
+@pytest.mark.parametrize('odds', [[2.5, 0.0, 3.0], [2.5, -4.0, 3.0], [2.5, float('nan'), 3.0]])
+def test_solve_arbitrage_rejects_invalid_odds(odds):
+    with pytest.raises(ValueError):
+        solve_arbitrage(odds, 100)
+
+
+def test_solve_arbitrage_reads_odds_quotes():
+    quotes = [OddsQuote('e1', i, 'book', odds) for i, odds in enumerate([2.1, 3.4, 5.0])]
+    assert solve_arbitrage(quotes, 1000) == solve_arbitrage([2.1, 3.4, 5.0], 1000)
@@ -0,0 +1,57 @@
+import threading
+
+import numpy as np
+
+from utils.cache import ComputationCache, cached_call
+
+
+def identity(values):
+    return values
+
+
+def head(values):
+    return values[:2], len(values)
+
+
+def test_cached_call_leaves_returned_inputs_writable():
+    values = np.arange(5.0)
+    result = cached_call(identity, values)
+    assert values.flags.writeable
+    assert not result.flags.writeable
+    values[0] = 99.0
+    assert cached_call(identity, np.arange(5.0))[0] == 0.0
+
+    prefix, count = cached_call(head, values)
+    assert values.flags.writeable and not prefix.flags.writeable
+    assert count == 5
+
+
+def test_coalesced_waiters_count_as_reuse():
+    cache = ComputationCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 42
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(cache.get_or_compute('key', compute)))
+    first.start()
+    started.wait(5)
+    waiters = [threading.Thread(target=lambda: results.append(cache.get_or_compute('key', compute))) for _ in range(3)]
+    for thread in waiters:
+        thread.start()
+    release.set()
+    for thread in [first, *waiters]:
+        thread.join(5)
+    cache.get_or_compute('key', compute)
+
+    stats = cache.stats()
+    assert results == [42] * 4 and len(calls) == 1
+    assert stats['misses'] == 1
+    assert stats['hits'] + stats['coalesced'] == 4
+    assert stats['hit_rate'] == 0.8
@@ -0,0 +1,27 @@
+from _data import synthetic_ohlcv
+from utils.cache import cached_call
+from utils.fibonacci import FibLadder, detect_swings, latest_swing
+
+
+def test_edited_interior_bar_gives_a_fresh_ladder():
+    candles = synthetic_ohlcv(200, seed=9)
+    high, low = candles['high'].tolist(), candles['low'].tolist()
+    swing_highs, _ = detect_swings(high, low, 5)
+    ladder = FibLadder(*cached_call(latest_swing, high, low, 5))
+    assert ladder.high == high[swing_highs[-1]]
+
+    # Same length and same last bar, different swing: the old (length, last bar) key went stale
+    edited = list(high)
+    edited[swing_highs[-1]] += 500.0
+    fresh = FibLadder(*cached_call(latest_swing, edited, low, 5))
+    assert fresh.high == edited[swing_highs[-1]]
+    assert fresh.prices != ladder.prices
+
+
+def test_nearest_and_within_use_sorted_levels():
+    ladder = FibLadder(110.0, 100.0)
+    assert list(ladder.prices) == sorted(ladder.levels.values())
+    name, price, distance = ladder.nearest(104.0)
+    assert distance == min(abs(104.0 - level) for level in ladder.prices)
+    assert ladder.levels[name] == price
+    assert ladder.within(105.0, 1.0) == [(n, p) for n, p in zip(ladder.names, ladder.prices) if abs(p - 105.0) < 1.0]
@@ -0,0 +1,107 @@
+import io
+
+import numpy as np
+import pytest
+
+from _data import MINUTE_MS, START_MS, synthetic_ohlcv
+from utils.ingest import RowError, epoch_to_ms, load_candles, resolve_data_path, write_binary
+from utils.resample import COLUMNS
+
+
+def candles(bars=50):
+    return synthetic_ohlcv(bars, seed=7)
+
+
+def csv_bytes(columns, ts=None, header=True):
+    ts = columns['ts'] if ts is None else ts
+    lines = [','.join(COLUMNS)] if header else []
+    lines += [','.join([str(t)] + [repr(float(columns[name][i])) for name in COLUMNS[1:]]) for i, t in enumerate(ts)]
+    return ('\n'.join(lines) + '\n').encode()
+
+
+def upload(data, name):
+    source = io.BytesIO(data)
+    source.name = name
+    return source
+
+
+def assert_same_candles(loaded, columns):
+    np.testing.assert_array_equal(loaded['ts'], columns['ts'])
+    for name in COLUMNS[1:]:
+        np.testing.assert_allclose(loaded[name], columns[name], rtol=1e-15)
+
+
+@pytest.mark.parametrize('header', [True, False])
+def test_csv_round_trip(header):
+    columns = candles()
+    result = load_candles(upload(csv_bytes(columns, header=header), 'candles.csv'))
+    assert (result.rows_read, result.rows_loaded, result.error_count) == (50, 50, 0)
+    assert_same_candles(result.columns, columns)
+
+
+@pytest.mark.parametrize('scale', [1e-3, 1, 1e3, 1e6])
+def test_csv_epoch_units_become_ms(scale):
+    columns = candles()
+    ts = (columns['ts'] * scale).astype(np.int64) if scale >= 1 else columns['ts'] // 1000
+    result = load_candles(upload(csv_bytes(columns, ts), 'candles.csv'))
+    np.testing.assert_array_equal(result.columns['ts'], columns['ts'])
+
+
+def test_csv_iso_timestamps():
+    columns = candles()
+    iso = np.datetime_as_string(columns['ts'].astype('datetime64[ms]'), unit='s')
+    result = load_candles(upload(csv_bytes(columns, [value.replace('T', ' ') + 'Z' for value in iso]), 'candles.csv'))
+    assert_same_candles(result.columns, columns)
+
+
+def test_binary_and_npy_round_trip(tmp_path):
+    columns = candles()
+    path = tmp_path / 'candles.bin'
+    write_binary(path, columns)
+    assert_same_candles(load_candles(str(path)).columns, columns)
+
+    buffer = io.BytesIO()
+    np.save(buffer, np.column_stack([columns[name] for name in COLUMNS]))
+    assert_same_candles(load_candles(upload(buffer.getvalue(), 'candles.npy')).columns, columns)
+
+
+def test_bad_rows_are_dropped_and_reported():
+    columns = candles(6)
+    lines = csv_bytes(columns).decode().splitlines()
+    # Close not a number, negative volume, missing fields
+    lines[2] = lines[2].replace(lines[2].split(',')[4], 'oops')
+    lines[4] = lines[4].rsplit(',', 1)[0] + ',-1.0'
+    lines[5] = lines[5].split(',', 1)[0]
+    result = load_candles(upload(('\n'.join(lines) + '\n').encode(), 'candles.csv'))
+    assert (result.rows_read, result.rows_loaded, result.error_count) == (6, 3, 3)
+    assert [(error.row, error.column) for error in result.errors] == [(3, 'close'), (5, 'volume'), (6, None)]
+    np.testing.assert_array_equal(result.columns['ts'], columns['ts'][[0, 2, 5]])
+
+
+def test_unit_mix_across_fallback_chunk(monkeypatch):
+    # A chunk with a bad line is parsed row by row; it must land in ms like its neighbours
+    monkeypatch.setattr('utils.ingest.CSV_CHUNK_ROWS', 10)
+    columns = candles(30)
+    lines = csv_bytes(columns, columns['ts'] // 1000, header=False).decode().splitlines()
+    lines[15] = lines[15].replace(lines[15].split(',')[5], 'n/a')
+    result = load_candles(upload(('\n'.join(lines) + '\n').encode(), 'candles.csv'))
+    assert result.errors == [RowError(16, 'volume', 'n/a', 'not a number')]
+    expected = np.delete(columns['ts'], 15)
+    np.testing.assert_array_equal(result.columns['ts'], expected)
+    assert np.all(np.diff(result.columns['ts']) >= MINUTE_MS)
+
+
+def test_epoch_to_ms_scales_each_value():
+    seconds = START_MS / 1000
+    np.testing.assert_array_equal(
+        epoch_to_ms([seconds, START_MS, START_MS * 1000, START_MS * 1_000_000]),
+        [START_MS] * 4
+    )
+
+
+def test_resolve_data_path_stays_under_root(tmp_path):
+    assert resolve_data_path('candles.csv', root=tmp_path) == str(tmp_path / 'candles.csv')
+    with pytest.raises(ValueError):
+        resolve_data_path('../secrets.csv', root=tmp_path)
+    with pytest.raises(ValueError):
+        resolve_data_path('/etc/passwd', root=tmp_path)
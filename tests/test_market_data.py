@@ -0,0 +1,46 @@
+import asyncio
+
+from utils.market_data import MarketDataFeed, proxy_venue
+
+VENUE = 'Mock Exchange'
+SYMBOL = 'BTC/USDT'
+
+
+def consume(feed, messages):
+    """Run the feed's consumer over messages until the queue is drained"""
+    async def run():
+        queue = asyncio.Queue()
+        for message in messages:
+            queue.put_nowait((VENUE, message))
+        consumer = asyncio.ensure_future(feed._consume(queue))
+        while not queue.empty():
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        # A consumer that died on a bad message would already be done
+        assert not consumer.done()
+        consumer.cancel()
+    asyncio.run(run())
+
+
+def test_consumer_survives_bad_messages_and_callbacks():
+    feed = MarketDataFeed([proxy_venue(name=VENUE)], symbols=[SYMBOL])
+    seen = []
+
+    def failing(trade):
+        raise RuntimeError("boom")
+
+    feed.trade_callbacks.extend([failing, seen.append])
+    trade = {'type': 'trade', 'symbol': SYMBOL, 'price': 100_000.0, 'size': 0.5, 'ts': 1}
+    consume(feed, [
+        "not a dict",
+        {'type': 'trade', 'symbol': SYMBOL, 'ts': 2},
+        {'type': 'funding', 'symbol': SYMBOL, 'funding_rate': 'abc', 'next_funding_ts': 3, 'ts': 3},
+        trade
+    ])
+
+    status = feed.status()[VENUE]
+    # Three rejected messages plus the failing callback
+    assert status['errors'] == 4
+    assert 'failing' in status['last_error']
+    assert seen == [trade]
+    assert feed.snapshot(SYMBOL).price == 100_000.0
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from _data import synthetic_ohlcv
+from utils.calculations import rsi_series
+from utils.market_state import MarketState
+from utils.resample import COLUMNS
+
+SYMBOL = 'BTC/USDT'
+
+
+@pytest.fixture
+def state():
+    state = MarketState([SYMBOL], capacity=256)
+    candles = synthetic_ohlcv(120, seed=5)
+    state.extend(SYMBOL, *(candles[name] for name in COLUMNS))
+    return state
+
+
+def test_published_view_is_unchanged_by_later_writes(state):
+    view = state.view(SYMBOL)
+    before = {tf: {name: column.copy() for name, column in view.candles.bars(tf).items()} for tf in ('1m', '5m', '1h')}
+    last_ts = int(view.candles.bars('1m')['ts'][-1])
+    for i in range(1, 31):
+        state.update(SYMBOL, last_ts + i * 60_000, 1.0, 2.0, 0.5, 1.5, 3.0)
+
+    assert len(view.candles) == 120
+    for tf, bars in before.items():
+        for name, column in bars.items():
+            np.testing.assert_array_equal(view.candles.bars(tf)[name], column)
+    latest = state.view(SYMBOL)
+    assert latest.version > view.version
+    assert len(latest.candles.bars('1m')['ts']) == 150
+
+
+def test_views_are_read_only(state):
+    bars = state.view(SYMBOL).candles.bars('5m')
+    with pytest.raises(ValueError):
+        bars['close'][0] = 0.0
+    with pytest.raises(ValueError):
+        state.view(SYMBOL).candles.bars('1m')['close'][0] = 0.0
+
+
+def test_frame_bars_are_shared_until_the_next_write(state):
+    view = state.view(SYMBOL)
+    assert view.candles.bars('15m')['close'] is state.view(SYMBOL).candles.bars('15m')['close']
+    first = view.candles.indicator('1m', rsi_series, ['close'])
+    assert view.candles.indicator('1m', rsi_series, ['close']) is first
+    np.testing.assert_array_equal(first, rsi_series(view.candles.bars('1m')['close']))
+
+    state.update(SYMBOL, int(view.candles.bars('1m')['ts'][-1]) + 60_000, 1.0, 2.0, 0.5, 1.5, 3.0)
+    assert len(state.view(SYMBOL).candles.indicator('1m', rsi_series, ['close'])) == 121
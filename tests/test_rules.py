@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from utils.rules import DEFAULT_RULES, Rule, RuleEngine, parse_rules
+
+SYMBOLS = ['AAA/USDT', 'BBB/USDT']
+
+
+def bar(engine, close, ts=0):
+    close = np.asarray(close, dtype=float)
+    return engine.on_bar(ts, close, close, close, close, np.ones(len(close)))
+
+
+@pytest.mark.parametrize('function, condition, fired', [
+    ('max', 'max(close, 100, 110) > 150', ['BBB/USDT']),
+    ('min', 'min(close, 200, 300) < 150', ['AAA/USDT']),
+    ('max', 'max(close, 100) > 150', ['BBB/USDT'])
+])
+def test_min_max_reduce_every_argument(function, condition, fired):
+    # A third argument used to land in the ufunc's out= slot
+    engine = RuleEngine(SYMBOLS, [Rule(function, condition)])
+    assert [trigger.symbol for trigger in bar(engine, [120.0, 180.0])] == fired
+
+
+@pytest.mark.parametrize('condition, message', [
+    ('abs(close, 1) > 0', 'abs() takes exactly 1 argument, got 2'),
+    ('min(close) > 0', 'min() takes at least 2 arguments, got 1'),
+    ('max() > 0', 'max() takes at least 2 arguments, got 0'),
+    ('round(close) > 0', 'only abs(), min() and max() calls are allowed'),
+    ('volume_stats > 0', "unknown field 'volume_stats'"),
+    ('confluence == "MAYBE"', "'MAYBE' is not one of confluence's labels"),
+    ('rsi >', 'invalid syntax')
+])
+def test_invalid_conditions_name_the_rule(condition, message):
+    with pytest.raises(ValueError, match='bad') as error:
+        RuleEngine(SYMBOLS, [Rule('bad', condition)])
+    assert message in str(error.value)
+
+
+def test_rules_sharing_a_template_fire_independently():
+    engine = RuleEngine(SYMBOLS, [Rule('above 100', 'close > 100'), Rule('above 150', 'close > 150')])
+    triggers = bar(engine, [120.0, 180.0])
+    assert sorted((trigger.rule, trigger.symbol) for trigger in triggers) == [
+        ('above 100', 'AAA/USDT'), ('above 100', 'BBB/USDT'), ('above 150', 'BBB/USDT')
+    ]
+    # Edge-triggered: still true on the next bar, so nothing new fires
+    assert bar(engine, [121.0, 181.0], ts=60_000) == []
+
+
+def test_default_rules_compile():
+    RuleEngine(SYMBOLS, DEFAULT_RULES)
+
+
+def test_parse_rules_skips_comments_and_reports_line():
+    assert parse_rules("# alerts\n\nhot: rsi > 70\n") == [Rule('hot', 'rsi > 70')]
+    with pytest.raises(ValueError, match='Line 2'):
+        parse_rules("hot: rsi > 70\nno condition here")
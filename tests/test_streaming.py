@@ -0,0 +1,75 @@
+import math
+
+import numpy as np
+import pytest
+
+from _baselines import python_dmi, python_volume_analysis
+from _data import synthetic_ohlcv
+from utils.calculations import DMIResult, calculate_vwap, dmi_multi, dmi_series, rsi_series
+from utils.streaming import RollingVolumeStats, StreamingDMI, StreamingRSI, StreamingVWAP
+
+BARS = 400
+
+
+@pytest.fixture(scope='module')
+def candles():
+    return synthetic_ohlcv(BARS, seed=3)
+
+
+@pytest.mark.parametrize('period', [1, 2, 14, 50])
+def test_dmi_series_matches_wilder_reference(candles, period):
+    expected = python_dmi(candles['high'].tolist(), candles['low'].tolist(), candles['close'].tolist(), period)
+    for actual, reference in zip(dmi_series(candles['high'], candles['low'], candles['close'], period), expected):
+        np.testing.assert_allclose(actual, reference, rtol=0, atol=1e-9, equal_nan=True)
+
+
+def test_dmi_multi_matches_dmi_series(candles):
+    columns = candles['high'], candles['low'], candles['close']
+    for period, series in dmi_multi(*columns, periods=(7, 14, 28)).items():
+        for actual, expected in zip(series, dmi_series(*columns, period=period)):
+            np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize('period', [2, 14])
+def test_streaming_dmi_matches_batch(candles, period):
+    pdi, mdi, adx = dmi_series(candles['high'], candles['low'], candles['close'], period)
+    dmi = StreamingDMI(period)
+    for i in range(BARS):
+        result = dmi.update(candles['high'][i], candles['low'][i], candles['close'][i])
+        assert isinstance(result, DMIResult)
+        np.testing.assert_allclose(result, (pdi[i], mdi[i], adx[i]), rtol=0, atol=1e-9, equal_nan=True)
+    # +DI/-DI start after period + 1 bars and ADX after 2 * period, NaN before
+    assert math.isnan(pdi[period - 1]) and not math.isnan(pdi[period])
+    assert math.isnan(adx[2 * period - 2]) and not math.isnan(adx[2 * period - 1])
+
+
+def test_streaming_rsi_matches_batch(candles):
+    expected = rsi_series(candles['close'])
+    rsi = StreamingRSI()
+    for i, close in enumerate(candles['close']):
+        value = rsi.update(close)
+        assert value == pytest.approx(50 if math.isnan(expected[i]) else expected[i], abs=1e-9)
+
+
+def test_streaming_vwap_matches_batch(candles):
+    vwap = StreamingVWAP()
+    for i in range(BARS):
+        value = vwap.update(candles['close'][i], candles['volume'][i])
+    assert value == pytest.approx(calculate_vwap(candles['close'], candles['volume']), rel=1e-12)
+
+
+def test_rolling_volume_stats_matches_batch(candles):
+    volumes = candles['volume'].tolist()
+    stats = RollingVolumeStats(window=20)
+    for i, volume in enumerate(volumes):
+        ratio, status, delta = stats.update(volume)
+        expected = python_volume_analysis(volume, volumes[max(0, i - 20):i])
+        assert (status, delta) == expected[1:]
+        assert ratio == pytest.approx(expected[0], rel=1e-9)
+
+
+def test_rolling_volume_stats_reanchors_total():
+    stats = RollingVolumeStats(window=20)
+    for volume in [1e12] * 20 + [0.1] * 40:
+        stats.update(volume)
+    assert stats.total == sum(stats.history)